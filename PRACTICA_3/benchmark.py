@@ -0,0 +1,294 @@
+"""
+Benchmarks de las rutas calientes del póker (ejercicio1.py).
+
+Suite (por defecto): mide latencia por llamada y throughput de
+  - evaluate_hand (5 cartas) y get_best_hand / evaluate_codes con 5, 6 y 7 cartas,
+  - los motores de probabilidades que usa el juego (print_probabilities y
+    EquityJob), con 2 a 6 jugadores: enumeración exacta en flop, turn y river,
+    Monte Carlo adaptativo en el preflop y, con NumPy, el motor vectorizado en
+    cada calle,
+  - barajar y repartir una mano (create_deck + shuffle_deck, y Deck), y manos
+    completas con play_hand_headless (bots pasivos, al azar y por equity).
+Los resultados se escriben en JSON y se comparan con una base guardada: si un
+caso es más lento que la base por encima de la tolerancia, se marca como
+REGRESIÓN y el programa termina con código 1. Los tiempos dependen de la máquina,
+así que la base no viene en el repositorio: se crea con --guardar-base en la
+máquina de referencia. Sin base solo se avisa y se termina con código 0 (con
+--exigir-base, con código 1).
+
+Escalamiento (--escalamiento): mide estimate_win_probabilities_parallel con
+1, 2, ... N procesos sobre la misma mano y la misma semilla, y reporta la
+aceleración, la eficiencia y si el resultado es idéntico.
+
+Uso:
+    python benchmark.py [--salida resultados.json] [--base benchmark_base.json]
+                        [--guardar-base] [--exigir-base] [--tolerancia 0.25] [--filtro equity]
+    python benchmark.py --escalamiento [--simulaciones 400000] [--jugadores 6] [--semilla 2024]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+import ejercicio1 as poker
+
+BASE_PATH  = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_base.json')
+CALLES     = (('preflop', 0), ('flop', 3), ('turn', 4), ('river', 5))
+BATCH_SIMULACIONES = 25_000
+
+
+def mano_de_prueba(jugadores: int, comunitarias: int, semilla: int) -> poker.GameState:
+    """Reparte una mano fija (misma semilla = mismas cartas)."""
+    random.seed(semilla)
+    state = poker.GameState()
+    state.deck = poker.shuffle_deck(poker.create_deck())
+    state.players = [poker.Player(i + 1, f"Jugador {i + 1}") for i in range(jugadores)]
+    for p in state.players:
+        poker.deal_hole_cards(state, p)
+    for _ in range(comunitarias):
+        poker.deal_community(state)
+    return state
+
+
+# ══════════════════════════════════════
+#  MEDICIÓN
+# ══════════════════════════════════════
+def medir(fn, ops: int, min_segundos: float = 0.2, repeticiones: int = 5) -> dict:
+    """
+    Tiempo por operación de fn() (que hace 'ops' operaciones por llamada).
+    Calibra cuántas llamadas caben en min_segundos/repeticiones y se queda con
+    la repetición más rápida, que es la menos afectada por el ruido del sistema.
+    """
+    objetivo = min_segundos / repeticiones
+    llamadas = 1
+    while True:
+        dt = _lote(fn, llamadas)
+        if dt >= objetivo:
+            break
+        llamadas *= 2 if dt <= 0 else max(2, min(10, int(objetivo / dt) + 1))
+    mejor = min([dt] + [_lote(fn, llamadas) for _ in range(repeticiones - 1)])
+    por_op = mejor / (llamadas * ops)
+    return {'ns_por_op': por_op * 1e9, 'ops_por_s': 1 / por_op, 'operaciones': llamadas * ops}
+
+def _lote(fn, llamadas: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(llamadas):
+        fn()
+    return time.perf_counter() - t0
+
+
+# ══════════════════════════════════════
+#  CASOS
+# ══════════════════════════════════════
+def _manos(n_cartas: int, cantidad: int = 1_000, semilla: int = 7) -> list:
+    rng = random.Random(semilla + n_cartas)
+    return [rng.sample(range(52), n_cartas) for _ in range(cantidad)]
+
+def casos_evaluacion() -> dict:
+    casos = {}
+    manos5 = [[poker.CARDS[c] for c in m] for m in _manos(5)]
+    casos['evaluate_hand/5'] = (lambda: [poker.evaluate_hand(m) for m in manos5], len(manos5))
+    for n in (5, 6, 7):
+        codigos = _manos(n)
+        cartas  = [[poker.CARDS[c] for c in m] for m in codigos]
+        casos[f'get_best_hand/{n}'] = (
+            lambda cartas=cartas: [poker.get_best_hand(m[:2], m[2:]) for m in cartas], len(cartas))
+        casos[f'evaluate_codes/{n}'] = (
+            lambda codigos=codigos: [poker.evaluate_codes(m) for m in codigos], len(codigos))
+    return casos
+
+def casos_equity(simulaciones: int = BATCH_SIMULACIONES) -> dict:
+    """
+    Los mismos caminos que print_probabilities: enumeración exacta si el número
+    de tableros no pasa de EXACT_LIMIT (flop, turn y river) y Monte Carlo
+    adaptativo si no (preflop); ambos por llamada. Con NumPy, además, el motor
+    vectorizado por simulación.
+    """
+    casos = {}
+    for jugadores in range(2, 7):
+        for calle, comunitarias in CALLES:
+            state = mano_de_prueba(jugadores, comunitarias, 2024 + jugadores)
+            args  = (state.players, state.community, list(state.deck))
+            if poker.count_runouts(state.community, state.deck) <= poker.EXACT_LIMIT:
+                casos[f'equity/exacto/{calle}/{jugadores}j'] = (
+                    lambda args=args: poker.enumerate_win_probabilities(*args), 1)
+            else:
+                casos[f'equity/adaptativo/{calle}/{jugadores}j'] = (
+                    lambda args=args: poker.estimate_win_probabilities_adaptive(*args, rng=_rng()), 1)
+            if poker.np is not None and comunitarias < 5:   # con el river completo no hay nada que simular
+                casos[f'equity/batch/{calle}/{jugadores}j'] = (
+                    lambda args=args: poker.estimate_win_probabilities_batch(*args, simulaciones, rng=_rng()),
+                    simulaciones)
+    return casos
+
+def _rng():  # generador con semilla fija del tipo que espera cada motor
+    return poker.np.random.default_rng(1) if poker.np is not None else random.Random(1)
+
+def casos_mano() -> dict:
+    def repartir():
+        state = poker.GameState()
+        state.deck = poker.shuffle_deck(poker.create_deck())
+        state.players = jugadores
+        for p in jugadores:
+            p.hand = poker.HandState()
+            poker.deal_hole_cards(state, p)
+        for _ in range(5):
+            poker.deal_community(state)
+
+    def repartir_deck():
+        state = poker.GameState()
+        state.deck = deck.reset(None)
+        state.players = jugadores
+        for p in jugadores:
+            poker.deal_hole_cards(state, p)
+        for _ in range(5):
+            poker.deal_community(state)
+
+    def headless(policy):
+        rng = random.Random(99)
+        mesa = [poker.Player(i + 1, f"Bot {i + 1}", 10**9) for i in range(6)]
+        for p in mesa:
+            p.policy = policy
+        return lambda: poker.play_hand_headless(mesa, rng)
+
+    jugadores = [poker.Player(i + 1, f"Jugador {i + 1}") for i in range(6)]
+    deck      = poker.Deck()
+    random.seed(5)
+    return {
+        'barajar_repartir/6j': (repartir, 1),
+        'deck_repartir/6j':    (repartir_deck, 1),
+        'headless/pasiva/6j':  (headless(poker.passive_policy), 1),
+        'headless/azar/6j':    (headless(poker.make_random_policy(random.Random(3))), 1),
+        'headless/equity/6j':  (headless(poker.make_equity_policy(random.Random(3))), 1),
+    }
+
+def suite(filtro: str = '', min_segundos: float = 0.2) -> dict:
+    casos = {**casos_evaluacion(), **casos_equity(), **casos_mano()}
+    resultados = {}
+    for nombre, (fn, ops) in casos.items():
+        if filtro in nombre:
+            resultados[nombre] = medir(fn, ops, min_segundos)
+            r = resultados[nombre]
+            print(f"  {nombre:<30} {r['ns_por_op']:>12.0f} ns/op {r['ops_por_s']:>12.0f} ops/s", flush=True)
+    return resultados
+
+
+# ══════════════════════════════════════
+#  BASE Y REGRESIONES
+# ══════════════════════════════════════
+def metadatos() -> dict:
+    return {
+        'python':   platform.python_version(),
+        'numpy':    poker.np.__version__ if poker.np is not None else None,
+        'maquina':  platform.machine(),
+        'sistema':  platform.system(),
+        'cpus':     os.cpu_count(),
+        'fecha':    time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+def comparar(resultados: dict, base: dict, tolerancia: float) -> list:
+    """Casos más lentos que la base por encima de la tolerancia: [(nombre, razón actual/base)]."""
+    regresiones = []
+    for nombre, r in resultados.items():
+        anterior = base.get(nombre)
+        if anterior is None:
+            continue
+        razon = r['ns_por_op'] / anterior['ns_por_op']
+        if razon > 1 + tolerancia:
+            regresiones.append((nombre, razon))
+    return regresiones
+
+def escribir_json(path: str, resultados: dict):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'meta': metadatos(), 'resultados': resultados}, f, indent=2, sort_keys=True)
+
+
+# ══════════════════════════════════════
+#  ESCALAMIENTO EN PARALELO
+# ══════════════════════════════════════
+def escalamiento(simulaciones: int, jugadores: int, semilla: int, max_workers: int) -> list:
+    state = mano_de_prueba(jugadores, 0, semilla)
+    filas = []
+    referencia = None
+    for workers in range(1, max_workers + 1):
+        t0 = time.perf_counter()
+        probs = poker.estimate_win_probabilities_parallel(
+            state.players, state.community, list(state.deck),
+            simulations=simulaciones, seed=semilla, workers=workers)
+        dt = time.perf_counter() - t0
+        referencia = referencia or (dt, probs)
+        filas.append({
+            'workers':    workers,
+            'segundos':   dt,
+            'sims_por_s': simulaciones / dt,
+            'aceleracion': referencia[0] / dt,
+            'eficiencia': referencia[0] / dt / workers,
+            'identico':   probs == referencia[1],
+        })
+    return filas
+
+def main_escalamiento(args):
+    print(f"Equity en paralelo: {args.simulaciones} simulaciones, {args.jugadores} jugadores, "
+          f"semilla {args.semilla}")
+    print(f"{'workers':>8} {'segundos':>9} {'sims/s':>11} {'acel.':>6} {'efic.':>6}  mismo resultado")
+    for f in escalamiento(args.simulaciones, args.jugadores, args.semilla, args.workers):
+        print(f"{f['workers']:>8} {f['segundos']:>9.3f} {f['sims_por_s']:>11.0f} "
+              f"{f['aceleracion']:>5.2f}x {f['eficiencia']:>5.0%}  {'sí' if f['identico'] else 'NO'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--salida', default='benchmark_resultados.json', help='JSON con los resultados')
+    parser.add_argument('--base', default=BASE_PATH, help='JSON de referencia contra el que se compara')
+    parser.add_argument('--guardar-base', action='store_true', help='guarda estos resultados como la nueva base')
+    parser.add_argument('--exigir-base', action='store_true', help='termina con código 1 si no hay base')
+    parser.add_argument('--tolerancia', type=float, default=0.25,
+                        help='fracción de lentitud permitida contra la base (0.25 = 25%%)')
+    parser.add_argument('--filtro', default='', help='solo los casos cuyo nombre contenga este texto')
+    parser.add_argument('--min-segundos', type=float, default=0.2, help='tiempo mínimo de medición por caso')
+    parser.add_argument('--escalamiento', action='store_true', help='mide el equity en paralelo con 1..N procesos')
+    parser.add_argument('--simulaciones', type=int, default=400_000)
+    parser.add_argument('--jugadores', type=int, default=6)
+    parser.add_argument('--semilla', type=int, default=2024)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='máximo de procesos a probar (por defecto, los núcleos de la máquina)')
+    args = parser.parse_args()
+
+    if args.escalamiento:
+        main_escalamiento(args)
+        return 0
+
+    print(f"Suite de benchmarks (Python {platform.python_version()}, "
+          f"NumPy {'sí' if poker.np is not None else 'no'})")
+    resultados = suite(args.filtro, args.min_segundos)
+    escribir_json(args.salida, resultados)
+    print(f"Resultados en {args.salida}")
+
+    if args.guardar_base:
+        escribir_json(args.base, resultados)
+        print(f"Base guardada en {args.base}")
+        return 0
+    if not os.path.exists(args.base):
+        print(f"Aviso: no hay base en {args.base}, no se buscan regresiones. "
+              f"Créala con --guardar-base.", file=sys.stderr)
+        return 1 if args.exigir_base else 0
+
+    with open(args.base, encoding='utf-8') as f:
+        base = json.load(f)['resultados']
+    regresiones = comparar(resultados, base, args.tolerancia)
+    for nombre, razon in regresiones:
+        print(f"  REGRESIÓN {nombre}: {razon:.2f}x más lento que la base", file=sys.stderr)
+    if regresiones:
+        print(f"{len(regresiones)} caso(s) más lentos que la base (tolerancia {args.tolerancia:.0%})",
+              file=sys.stderr)
+        return 1
+    print(f"Sin regresiones contra {args.base} (tolerancia {args.tolerancia:.0%})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
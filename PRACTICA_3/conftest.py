@@ -0,0 +1,13 @@
+import pytest
+
+import ejercicio1 as poker
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'slow: pruebas largas (deselecciona con -m "not slow")')
+
+
+@pytest.fixture
+def cartas():
+    # 'AsKh' -> [Card, Card]: las dos cartas de un combo escrito a mano
+    return lambda texto: [poker.CARDS[c] for c in poker.parse_range(texto)[0][:2]]
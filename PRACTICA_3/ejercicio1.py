@@ -13,7 +13,24 @@ Funcionalidades:
 import random
 import os
 import sys
-from itertools import combinations
+import mmap
+import struct
+import time
+import threading
+import shutil
+import json
+from array import array
+from itertools import combinations, combinations_with_replacement, permutations
+from math import comb
+from collections import OrderedDict, deque
+from bisect import bisect_left, bisect_right
+from hashlib import blake2b
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:   # NumPy es opcional: sin él las probabilidades usan el motor en Python puro
+    np = None
 
 # ══════════════════════════════════════
 #  COLORES ANSI
@@ -45,18 +62,20 @@ def yellow(s): return f"{C.YELLOW}{C.BOLD}{s}{C.RESET}"
 class Card:
     SUITS       = {'♠': 'black', '♥': 'red', '♦': 'red', '♣': 'black'} #suits son los palos de las cartas, cada uno tiene un color asociado
     VALUE_NAMES = {1: 'A', 11: 'J', 12: 'Q', 13: 'K'}
+    __slots__   = ('suit', 'value', 'code') # sin __dict__: cada carta ocupa lo mínimo
 
     def __init__(self, suit: str, value: int): #suit es el palo de la carta (♠, ♥, ♦, ♣) y value es el valor numérico (1-13)
         self.suit  = suit
         self.value = value
+        self.code  = card_code(suit, value) # entero 0-51 con el que trabaja el código rápido (ver CODIFICACIÓN COMPACTA)
 
     @property #name es una propiedad que devuelve el nombre de la carta (A, 2-10, J, Q, K) según su valor
     def name(self) -> str:
-        return self.VALUE_NAMES.get(self.value, str(self.value))
+        return CODE_NAME[self.code]
 
     @property #is_red es una propiedad que devuelve True si la carta es de color rojo (♥ o ♦) y False si es de color negro (♠ o ♣)
     def is_red(self) -> bool:
-        return self.SUITS[self.suit] == 'red'
+        return CODE_RED[self.code]
 
     def __str__(self) -> str: 
         clr = C.RED if self.is_red else C.WHITE
@@ -75,30 +94,138 @@ class Player: #Representación de cada jugador
         self.best_hand: str   = ''
         self.round_bet: int   = 0       # apuesta en la ronda actual
         self.total_bet: int   = 0       # apuesta total en la partida
+        self.policy           = None    # None = humano en la terminal; si no, callable(state, player, to_call)
+        self.hand:      'HandState' = HandState()   # cartas propias + comunitarias, al día (ver deal_card)
 
 #Estado global del juego
 class GameState:
     def __init__(self):
-        self.deck:          list = []
+        self.deck:          array = array('B')   # códigos de las cartas que quedan (ver create_deck y Deck)
+        self.seed:          int  = None   # semilla de la baraja (Deck) para repetir la partida
         self.community:     list = []
         self.players:       list = []
         self.pot:           int  = 0
         self.round:         int  = 0
         self.prob_history:  list = []
+        self.winners:       list = []    # quién se lleva el pozo (varios = se reparte)
+        self.actions:       list = []    # (player_id, ronda, 'fold'/'call'/'raise', fichas que metió), ver apply_action
+        self.start_chips:   dict = {}    # {player_id: fichas al empezar la mano}, para las netas del historial
+
+# ══════════════════════════════════════
+#  CODIFICACIÓN COMPACTA
+# ══════════════════════════════════════
+# Cada carta es un entero 0-51: code = palo * 13 + (valor alto - 2), con el As como valor alto 14. Así una mano cabe en una máscara de 52 bits (bit code encendido) y los 13 bits de cada palo quedan contiguos: (mask >> 13 * palo) & 0x1FFF son los valores de ese palo. Todo lo que se calcula por carta (primo, bit de valor, palo, valor alto, nombre, color) está en tablas indexadas por el código, para que el código rápido nunca recalcule '14 if c.value == 1 else c.value'.
+SUIT_ORDER = tuple(Card.SUITS)                     # ♠ ♥ ♦ ♣ -> 0 1 2 3
+SUIT_INDEX = {s: i for i, s in enumerate(SUIT_ORDER)}
+
+def card_code(suit: str, value: int) -> int:
+    return SUIT_INDEX[suit] * 13 + (12 if value == 1 else value - 2)
+
+CODE_SUIT  = tuple(c // 13 for c in range(52))                        # índice de palo 0-3
+CODE_HIGH  = tuple(c % 13 + 2 for c in range(52))                      # valor alto 2-14 (A=14)
+CODE_VALUE = tuple(1 if h == 14 else h for h in CODE_HIGH)             # valor de Card (A=1)
+CODE_NAME  = tuple(Card.VALUE_NAMES.get(v, str(v)) for v in CODE_VALUE)
+CODE_RED   = tuple(Card.SUITS[SUIT_ORDER[s]] == 'red' for s in CODE_SUIT)
+CARDS      = tuple(Card(SUIT_ORDER[c // 13], CODE_VALUE[c]) for c in range(52))  # las 52 cartas canónicas, inmutables
+
+def card_to_int(card: Card) -> int:
+    return card.code
+
+def int_to_card(code: int) -> Card:
+    return CARDS[code]
+
+def cards_to_codes(cards: list) -> list:
+    return [c.code for c in cards]
+
+def hand_mask(codes) -> int: # Máscara de 52 bits de un conjunto de códigos.
+    mask = 0
+    for c in codes:
+        mask |= 1 << c
+    return mask
+
+def mask_to_codes(mask: int) -> list:
+    return [c for c in range(52) if mask >> c & 1]
 
 # ══════════════════════════════════════
 #  BARAJA
 # ══════════════════════════════════════
-def create_deck() -> list: #Crea una baraja estándar de 52 cartas generando una lista de objetos Card para cada combinación de palo y valor. Es decir, genera las cartas del 1 al 13 para cada uno de los cuatro palos (♠, ♥, ♦, ♣) y las devuelve como una lista.
-    return [Card(s, v) for s in Card.SUITS for v in range(1, 14)] # Card.SUITS es un diccionario que contiene los palos de las cartas y Card.VALUE_NAMES es un diccionario que contiene los nombres de las cartas especiales (A, J, Q, K). La función utiliza una comprensión de listas para crear una lista de objetos Card para cada combinación de palo y valor. El resultado es una lista de 52 cartas que representa una baraja estándar. Una comprensión de listas es una forma concisa de crear listas en Python utilizando una sintaxis similar a la de los bucles for. En este caso, se itera sobre cada palo en Card.SUITS y cada valor del 1 al 13 para crear un objeto Card correspondiente a esa combinación de palo y valor. El resultado es una lista de objetos Card que representa una baraja completa.
-    # La función create_deck() devuelve esta lista de cartas, que luego puede ser utilizada para mezclar y repartir a los jugadores en el juego de poker.
-def shuffle_deck(deck: list) -> list: #Mezcla la baraja utilizando random.shuffle() y devuelve la baraja mezclada. La función toma una lista de cartas (deck) como argumento, crea una copia de esa lista para evitar modificar la original, y luego utiliza random.shuffle() para mezclar los elementos de la lista de manera aleatoria. Finalmente, devuelve la lista mezclada.
-    d = deck.copy()
+def create_deck() -> array: #Crea una baraja estándar de 52 cartas. En lugar de 52 objetos Card, la baraja es un array de bytes con los códigos 0-51 (uno por carta, ver CODIFICACIÓN COMPACTA); la carta de cada código es CARDS[code], que se crea una sola vez al importar el módulo.
+    return array('B', range(52))
+
+def shuffle_deck(deck: array) -> array: #Mezcla la baraja utilizando random.shuffle() sobre una copia de la baraja (no se modifica la original) y devuelve la copia mezclada.
+    d = deck[:]
     random.shuffle(d)
     return d
 
-def deal_card(deck: list) -> Card: #Reparte una carta de la baraja. La función toma una lista de cartas (deck) como argumento, utiliza deck.pop() para eliminar y devolver el último elemento de la lista, que representa la carta que se reparte. Esto simula el acto de repartir una carta desde la parte superior de la baraja. La función devuelve el objeto Card que ha sido repartido. Es decir, cada vez que se llama a deal_card(), se elimina una carta de la baraja y se devuelve esa carta para ser asignada a un jugador o al tablero comunitario.
-    return deck.pop() #deck.pop() elimina y devuelve el último elemento de la lista deck, que representa la carta que se reparte. Esto simula el acto de repartir una carta desde la parte superior de la baraja. La función deal_card() devuelve el objeto Card que ha sido repartido, lo que permite asignar esa carta a un jugador o al tablero comunitario en el juego de poker.
+# Para simular en volumen: Deck reutiliza un solo buffer de 52 códigos y lo baraja en su lugar con Fisher–Yates parcial, sorteando cada carta solo cuando se reparte (una mano de 6 jugadores usa 17 sorteos, no 51). Los números al azar salen de un generador por contador (como Philox): el bloque k de la partida es BLAKE2b(semilla, k), 16 enteros de 32 bits por bloque. Sembrar no cuesta nada, no depende del estado global de random y la misma semilla reproduce exactamente las mismas cartas.
+_DECK_ORDER = array('B', range(52))
+_DECK_BLOCK = struct.Struct('<QQ')   # semilla, número de bloque
+_MASK64     = (1 << 64) - 1
+
+def _random_block(seed: int, block: int) -> memoryview: # 16 enteros de 32 bits del bloque 'block' de la semilla.
+    return memoryview(blake2b(_DECK_BLOCK.pack(seed & _MASK64, block), digest_size=64).digest()).cast('I')
+
+class Deck:
+    """
+    Baraja sembrada: pop() saca una carta al azar de las que quedan (un paso
+    de Fisher–Yates sobre el buffer) y la deja al final del buffer. len() e
+    iter() dan las cartas que quedan, como el array de create_deck, así que
+    sirve como state.deck en todo el código. reset() vuelve a barajar el mismo
+    buffer con otra semilla sin crear objetos.
+    """
+    __slots__ = ('codes', 'remaining', 'seed', '_words', '_used')
+
+    def __init__(self, seed: int = None):
+        self.codes = array('B', _DECK_ORDER)
+        self.reset(seed)
+
+    def reset(self, seed: int = None):
+        """Restaura las 52 cartas en orden y fija la semilla (None = una al azar)."""
+        self.codes[:]  = _DECK_ORDER
+        self.remaining = 52
+        self.seed      = random.getrandbits(64) if seed is None else seed
+        self._used     = 0
+        return self
+
+    def _next_word(self) -> int:
+        i = self._used
+        if not i & 15:
+            self._words = _random_block(self.seed, i >> 4)
+        self._used = i + 1
+        return self._words[i & 15]
+
+    def pop(self) -> int:
+        n = self.remaining
+        m = self._next_word() * n           # índice = (palabra * n) >> 32 (método de Lemire)
+        if m & 0xFFFFFFFF < n:              # posible sesgo (probabilidad < 52 / 2**32): rechazo
+            threshold = (1 << 32) % n
+            while m & 0xFFFFFFFF < threshold:
+                m = self._next_word() * n
+        j, n  = m >> 32, n - 1
+        codes = self.codes
+        codes[j], codes[n] = codes[n], codes[j]
+        self.remaining = n
+        return codes[n]
+
+    def __len__(self) -> int:
+        return self.remaining
+
+    def __iter__(self):
+        return iter(self.codes[:self.remaining])
+
+
+def deal_card(deck: array, *trackers) -> Card: #Reparte una carta de la baraja: deck.pop() elimina y devuelve el último código de la baraja, que simula la carta de arriba, y se devuelve la carta canónica de ese código para asignarla a un jugador o al tablero comunitario. Los trackers (HandState de los jugadores que reciben la carta) se actualizan con ella al momento.
+    code = deck.pop()
+    for hand in trackers:
+        hand.add(code)
+    return CARDS[code]
+
+def deal_hole_cards(state: GameState, player: Player):
+    player.hand  = HandState()
+    player.cards = [deal_card(state.deck, player.hand), deal_card(state.deck, player.hand)]
+
+def deal_community(state: GameState): # Carta comunitaria: la reciben todos los jugadores en su HandState.
+    state.community.append(deal_card(state.deck, *(p.hand for p in state.players)))
 
 # ══════════════════════════════════════
 #  EVALUACIÓN DE MANOS
@@ -141,6 +268,12 @@ def _check_straight(sv: list) -> bool: # Verifica si los valores de las cartas f
     return all(sv[i] - sv[i+1] == 1 for i in range(len(sv)-1)) 
 
 def get_best_hand(player_cards: list, community: list) -> tuple: # Dada la mano del jugador (2 cartas) y las cartas comunitarias (hasta 5 cartas), esta función evalúa todas las combinaciones posibles de 5 cartas y devuelve la mejor mano posible. La función toma dos listas como argumentos: player_cards, que contiene las cartas del jugador, y community, que contiene las cartas comunitarias en la mesa. Combina estas dos listas para obtener todas las cartas disponibles para el jugador y luego utiliza itertools.combinations para generar todas las combinaciones posibles de 5 cartas. Para cada combinación, evalúa la mano utilizando la función evaluate_hand() y mantiene un registro de la mejor mano encontrada. Finalmente, devuelve una tupla que representa la mejor mano posible para el jugador dada su mano y las cartas comunitarias.
+    all_cards = player_cards + community
+    if len(all_cards) < 5:
+        return (99, 'Nada', [])
+    return fast_evaluate(all_cards)
+
+def get_best_hand_slow(player_cards: list, community: list) -> tuple: # Versión original por fuerza bruta (21 combinaciones con evaluate_hand); se conserva como referencia para comprobar el evaluador rápido.
     all_cards = player_cards + community
     best = (99, 'Nada', [])
     for combo in combinations(all_cards, 5):
@@ -149,53 +282,1022 @@ def get_best_hand(player_cards: list, community: list) -> tuple: # Dada la mano
             best = result
     return best
 
+# ══════════════════════════════════════
+#  EVALUADOR RÁPIDO — tablas precalculadas
+# ══════════════════════════════════════
+# Cada valor tiene un número primo; el producto de los primos identifica el multiconjunto de valores de la mano sin importar el orden (Cactus Kev). Para las manos sin color basta buscar ese producto en _RANK_TABLE. Para el color se usa la máscara de 13 bits de los valores de un mismo palo, que se busca en _FLUSH_TABLE. Con 5 a 7 cartas, si hay color no puede haber póker ni casa llena, así que el color siempre es la mejor mano.
+HAND_NAMES = ('Corrida Real', 'Corrida de Color', 'Poker', 'Casa Llena', 'Color',
+              'Corrida', 'Tercia', 'Doble Par', 'Un Par', 'Carta Alta')
+
+_PRIMES       = {2: 2, 3: 3, 4: 5, 5: 7, 6: 11, 7: 13, 8: 17, 9: 19, 10: 23,
+                 11: 29, 12: 31, 13: 37, 14: 41}       # valor alto (A=14) -> primo
+_CODE_PRIME   = tuple(_PRIMES[h] for h in CODE_HIGH)            # indexados por código de carta
+_CODE_SUIT_COUNT = tuple(1 << (4 * s) for s in CODE_SUIT)       # 4 bits por palo para contar cartas
+_SUIT_BIAS    = 0x3333   # cada contador empieza en 3: llega a 8 (bit alto) justo con 5 cartas del mismo palo
+_FLUSH_BITS   = 0x8888
+_RANK_TABLE:  dict = {}   # producto de primos -> fuerza
+_FLUSH_TABLE: dict = {}   # máscara de valores de un palo (>= 5 bits) -> fuerza
+_DESCRIBE:    dict = {}   # fuerza -> (rank, nombre, vals)
+
+# Fuerza de una mano: un solo entero comparable. Los 4 bits altos son la categoría (9 = Corrida Real ... 0 = Carta Alta) y siguen 5 valores de 4 bits ordenados por importancia: primero los grupos (póker, tercia, pares) y luego los kickers. En la corrida baja A-5 el As va al final, así que pierde contra 6-2. Comparar dos manos, incluido el desempate por kickers, es comparar dos enteros.
+def hand_strength(rank: int, ranked_vals: list) -> int:
+    strength = 9 - rank
+    for v in ranked_vals:
+        strength = strength << 4 | v
+    return strength
+
+def strength_rank(strength: int) -> int: # Categoría (0 = Corrida Real ... 9 = Carta Alta) de una fuerza.
+    return 9 - (strength >> 20)
+
+def describe_strength(strength: int) -> tuple: # (rank, nombre, vals) de una fuerza, con el contrato de evaluate_hand.
+    return _DESCRIBE[strength]
+
+def _top_straight(mask: int) -> int: # Devuelve el valor más alto de la mejor corrida contenida en la máscara (5 para la corrida baja A-5), o 0 si no hay corrida.
+    for high in range(14, 5, -1):
+        run = 0b11111 << (high - 6)
+        if mask & run == run:
+            return high
+    wheel = (1 << 12) | 0b1111  # A, 2, 3, 4, 5
+    return 5 if mask & wheel == wheel else 0
+
+def _straight_vals(high: int) -> list:
+    return [5, 4, 3, 2, 14] if high == 5 else list(range(high, high - 5, -1))
+
+def _best_from_counts(counts: dict) -> tuple: # Mejor mano sin color para un multiconjunto de valores {valor: repeticiones}. Retorna (rank, los 5 valores usados en orden de desempate).
+    by_count = sorted(counts, key=lambda v: (counts[v], v), reverse=True)
+    mask     = sum(1 << (v - 2) for v in counts)
+    straight = _top_straight(mask)
+
+    def kickers(used: list, n: int) -> list:
+        return sorted((v for v in counts if v not in used), reverse=True)[:n]
+
+    first = by_count[0]
+    if counts[first] == 4:
+        return (2, [first] * 4 + kickers([first], 1))
+    trips = [v for v in by_count if counts[v] >= 3]
+    if trips:
+        pairs = [v for v in counts if v != trips[0] and counts[v] >= 2]
+        if pairs:
+            return (3, [trips[0]] * 3 + [max(pairs)] * 2)
+    if straight:
+        return (5, _straight_vals(straight))
+    if trips:
+        t = trips[0]
+        return (6, [t] * 3 + kickers([t], 2))
+    pairs = sorted((v for v in counts if counts[v] == 2), reverse=True)
+    if len(pairs) >= 2:
+        hi, lo = pairs[0], pairs[1]
+        return (7, [hi, hi, lo, lo] + kickers([hi, lo], 1))
+    if pairs:
+        p = pairs[0]
+        return (8, [p, p] + kickers([p], 3))
+    return (9, kickers([], 5))
+
+def _best_flush(mask: int) -> tuple: # Mejor mano de un palo con 5 o más cartas (máscara de valores).
+    straight = _top_straight(mask)
+    if straight == 14:
+        return (0, _straight_vals(14))
+    if straight:
+        return (1, _straight_vals(straight))
+    return (4, [v for v in range(14, 1, -1) if mask & (1 << (v - 2))][:5])
+
+def _store(table: dict, key: int, rank: int, ranked_vals: list):
+    strength = hand_strength(rank, ranked_vals)
+    table[key] = strength
+    if strength not in _DESCRIBE:
+        # vals de mayor a menor (As = 14), como los devuelve evaluate_hand
+        _DESCRIBE[strength] = (rank, HAND_NAMES[rank], sorted(ranked_vals, reverse=True))
+
+def _build_eval_tables():
+    for n in (5, 6, 7):
+        for combo in combinations_with_replacement(range(2, 15), n):
+            counts: dict = {}
+            for v in combo:
+                counts[v] = counts.get(v, 0) + 1
+            if max(counts.values()) > 4:
+                continue
+            product = 1
+            for v in combo:
+                product *= _PRIMES[v]
+            _store(_RANK_TABLE, product, *_best_from_counts(counts))
+        for ranks in combinations(range(13), n):
+            mask = sum(1 << r for r in ranks)
+            _store(_FLUSH_TABLE, mask, *_best_flush(mask))
+
+_build_eval_tables()
+
+def strength_codes(codes) -> int: # Fuerza de una mano de 5, 6 o 7 códigos de carta, de una sola pasada.
+    product = 1
+    suits   = _SUIT_BIAS
+    for c in codes:
+        product *= _CODE_PRIME[c]
+        suits   += _CODE_SUIT_COUNT[c]
+    if suits & _FLUSH_BITS:   # algún palo con 5 o más cartas (solo ~3% de las manos de 7)
+        return _flush_strength(hand_mask(codes))
+    return _RANK_TABLE[product]
+
+def _flush_strength(mask: int) -> int: # Busca el palo con 5 o más cartas en una máscara de 52 bits.
+    for shift in (0, 13, 26, 39):
+        flush = _FLUSH_TABLE.get(mask >> shift & 0x1FFF)
+        if flush:
+            return flush
+
+def evaluate_codes(codes) -> tuple: # Mejor mano de 5 de una mano de 5, 6 o 7 códigos, con el mismo contrato que evaluate_hand: (rank, nombre, vals).
+    return _DESCRIBE[strength_codes(codes)]
+
+def fast_evaluate(cards: list) -> tuple: # Igual que evaluate_codes pero a partir de objetos Card.
+    return evaluate_codes([c.code for c in cards])
+
+# Manos parciales: (producto de primos, contadores de palo, máscara de 52 bits) de un grupo de cartas. Dos parciales se combinan multiplicando los productos, sumando los contadores y uniendo las máscaras, así que las cartas propias de cada jugador se resumen una sola vez y cada tablero solo aporta su propia parte.
+def partial_hand(codes) -> tuple:
+    product, suits, mask = 1, 0, 0
+    for c in codes:
+        product *= _CODE_PRIME[c]
+        suits   += _CODE_SUIT_COUNT[c]
+        mask    |= 1 << c
+    return product, suits, mask
+
+def strength_partial(product: int, suits: int, mask: int) -> int: # Fuerza de una mano completa (5-7 cartas) dada como parcial.
+    if (suits + _SUIT_BIAS) & _FLUSH_BITS:
+        return _flush_strength(mask)
+    return _RANK_TABLE[product]
+
+def evaluate_partial(product: int, suits: int, mask: int) -> tuple:
+    return _DESCRIBE[strength_partial(product, suits, mask)]
+
+class HandState:
+    """
+    Mano de un jugador que crece carta por carta (ver deal_card): guarda la
+    parcial de sus cartas (producto de primos = conteo de valores, contadores
+    de palo y máscara de 52 bits, de la que salen los bits de corrida de cada
+    palo). Cada carta nueva cuesta O(1) y best() es una consulta a las tablas,
+    sin recorrer las 21 combinaciones de 5 cartas.
+    """
+    __slots__ = ('product', 'suits', 'mask', 'count')
+
+    def __init__(self, codes=()):
+        self.product, self.suits, self.mask = partial_hand(codes)
+        self.count = len(codes)
+
+    def add(self, code: int):
+        self.product *= _CODE_PRIME[code]
+        self.suits   += _CODE_SUIT_COUNT[code]
+        self.mask    |= 1 << code
+        self.count   += 1
+
+    def best(self) -> tuple: # (rank, nombre, vals) de la mejor mano de 5, o (99, 'Nada', []) con menos de 5 cartas.
+        if self.count < 5:
+            return (99, 'Nada', [])
+        return evaluate_partial(self.product, self.suits, self.mask)
+
+    def strength(self) -> int: # Fuerza de la mejor mano (ver hand_strength); 0 con menos de 5 cartas.
+        if self.count < 5:
+            return 0
+        return strength_partial(self.product, self.suits, self.mask)
+
+def current_hand(player, community: list) -> HandState:
+    """
+    HandState del jugador con el tablero dado. Se comprueba por máscara (no
+    solo por cantidad de cartas): si sus cartas no se repartieron con
+    deal_card, o se reasignaron después, se rehace.
+    """
+    hand  = player.hand
+    codes = [c.code for c in player.cards + community]
+    if hand.count == len(codes) and hand.mask == hand_mask(codes):
+        return hand
+    return HandState(codes)
+
 # ══════════════════════════════════════
 #  PROBABILIDADES — Monte Carlo
 # ══════════════════════════════════════
 def estimate_win_probabilities(active_players: list, known_community: list,
-                               remaining_deck: list, simulations: int = 600) -> dict:
+                               remaining_deck: list, simulations: int = 600, rng=None) -> dict:
     """
     Simula 'simulations' manos completando el tablero aleatoriamente.
+    remaining_deck son los códigos de las cartas que quedan (como state.deck).
+    rng opcional (random.Random) para resultados reproducibles.
     Retorna dict {player_id: win_pct, ..., 'tie': tie_pct}.
     """
-    needed  = 5 - len(known_community)
-    wins    = {p.id: 0 for p in active_players}
-    ties    = 0
+    holes = [[c.code for c in p.cards] for p in active_players]
+    wins, ties = _mc_counts(holes, [c.code for c in known_community], list(remaining_deck),
+                            simulations, rng or random)
+    return _as_percentages(active_players, wins, ties, simulations)
 
-    for _ in range(simulations):
-        sample    = random.sample(remaining_deck, needed)
-        community = known_community + sample
+def _mc_counts(holes: list, board_known: list, remaining: list, simulations: int, rng) -> tuple:
+    """
+    Núcleo del Monte Carlo en Python puro, todo con códigos enteros (ver
+    CODIFICACIÓN COMPACTA): ni un objeto Card por simulación.
+    rng es cualquier objeto con .sample (el módulo random o un random.Random).
+    Retorna (victorias por jugador en el orden de holes, empates).
+    """
+    needed = 5 - len(board_known)
+    wins   = [0] * len(holes)
+    ties   = 0
 
-        results = [(get_best_hand(p.cards, community), p) for p in active_players]
-        best_rank = min(r[0][0] for r in results)
-        candidates = [p for (r, p) in results if r[0] == best_rank]
+    for _ in range(simulations):
+        board = board_known + rng.sample(remaining, needed)
 
-        if len(candidates) == 1:
-            wins[candidates[0].id] += 1
+        strengths = [strength_codes(hole + board) for hole in holes]
+        best = max(strengths)
+        if strengths.count(best) == 1:
+            wins[strengths.index(best)] += 1
         else:
-            # desempate por carta más alta del jugador
-            best_hv = max(
-                max(14 if c.value == 1 else c.value for c in p.cards)
-                for p in candidates
-            )
-            top = [p for p in candidates
-                   if max(14 if c.value == 1 else c.value for c in p.cards) == best_hv]
-            if len(top) == 1:
-                wins[top[0].id] += 1
-            else:
-                ties += 1
-
-    total = simulations
+            ties += 1
+    return wins, ties
+
+def _as_percentages(active_players: list, wins: list, ties: int, total: int) -> dict:
+    result = {p.id: wins[i] / total * 100 for i, p in enumerate(active_players)}
+    result['tie'] = ties / total * 100
+    return result
+
+
+# ══════════════════════════════════════
+#  PROBABILIDADES — Enumeración exacta
+# ══════════════════════════════════════
+# Con el flop en la mesa quedan pocos tableros posibles (C(45,2) = 990 en un mano a mano, 44 tras el turn): en vez de muestrearlos con ruido se recorren todos. print_probabilities usa este camino cuando el número de tableros no pasa de EXACT_LIMIT.
+EXACT_LIMIT = 20_000
+
+def count_runouts(known_community: list, remaining_deck: list) -> int: # Número de tableros distintos que faltan por salir.
+    return comb(len(remaining_deck), 5 - len(known_community))
+
+def enumerate_win_probabilities(active_players: list, known_community: list,
+                                remaining_deck: list) -> dict:
+    """
+    Recorre todos los tableros posibles y devuelve las fracciones exactas de
+    victoria y empate con el mismo formato que estimate_win_probabilities:
+    dict {player_id: win_pct, ..., 'tie': tie_pct}.
+    """
+    needed = 5 - len(known_community)
+    wins, ties, total = _runout_counts(_known_hands(active_players, known_community),
+                                       combinations(remaining_deck, needed))
     result = {p.id: wins[p.id] / total * 100 for p in active_players}
     result['tie'] = ties / total * 100
     return result
 
+def _known_hands(active_players: list, known_community: list) -> list:
+    # memo: cada jugador ya trae su mano junto con el tablero conocido (HandState)
+    hands = []
+    for p in active_players:
+        h = current_hand(p, known_community)
+        hands.append((p.id, h.product, h.suits, h.mask))
+    return hands
+
+def _runout_counts(hands: list, runouts) -> tuple: # (victorias por id, empates, tableros) sobre los tableros dados.
+    wins  = {pid: 0 for pid, *_ in hands}
+    ties  = 0
+    total = 0
+    for runout in runouts:
+        rp, rs, rm = partial_hand(runout)
+        best, winner, count = -1, None, 0
+        for pid, hp, hs, hm in hands:
+            score = strength_partial(rp * hp, rs + hs, rm | hm)
+            if score > best:
+                best, winner, count = score, pid, 1
+            elif score == best:
+                count += 1
+        if count == 1:
+            wins[winner] += 1
+        else:
+            ties += 1
+        total += 1
+    return wins, ties, total
 
-def prob_bar(pct: float, width: int = 18) -> str:
+# ══════════════════════════════════════
+#  PROBABILIDADES — Monte Carlo vectorizado (NumPy)
+# ══════════════════════════════════════
+# Las mismas tablas del evaluador rápido, pero como arreglos: el producto de primos se busca con searchsorted en las llaves ordenadas de _RANK_TABLE y cada máscara de palo indexa directamente un arreglo de 8192 categorías de color. Todos los tableros de una tanda se evalúan a la vez.
+BATCH_SIMULATIONS = 100_000   # simulaciones por llamada cuando NumPy está disponible
+_BATCH_CHUNK      = 25_000    # tableros por tanda (acota la memoria)
+_NP_TABLES: dict  = {}
+
+def _np_tables() -> dict:
+    if not _NP_TABLES:
+        keys = sorted(_RANK_TABLE)
+        flush_strength = np.zeros(1 << 13, dtype=np.int64)   # 0 = esa máscara no es color
+        for mask, strength in _FLUSH_TABLE.items():
+            flush_strength[mask] = strength
+        _NP_TABLES.update(
+            prime    = np.array(_CODE_PRIME, dtype=np.int64),
+            suit     = np.array(CODE_SUIT, dtype=np.int64),
+            bit      = np.array([1 << (c % 13) for c in range(52)], dtype=np.int64),
+            rank_key = np.array(keys, dtype=np.int64),
+            rank_strength  = np.array([_RANK_TABLE[k] for k in keys], dtype=np.int64),
+            flush_strength = flush_strength,
+        )
+    return _NP_TABLES
+
+def _np_partial(codes, t: dict):
+    """Producto de primos (...,) y máscaras por palo (..., 4) de un arreglo de códigos (..., k)."""
+    product = t['prime'][codes].prod(axis=-1)
+    suits, bits = t['suit'][codes], t['bit'][codes]
+    masks = np.stack([np.where(suits == s, bits, 0).sum(axis=-1) for s in range(4)], axis=-1)
+    return product, masks
+
+def _np_strengths(product, masks, t: dict):
+    """Fuerza (ver hand_strength) de cada mano a partir de su producto y máscaras."""
+    strength = t['rank_strength'][np.searchsorted(t['rank_key'], product)]
+    return np.maximum(strength, t['flush_strength'][masks].max(axis=-1))
+
+def estimate_win_probabilities_batch(active_players: list, known_community: list,
+                                     remaining_deck: list, simulations: int = BATCH_SIMULATIONS,
+                                     rng=None) -> dict:
+    """
+    Versión vectorizada de estimate_win_probabilities (requiere NumPy).
+    Sortea todos los tableros como una matriz (N, k) de índices del mazo restante
+    y evalúa cada par tablero/jugador en bloque. Mismo resultado:
+    dict {player_id: win_pct, ..., 'tie': tie_pct}.
+    """
+    if len(known_community) == 5:
+        simulations = 1   # el tablero ya está completo: un solo resultado posible
+    holes = [[c.code for c in p.cards] for p in active_players]
+    wins, ties = _batch_counts(holes, [c.code for c in known_community], list(remaining_deck),
+                               simulations, rng if rng is not None else np.random.default_rng())
+    return _as_percentages(active_players, wins, ties, simulations)
+
+def _batch_counts(holes: list, board_known: list, remaining: list, simulations: int, rng) -> tuple:
+    """Núcleo vectorizado: mismo contrato que _mc_counts, con rng = numpy.random.Generator."""
+    t      = _np_tables()
+    needed = 5 - len(board_known)
+    deck   = np.array(remaining, dtype=np.int64)
+    known  = np.array(board_known, dtype=np.int64)
+    hole_product, hole_masks = _np_partial(np.array(holes, dtype=np.int64), t)
+
+    wins = np.zeros(len(holes), dtype=np.int64)
+    ties = 0
+    done = 0
+    while done < simulations:
+        n = min(_BATCH_CHUNK, simulations - done)
+        draws = rng.random((n, len(deck))).argpartition(needed, axis=1)[:, :needed] if needed else np.empty((n, 0), dtype=np.int64)
+        board = np.concatenate([np.broadcast_to(known, (n, len(known))), deck[draws]], axis=1)
+        board_product, board_masks = _np_partial(board, t)
+
+        # fuerza (N, jugadores) de cada par tablero/jugador
+        score = _np_strengths(board_product[:, None] * hole_product[None, :],
+                              board_masks[:, None, :] | hole_masks[None, :, :], t)
+        top   = score == score.max(axis=1, keepdims=True)
+        alone = top.sum(axis=1) == 1
+        wins += (top & alone[:, None]).sum(axis=0)
+        ties += int((~alone).sum())
+        done += n
+    return [int(w) for w in wins], ties
+
+# ══════════════════════════════════════
+#  PROBABILIDADES — En paralelo (varios procesos)
+# ══════════════════════════════════════
+# El presupuesto de simulaciones se corta en bloques de PARALLEL_CHUNK y cada bloque recibe su propio generador, derivado de la semilla con SeedSequence.spawn. Como los bloques y sus semillas no dependen del número de procesos, con la misma semilla el resultado es idéntico con 1 o con 16 workers.
+PARALLEL_CHUNK = 10_000
+
+def _chunk_seeds(seed, n_chunks: int) -> list:
+    if np is not None:
+        return np.random.SeedSequence(seed).spawn(n_chunks)
+    base = random.Random(seed).getrandbits(64)   # sin NumPy: una semilla entera por bloque
+    return [f'{base}-{i}' for i in range(n_chunks)]
+
+def _equity_chunk(task: tuple) -> tuple: # Trabajo de un proceso: simula un bloque con su propio generador.
+    holes, board_known, remaining, n, chunk_seed = task
+    if np is not None:
+        return _batch_counts(holes, board_known, remaining, n, np.random.default_rng(chunk_seed))
+    return _mc_counts(holes, board_known, remaining, n, random.Random(chunk_seed))
+
+def estimate_win_probabilities_parallel(active_players: list, known_community: list,
+                                        remaining_deck: list, simulations: int = BATCH_SIMULATIONS,
+                                        seed=None, workers=None) -> dict:
+    """
+    Reparte las simulaciones entre un pool de procesos y suma las victorias y
+    empates de cada bloque. workers=None usa todos los núcleos; workers=1 corre
+    en el proceso actual. Mismo formato de resultado que estimate_win_probabilities.
+    """
+    if len(known_community) == 5:
+        simulations = 1
+    holes  = [[c.code for c in p.cards] for p in active_players]
+    known  = [c.code for c in known_community]
+    deck   = list(remaining_deck)
+    sizes  = [min(PARALLEL_CHUNK, simulations - i) for i in range(0, simulations, PARALLEL_CHUNK)]
+    tasks  = [(holes, known, deck, n, s) for n, s in zip(sizes, _chunk_seeds(seed, len(sizes)))]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        partials = list(map(_equity_chunk, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partials = list(pool.map(_equity_chunk, tasks))
+
+    wins = [sum(w[i] for w, _ in partials) for i in range(len(holes))]
+    ties = sum(t for _, t in partials)
+    return _as_percentages(active_players, wins, ties, simulations)
+
+# ══════════════════════════════════════
+#  PROBABILIDADES — Tabla preflop
+# ══════════════════════════════════════
+# Antes del flop la probabilidad de una mano contra rivales desconocidos solo depende de su clase (par, suited u offsuit: 169 clases) y del número de jugadores. Se precalcula una vez con generar_preflop.py y se guarda en PREFLOP_PATH; el juego la abre con mmap la primera vez que la necesita y cada consulta es una lectura directa del arreglo.
+# Clases en una cuadrícula de 13x13 por valor (0 = 2 ... 12 = A): el par en la diagonal, suited en [alto][bajo] y offsuit en [bajo][alto].
+PREFLOP_PATH    = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'preflop_equity.bin')
+PREFLOP_PLAYERS = range(2, 7)
+_PREFLOP_MAGIC  = b'PFEQ'
+_PREFLOP_HEADER = struct.Struct('<4sHHI')   # magia, jugador mínimo, jugador máximo, simulaciones por clase
+_PREFLOP: list  = []                        # [memoryview de floats] una vez cargada
+
+def hand_class_index(code1: int, code2: int) -> int:
+    r1, r2 = code1 % 13, code2 % 13
+    hi, lo = max(r1, r2), min(r1, r2)
+    return hi * 13 + lo if CODE_SUIT[code1] == CODE_SUIT[code2] else lo * 13 + hi
+
+def hand_class_name(index: int) -> str:
+    a, b = divmod(index, 13)
+    names = '23456789TJQKA'
+    if a == b:
+        return names[a] * 2
+    return names[max(a, b)] + names[min(a, b)] + ('s' if a > b else 'o')
+
+def hand_class_codes(index: int) -> tuple: # Una mano representante de la clase (palos ♠/♥).
+    a, b = divmod(index, 13)
+    return (a, b) if a > b else (a, 13 + b)
+
+def _estimate_vs_random_batch(hole: list, board_known: list, opponents: int,
+                              simulations: int, rng) -> tuple:
+    """
+    Victorias y empates de una mano contra 'opponents' manos al azar (requiere
+    NumPy). Se sortean a la vez el resto del tablero y las cartas de los rivales.
+    Retorna (victorias, empates).
+    """
+    t      = _np_tables()
+    dead   = set(hole) | set(board_known)
+    deck   = np.array([c for c in range(52) if c not in dead], dtype=np.int64)
+    known  = np.array(board_known, dtype=np.int64)
+    needed = 5 - len(board_known)
+    k      = needed + 2 * opponents
+    hole_product, hole_masks = _np_partial(np.array(hole, dtype=np.int64), t)
+
+    wins = ties = done = 0
+    while done < simulations:
+        n = min(_BATCH_CHUNK, simulations - done)
+        cards = deck[rng.random((n, len(deck))).argpartition(k, axis=1)[:, :k]]
+        board = np.concatenate([np.broadcast_to(known, (n, len(known))), cards[:, :needed]], axis=1)
+        opp   = cards[:, needed:].reshape(n, opponents, 2)
+        board_product, board_masks = _np_partial(board, t)
+        opp_product, opp_masks     = _np_partial(opp, t)
+
+        hero  = _np_strengths(board_product * hole_product, board_masks | hole_masks, t)
+        rival = _np_strengths(board_product[:, None] * opp_product, board_masks[:, None, :] | opp_masks, t)
+        best_rival = rival.max(axis=1)
+        wins += int((hero > best_rival).sum())
+        ties += int((hero == best_rival).sum())
+        done += n
+    return wins, ties
+
+def build_preflop_table(path: str = PREFLOP_PATH, simulations: int = 50_000, seed=None, progress=None):
+    """Calcula la tabla preflop completa (169 clases x 2-6 jugadores) y la escribe en path."""
+    seeds = np.random.SeedSequence(seed).spawn(len(PREFLOP_PLAYERS) * 169)
+    data  = array('f')
+    for i, players in enumerate(PREFLOP_PLAYERS):
+        for idx in range(169):
+            rng = np.random.default_rng(seeds[i * 169 + idx])
+            wins, ties = _estimate_vs_random_batch(list(hand_class_codes(idx)), [], players - 1, simulations, rng)
+            data.extend((wins / simulations * 100, ties / simulations * 100))
+            if progress:
+                progress(players, idx)
+    with open(path, 'wb') as f:
+        f.write(_PREFLOP_HEADER.pack(_PREFLOP_MAGIC, PREFLOP_PLAYERS[0], PREFLOP_PLAYERS[-1], simulations))
+        data.tofile(f)
+
+def _preflop_table():
+    if not _PREFLOP:
+        with open(PREFLOP_PATH, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, lo, hi, _ = _PREFLOP_HEADER.unpack_from(mm)
+        if magic != _PREFLOP_MAGIC or (lo, hi) != (PREFLOP_PLAYERS[0], PREFLOP_PLAYERS[-1]):
+            raise ValueError(f'{PREFLOP_PATH} no es una tabla preflop válida')
+        _PREFLOP.append(memoryview(mm)[_PREFLOP_HEADER.size:].cast('f'))
+    return _PREFLOP[0]
+
+def preflop_probability(cards: list, num_players: int) -> dict:
+    """
+    Probabilidad preflop de una mano contra num_players - 1 manos al azar,
+    leída de la tabla: {'win': pct, 'tie': pct}.
+    """
+    table = _preflop_table()
+    i = ((num_players - PREFLOP_PLAYERS[0]) * 169 + hand_class_index(cards[0].code, cards[1].code)) * 2
+    return {'win': table[i], 'tie': table[i + 1]}
+
+def preflop_table_available() -> bool:
+    return bool(_PREFLOP) or os.path.exists(PREFLOP_PATH)
+
+
+# ══════════════════════════════════════
+#  PROBABILIDADES — Precisión adaptativa
+# ══════════════════════════════════════
+# En lugar de un número fijo de simulaciones se muestrea por tandas hasta que el intervalo de confianza de todas las probabilidades (victoria de cada jugador y empate) es más angosto que target_halfwidth, o hasta agotar time_budget. Un favorito claro se resuelve en una tanda; un volado sigue muestreando.
+TARGET_HALFWIDTH = 0.5     # puntos porcentuales (±) al 95%
+TIME_BUDGET      = 0.5     # segundos como máximo por cálculo
+_Z_95            = 1.96
+
+def confidence_halfwidth(pct: float, n: int, z: float = _Z_95) -> float: # Semiancho del intervalo (aprox. normal) de una proporción, en puntos porcentuales.
+    p = pct / 100
+    return z * (p * (1 - p) / n) ** 0.5 * 100
+
+def estimate_win_probabilities_adaptive(active_players: list, known_community: list,
+                                        remaining_deck: list,
+                                        target_halfwidth: float = TARGET_HALFWIDTH,
+                                        time_budget: float = TIME_BUDGET,
+                                        batch: int = None, rng=None) -> dict:
+    """
+    Monte Carlo por tandas con parada temprana. Retorna el mismo dict que
+    estimate_win_probabilities más:
+      'ci': {player_id: ±pct, ..., 'tie': ±pct}  intervalo de confianza al 95%
+      'n':  simulaciones usadas
+    """
+    deadline = time.perf_counter() + time_budget
+    for result in _adaptive_batches(active_players, known_community, remaining_deck, batch, rng):
+        if len(known_community) == 5 or max(result['ci'].values()) <= target_halfwidth \
+                or time.perf_counter() >= deadline:
+            return result
+
+def _adaptive_batches(active_players: list, known_community: list, remaining_deck: list,
+                      batch: int = None, rng=None):
+    """Genera la estimación acumulada (con 'ci' y 'n') tras cada tanda, sin fin; quien la consume decide cuándo parar."""
+    holes = [[c.code for c in p.cards] for p in active_players]
+    known = [c.code for c in known_community]
+    deck  = list(remaining_deck)
+    if np is not None:
+        batch = batch or _BATCH_CHUNK
+        rng   = rng if rng is not None else np.random.default_rng()
+        core  = _batch_counts
+    else:
+        batch = batch or 500
+        rng   = rng or random
+        core  = _mc_counts
+
+    wins = [0] * len(holes)
+    ties = n = 0
+    while True:
+        w, t = core(holes, known, deck, batch, rng)
+        wins = [a + b for a, b in zip(wins, w)]
+        ties += t
+        n    += batch
+        result = _as_percentages(active_players, wins, ties, n)
+        result['ci'] = {k: confidence_halfwidth(v, n) for k, v in result.items()}
+        result['n']  = n
+        yield result
+
+# ══════════════════════════════════════
+#  PROBABILIDADES — Caché
+# ══════════════════════════════════════
+# Las mismas situaciones se repiten: sin tabla preflop, round_1 calcula las mismas probabilidades una vez por jugador, y dos tableros que solo cambian de palos (A♠K♠ con flop de ♠ y A♥K♥ con flop de ♥) tienen las mismas probabilidades. La llave de la caché es la situación canónica: cartas de cada jugador en orden, tablero y cartas muertas (repartidas pero fuera de la mano) con los palos renombrados de la forma menor de las 24 posibles; el número de jugadores va implícito en las manos. Los resultados se guardan por posición (no por id) y se recuerdan en memoria con desalojo LRU; con open_store también en un archivo SQLite que comparten las corridas.
+EQUITY_CACHE_SIZE = 4096   # situaciones en memoria
+EQUITY_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'equity_cache.sqlite')
+_SUIT_RENAMES     = tuple(tuple(perm[s] * 13 + r for s in range(4) for r in range(13))   # código -> código
+                          for perm in permutations(range(4)))
+
+def equity_cache_key(tag: str, active_players: list, known_community: list, remaining_deck: list) -> bytes:
+    """
+    Llave canónica de una situación. tag distingue el método (exacto,
+    adaptativo, 600 simulaciones...): cada uno guarda su propio resultado.
+    """
+    holes = [[c.code for c in p.cards] for p in active_players]
+    board = [c.code for c in known_community]
+    dead  = set(range(52)).difference(remaining_deck, board, *holes)
+    best  = None
+    for rename in _SUIT_RENAMES:
+        key = []
+        for hole in holes:
+            key += sorted([rename[c] for c in hole])
+        key.append(255)
+        key += sorted([rename[c] for c in board])
+        key.append(255)
+        key += sorted([rename[c] for c in dead])
+        if best is None or key < best:
+            best = key
+    return tag.encode() + b'\0' + bytes(best)
+
+def _by_position(active_players: list, probs: dict) -> dict:
+    """probs con los id de jugador cambiados por su posición (como texto, para JSON)."""
+    pos = {p.id: str(i) for i, p in enumerate(active_players)}
+    out = {pos.get(k, k): v for k, v in probs.items()}
+    if 'ci' in probs:
+        out['ci'] = {pos.get(k, k): v for k, v in probs['ci'].items()}
+    return out
+
+def _by_player(active_players: list, stored: dict) -> dict:
+    ids = {str(i): p.id for i, p in enumerate(active_players)}
+    out = {ids.get(k, k): v for k, v in stored.items()}
+    if 'ci' in stored:
+        out['ci'] = {ids.get(k, k): v for k, v in stored['ci'].items()}
+    return out
+
+class EquityCache:
+    """
+    Caché LRU de probabilidades por llave canónica (ver equity_cache_key).
+    Los valores son dicts por posición listos para JSON. Es segura entre
+    hilos: EquityJob la consulta desde el suyo.
+    """
+    def __init__(self, size: int = EQUITY_CACHE_SIZE, path: str = None):
+        self.size   = size
+        self.hits   = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock  = threading.Lock()
+        self._db    = None
+        if path:
+            self.open_store(path)
+
+    def open_store(self, path: str = EQUITY_CACHE_PATH):
+        """Guarda también en SQLite (path) y consulta ahí lo que no esté en memoria."""
+        import sqlite3
+        with self._lock:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute('CREATE TABLE IF NOT EXISTS equity (key BLOB PRIMARY KEY, value TEXT NOT NULL)')
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key: bytes):
+        with self._lock:
+            value = self._items.get(key)
+            if value is None and self._db is not None:
+                row = self._db.execute('SELECT value FROM equity WHERE key = ?', (key,)).fetchone()
+                if row:
+                    value = json.loads(row[0])
+                    self._remember(key, value)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: bytes, value: dict):
+        with self._lock:
+            self._remember(key, value)
+            if self._db is not None:
+                with self._db:
+                    self._db.execute('INSERT OR REPLACE INTO equity VALUES (?, ?)', (key, json.dumps(value)))
+
+    def _remember(self, key: bytes, value: dict):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.size:
+            self._items.popitem(last=False)
+
+EQUITY_CACHE = EquityCache()
+
+def cached_probabilities(tag: str, compute, active_players: list, known_community: list,
+                         remaining_deck: list, cache: EquityCache = None) -> dict:
+    """
+    compute(active_players, known_community, remaining_deck) pasando por la
+    caché: una situación equivalente ya calculada con el mismo tag se devuelve
+    sin volver a calcular.
+    """
+    cache  = EQUITY_CACHE if cache is None else cache
+    key    = equity_cache_key(tag, active_players, known_community, remaining_deck)
+    stored = cache.get(key)
+    if stored is not None:
+        return _by_player(active_players, stored)
+    probs = compute(active_players, known_community, remaining_deck)
+    cache.put(key, _by_position(active_players, probs))
+    return probs
+
+def estimate_win_probabilities_cached(active_players: list, known_community: list,
+                                      remaining_deck: list, simulations: int = 600,
+                                      rng=None, cache: EquityCache = None) -> dict:
+    """estimate_win_probabilities con caché (la llave incluye el número de simulaciones)."""
+    return cached_probabilities(
+        f'mc{simulations}',
+        lambda *a: estimate_win_probabilities(*a, simulations=simulations, rng=rng),
+        active_players, known_community, remaining_deck, cache)
+
+
+# ══════════════════════════════════════
+#  PROBABILIDADES — En segundo plano
+# ══════════════════════════════════════
+# El cálculo de cada calle arranca en un hilo en cuanto salen las cartas (EquityJob) y sigue afinándose mientras los jugadores miran la mesa y apuestan. La terminal muestra la estimación del momento y la redibuja en su lugar hasta que se presiona Enter; al cerrar las apuestas se guarda en prob_history el valor ya refinado. La enumeración exacta también entrega estimaciones parciales: recorre los tableros en orden aleatorio por tandas, así que cada tanda es una muestra sin reemplazo cuyo intervalo (con corrección por población finita) se cierra hasta el valor exacto; no se detiene a medias porque son a lo más EXACT_LIMIT tableros. Con el flop o el turn eso toma milisegundos; el Monte Carlo adaptativo corre en el preflop cuando no está la tabla preflop.
+BACKGROUND_HALFWIDTH = 0.2    # puntos porcentuales (±) al 95%: más fino que el cálculo en primer plano
+ENUMERATION_CHUNK    = 64     # tableros por entrega parcial de la enumeración exacta
+BACKGROUND_BUDGET    = 30.0   # segundos como máximo por calle
+LIVE_REFRESH         = 0.25   # segundos entre redibujados de la estimación
+
+def _enumeration_batches(active_players: list, known_community: list, remaining_deck: list,
+                         chunk: int = ENUMERATION_CHUNK, rng=None):
+    """
+    Recorre todos los tableros en orden aleatorio y genera el resultado
+    acumulado tras cada tanda, con 'n' (tableros vistos) y, mientras falten,
+    'ci'; el último es el de enumerate_win_probabilities.
+    """
+    hands   = _known_hands(active_players, known_community)
+    runouts = list(combinations(remaining_deck, 5 - len(known_community)))
+    (rng or random).shuffle(runouts)
+    total   = len(runouts)
+    wins    = {p.id: 0 for p in active_players}
+    ties = n = 0
+    for start in range(0, total, chunk):
+        w, t, k = _runout_counts(hands, runouts[start:start + chunk])
+        for pid in wins:
+            wins[pid] += w[pid]
+        ties += t
+        n    += k
+        result = {p.id: wins[p.id] / n * 100 for p in active_players}
+        result['tie'] = ties / n * 100
+        if n < total:
+            finite = ((total - n) / (total - 1)) ** 0.5   # sin reemplazo: el intervalo llega a 0
+            result['ci'] = {key: confidence_halfwidth(v, n) * finite for key, v in result.items()}
+        result['n'] = n
+        yield result
+
+class EquityJob:
+    """
+    Probabilidades de una calle calculadas en un hilo de fondo. snapshot() da
+    la mejor estimación hasta el momento (None si aún no hay ninguna) y
+    result() detiene el muestreo y devuelve la final.
+    """
+    def __init__(self, active_players: list, known_community: list, remaining_deck: list,
+                 target_halfwidth: float = BACKGROUND_HALFWIDTH, time_budget: float = BACKGROUND_BUDGET):
+        self.players   = list(active_players)
+        self.community = list(known_community)
+        self.runouts   = count_runouts(known_community, remaining_deck)
+        self.exact     = self.runouts <= EXACT_LIMIT
+        self._deck     = list(remaining_deck)
+        self._target   = target_halfwidth
+        self._budget   = time_budget
+        self._probs    = None
+        self._lock     = threading.Lock()
+        self._stop     = threading.Event()
+        self._thread   = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        key    = equity_cache_key('exacto' if self.exact else f'fondo{self._target}',
+                                  self.players, self.community, self._deck)
+        stored = EQUITY_CACHE.get(key)
+        if stored is not None:
+            with self._lock:
+                self._probs = _by_player(self.players, stored)
+            return
+        if self.exact:
+            for probs in _enumeration_batches(self.players, self.community, self._deck):
+                with self._lock:
+                    self._probs = probs
+            EQUITY_CACHE.put(key, _by_position(self.players, probs))
+            return
+        deadline = time.perf_counter() + self._budget
+        for probs in _adaptive_batches(self.players, self.community, self._deck):
+            with self._lock:
+                self._probs = probs
+            if max(probs['ci'].values()) <= self._target:
+                EQUITY_CACHE.put(key, _by_position(self.players, probs))   # solo si llegó a la precisión pedida
+                return
+            if self._stop.is_set() or time.perf_counter() >= deadline:
+                return
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return self._probs
+
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
+    def result(self) -> dict:
+        self._stop.set()
+        self._thread.join()
+        return self._probs
+
+    def method(self, probs: dict) -> str:
+        if self.exact:
+            seen = probs.get('n', self.runouts)
+            return f'exacto · {self.runouts} tableros' if seen >= self.runouts else \
+                   f'exacto · {seen} de {self.runouts} tableros'
+        return f'Monte Carlo · {probs["n"]} simulaciones'
+
+def start_equity_job(state: GameState) -> EquityJob: # None si queda menos de 2 jugadores activos.
+    active = [p for p in state.players if not p.folded]
+    return EquityJob(active, state.community, state.deck) if len(active) >= 2 else None
+
+def record_equity_job(state: GameState, job: EquityJob, label: str):
+    """Guarda en prob_history el resultado refinado del job (al cerrar la ronda de apuestas)."""
+    if job is None:
+        return
+    state.prob_history.append({'label': label, 'probs': job.result(),
+                               'players': [(p.id, p.name) for p in job.players],
+                               'board': [c.code for c in job.community]})
+
+
+# ══════════════════════════════════════
+#  PROBABILIDADES — Rangos
+# ══════════════════════════════════════
+# Para revisar una mano ya jugada no basta con las cartas exactas: a cada rival se le asigna un rango (conjunto de combos de 2 cartas con peso), como "top 15%" o una lista explícita "AKs, QQ, 76s:0.5, AsKh". Un rango es una lista de (carta alta, carta baja, peso) con códigos 0-51.
+# Cada tablero muestreado (o enumerado) se evalúa una sola vez por combo y se reutiliza en todos los enfrentamientos: para cada combo se cuenta el peso de los combos rivales que le ganan, empatan o pierden con una búsqueda binaria sobre las fuerzas ordenadas, descontando los combos que comparten carta con él. Así el número de tableros no depende del tamaño de los rangos.
+RANGE_SIMULATIONS = 2_000
+REVIEW_RANGE       = 'top 30%'   # rango de los rivales en la revisión al final de la partida ('' la omite)
+REVIEW_SIMULATIONS = 400         # tableros por calle en esa revisión (±3% aprox.), para no hacer esperar
+_RANK_CHARS       = '23456789TJQKA'
+_SUIT_CHARS       = {'s': 0, 'h': 1, 'd': 2, 'c': 3, **{s: i for i, s in enumerate(SUIT_ORDER)}}
+_RANGE_ORDER: list = []   # las 169 clases de mejor a peor (equity preflop mano a mano)
+
+def _combo(c1: int, c2: int) -> tuple: # Orden canónico de un combo: primero el código mayor.
+    return (c1, c2) if c1 > c2 else (c2, c1)
+
+def _class_combos(index: int) -> list: # Todos los combos de una clase preflop (4 suited, 6 pares, 12 offsuit).
+    a, b = divmod(index, 13)
+    if a == b:
+        return [_combo(s1 * 13 + a, s2 * 13 + a) for s1, s2 in combinations(range(4), 2)]
+    hi, lo = max(a, b), min(a, b)
+    return [_combo(s1 * 13 + hi, s2 * 13 + lo) for s1 in range(4) for s2 in range(4)
+            if (s1 == s2) == (a > b)]
+
+def range_order() -> list:
+    """Índices de las 169 clases de mejor a peor según la tabla preflop (victoria + medio empate, mano a mano)."""
+    if not _RANGE_ORDER:
+        table = _preflop_table()
+        _RANGE_ORDER.extend(sorted(range(169), key=lambda i: -(table[2 * i] + table[2 * i + 1] / 2)))
+    return _RANGE_ORDER
+
+def top_range(pct: float) -> list: # Las mejores clases hasta cubrir pct% de los 1326 combos posibles.
+    combos, target = [], pct / 100 * 1326
+    for index in range_order():
+        if len(combos) >= target:
+            break
+        combos.extend(_class_combos(index))
+    return [(c1, c2, 1.0) for c1, c2 in combos]
+
+def _parse_card(text: str) -> int:
+    if len(text) != 2 or text[0].upper() not in _RANK_CHARS or text[1] not in _SUIT_CHARS:
+        raise ValueError(f'carta inválida: {text!r}')
+    return _SUIT_CHARS[text[1]] * 13 + _RANK_CHARS.index(text[0].upper())
+
+def _parse_token(token: str) -> list:
+    """
+    Combos de un término: 'top 15%', 'AKs', 'AKo', 'AK', 'QQ' o 'AsKh'. Con '+'
+    al final sube hasta el tope: 'QQ+' = QQ, KK, AA y 'ATs+' = ATs ... AKs
+    (la carta alta queda fija y sube la baja).
+    """
+    t = token.lower().removeprefix('top').strip()
+    if t.endswith('%'):
+        if not preflop_table_available():
+            raise ValueError(f'{token!r} necesita la tabla preflop (python generar_preflop.py)')
+        return [(c1, c2) for c1, c2, _ in top_range(float(t[:-1]))]
+    plus = token.endswith('+')
+    body = token[:-1] if plus else token
+    if len(body) == 4 and not plus:
+        return [_combo(_parse_card(body[:2]), _parse_card(body[2:]))]
+    ranks = body[:2].upper()
+    kind  = body[2:].lower()
+    if len(body) not in (2, 3) or any(r not in _RANK_CHARS for r in ranks) or kind not in ('', 's', 'o'):
+        raise ValueError(f'término de rango inválido: {token!r}')
+    a, b   = (_RANK_CHARS.index(r) for r in ranks)
+    hi, lo = max(a, b), min(a, b)
+    if hi == lo:
+        if kind:
+            raise ValueError(f'un par no es suited ni offsuit: {token!r}')
+        return [c for r in range(hi, 13 if plus else hi + 1) for c in _class_combos(r * 13 + r)]
+    indices = []
+    for low in range(lo, hi if plus else lo + 1):
+        indices += [hi * 13 + low] * (kind != 'o') + [low * 13 + hi] * (kind != 's')
+    return [c for i in indices for c in _class_combos(i)]
+
+def parse_range(spec) -> list:
+    """
+    Convierte una descripción de rango en [(alta, baja, peso), ...]:
+      - texto separado por comas: 'top 15%', 'AKs', 'AKo', 'AK', 'QQ', 'AsKh' (o 'A♠K♥'),
+        'QQ+' o 'ATs+', cada término con ':peso' opcional ('76s:0.5'); si un combo se
+        repite vale el último peso (un término mal escrito lanza ValueError);
+      - lista de combos: pares de Card o de códigos, o triples (c1, c2, peso).
+    """
+    weights = {}
+    if isinstance(spec, str):
+        for token in filter(None, (t.strip() for t in spec.split(','))):
+            token, _, weight = token.partition(':')
+            for combo in _parse_token(token.strip()):
+                weights[combo] = float(weight) if weight else 1.0
+    else:
+        for item in spec:
+            c1, c2 = (c.code if isinstance(c, Card) else c for c in item[:2])
+            weights[_combo(c1, c2)] = float(item[2]) if len(item) > 2 else 1.0
+    return [(c1, c2, w) for (c1, c2), w in weights.items() if w > 0]
+
+def hand_range(cards: list) -> list: # Rango de una mano conocida (un solo combo).
+    return parse_range([cards])
+
+def _range_board_table(rows: list) -> tuple:
+    """
+    Resumen de los combos vivos de un rango en un tablero, rows = [(fuerza, peso, c1, c2)]:
+    fuerzas ordenadas con pesos acumulados (búsqueda binaria) y lo mismo por
+    carta, con los combos que la usan (para descontar en O(log n) los que
+    chocan con el combo rival).
+    """
+    rows.sort()
+    keys, cum, by_card, exact = [], [0.0], {}, {}
+    for s, w, c1, c2 in rows:
+        keys.append(s)
+        cum.append(cum[-1] + w)
+        for card in (c1, c2):
+            card_keys, card_cum = by_card.setdefault(card, ([], [0.0]))
+            card_keys.append(s)
+            card_cum.append(card_cum[-1] + w)
+        exact[(c1, c2)] = (s, w)
+    return keys, cum, by_card, exact
+
+def _versus(table: tuple, s: int, c1: int, c2: int) -> tuple:
+    """Peso de los combos del rango que pierden contra s, que no le ganan, y el total compatible con (c1, c2)."""
+    keys, cum, by_card, exact = table
+    less, not_more, total = cum[bisect_left(keys, s)], cum[bisect_right(keys, s)], cum[-1]
+    for card in (c1, c2):
+        if card in by_card:
+            card_keys, card_cum = by_card[card]
+            total    -= card_cum[-1]
+            less     -= card_cum[bisect_left(card_keys, s)]
+            not_more -= card_cum[bisect_right(card_keys, s)]
+    if (c1, c2) in exact:   # el mismo combo se descontó dos veces
+        s2, w = exact[(c1, c2)]
+        total += w
+        less  += w * (s2 < s)
+        not_more += w * (s2 <= s)
+    return less, not_more, total
+
+def range_equity(ranges: dict, known_community: list = (), dead: list = (),
+                 simulations: int = RANGE_SIMULATIONS, exhaustive: bool = None, rng=None) -> dict:
+    """
+    Probabilidades de rango contra rango. ranges = {clave: rango}, con el rango
+    en cualquier forma que acepte parse_range (texto, combos de Card o de
+    códigos, o su propio resultado); known_community y dead son Card o
+    códigos que ya no pueden salir. Los combos bloqueados por esas cartas se
+    descartan. Con exhaustive=True se recorren todos los tableros, con False se
+    muestrean 'simulations'; None elige el recorrido completo si no hay más
+    tableros que simulaciones.
+    Retorna {clave: {'win': pct, 'tie': pct, 'combos': {(c1, c2): {'win', 'tie'}}}}.
+    Mano a mano es exacto; con tres o más rangos se ignora el choque de cartas
+    entre rivales (cada uno se cuenta contra el combo evaluado, no entre sí).
+    """
+    codes  = lambda cards: [c.code if isinstance(c, Card) else c for c in cards]
+    board  = codes(known_community)
+    known  = hand_mask(board) | hand_mask(codes(dead))
+    combos = {}
+    for key, spec in ranges.items():
+        rows = parse_range(spec)
+        live = [(c1, c2, w) + partial_hand((c1, c2)) for c1, c2, w in rows
+                if not known >> c1 & 1 and not known >> c2 & 1]
+        if not live:
+            raise ValueError(f'el rango de {key!r} queda vacío con las cartas conocidas')
+        combos[key] = live
+
+    deck   = [c for c in range(52) if not known >> c & 1]
+    needed = 5 - len(board)
+    if exhaustive is None:
+        exhaustive = comb(len(deck), needed) <= simulations
+    rng    = rng or random
+    boards = combinations(deck, needed) if exhaustive else \
+             (rng.sample(deck, needed) for _ in range(simulations))
+
+    kp, ks, km = partial_hand(board)
+    acc = {key: {(c1, c2): [0.0, 0.0, 0.0] for c1, c2, *_ in live} for key, live in combos.items()}
+    for runout in boards:
+        rp, rs, rm = partial_hand(runout)
+        bp, bs, bm = rp * kp, rs + ks, rm | km
+        rows = {key: [(strength_partial(bp * cp, bs + cs, bm | cm), w, c1, c2)
+                      for c1, c2, w, cp, cs, cm in live if not cm & bm]
+                for key, live in combos.items()}
+        tables = {key: _range_board_table(list(r)) for key, r in rows.items()}
+        for key, r in rows.items():
+            others = [t for k, t in tables.items() if k != key]
+            sums   = acc[key]
+            for s, w, c1, c2 in r:
+                p_win = p_not_lose = 1.0
+                for t in others:
+                    less, not_more, total = _versus(t, s, c1, c2)
+                    if total <= 0:
+                        break
+                    w          *= total
+                    p_win      *= less / total
+                    p_not_lose *= not_more / total
+                else:
+                    entry = sums[(c1, c2)]
+                    entry[0] += w
+                    entry[1] += w * p_win
+                    entry[2] += w * (p_not_lose - p_win)
+
+    result = {}
+    for key, sums in acc.items():
+        total = sum(e[0] for e in sums.values())
+        if total <= 0:
+            raise ValueError(f'el rango de {key!r} no tiene combos compatibles con los rivales')
+        result[key] = {
+            'win':    sum(e[1] for e in sums.values()) / total * 100,
+            'tie':    sum(e[2] for e in sums.values()) / total * 100,
+            'combos': {c: {'win': e[1] / e[0] * 100, 'tie': e[2] / e[0] * 100}
+                       for c, e in sums.items() if e[0] > 0},
+        }
+    return result
+
+
+def prob_bar(pct: float, width: int = 18, ci: float = None) -> str:
     filled = round(pct / 100 * width)
     bar    = '█' * filled + '░' * (width - filled)
     clr    = C.GREEN if pct >= 55 else (C.YELLOW if pct >= 35 else C.RED)
-    return f"{clr}{bar}{C.RESET} {pct:5.1f}%"
+    err    = f" {dim(f'±{ci:.1f}')}" if ci is not None else ''
+    return f"{clr}{bar}{C.RESET} {pct:5.1f}%{err}"
 
 
 def print_probabilities(state: GameState, label: str):
@@ -203,15 +1305,91 @@ def print_probabilities(state: GameState, label: str):
     if len(active) < 2:
         return
     remaining = list(state.deck)
-    probs = estimate_win_probabilities(active, state.community, remaining)
+    runouts   = count_runouts(state.community, remaining)
+    if runouts <= EXACT_LIMIT:
+        probs  = cached_probabilities('exacto', enumerate_win_probabilities, active, state.community, remaining)
+        method = f'exacto · {runouts} tableros'
+    else:
+        probs  = cached_probabilities('adaptativo', estimate_win_probabilities_adaptive,
+                                      active, state.community, remaining)
+        method = f'Monte Carlo · {probs["n"]} simulaciones'
 
     state.prob_history.append({'label': label, 'probs': probs,
-                                'players': [(p.id, p.name) for p in active]})
+                                'players': [(p.id, p.name) for p in active],
+                                'board': [c.code for c in state.community]})
+    print('\n'.join(_probability_lines(active, probs, label, method)))
 
-    print(f"\n  {gold('── Probabilidades de victoria ──')}  {dim(label)}")
-    for p in active:
-        print(f"  {p.name:<12} {prob_bar(probs[p.id])}")
+
+def _probability_lines(active: list, probs: dict, label: str, method: str, live: bool = False) -> list:
+    """
+    Líneas del bloque de probabilidades. Con live=True el bloque siempre tiene
+    el mismo alto (la línea de empate se deja en blanco si no aplica) para
+    poder redibujarlo en su lugar, y probs=None se muestra como 'calculando'.
+    """
+    lines = ['', f"  {gold('── Probabilidades de victoria ──')}  {dim(label)}  {dim('(' + method + ')')}"]
+    if probs is None:
+        return lines + [f"  {p.name:<12} {dim('calculando...')}" for p in active] + ['']
+    ci = probs.get('ci', {})
+    lines += [f"  {p.name:<12} {prob_bar(probs[p.id], ci=ci.get(p.id))}" for p in active]
     if probs.get('tie', 0) > 0.5:
+        lines.append(f"  {'Empate':<12} {prob_bar(probs['tie'], ci=ci.get('tie'))}")
+    elif live:
+        lines.append('')
+    return lines
+
+
+def print_live_probabilities(job: EquityJob, label: str, msg: str = "  Presiona Enter para continuar..."):
+    """
+    Muestra la estimación del job y, en una terminal, la redibuja en su lugar
+    cada LIVE_REFRESH segundos mientras se espera el Enter (press_enter).
+    """
+    if job is None:
+        press_enter(msg)
+        return
+
+    def lines():
+        probs = job.snapshot()
+        return _probability_lines(job.players, probs, label,
+                                  job.method(probs) if probs else 'calculando', live=True)
+
+    shown = lines()
+    print('\n'.join(shown))
+    stop  = threading.Event()
+
+    def refresh():
+        while not stop.wait(LIVE_REFRESH):
+            # guardar cursor, subir al inicio del bloque (+1 por la línea en blanco de press_enter), reescribir y volver
+            sys.stdout.write(f"\x1b7\x1b[{len(shown) + 1}F"
+                             + ''.join(f"\x1b[2K{line}\n" for line in lines()) + "\x1b8")
+            sys.stdout.flush()
+            if job.done():
+                return
+
+    painter = threading.Thread(target=refresh, daemon=True)
+    if sys.stdout.isatty():
+        painter.start()
+    press_enter(msg)
+    stop.set()
+    if painter.is_alive():
+        painter.join()
+
+
+def print_preflop_probability(state: GameState, player: Player, label: str):
+    """
+    Vista privada de la ronda 1: la probabilidad del jugador contra manos
+    desconocidas, sacada de la tabla preflop (sin ver las cartas de los demás).
+    """
+    active = [p for p in state.players if not p.folded]
+    odds   = preflop_probability(player.cards, len(active))
+    probs  = {player.id: odds['win'], 'tie': odds['tie']}
+    state.prob_history.append({'label': label, 'probs': probs,
+                                'players': [(player.id, player.name)], 'board': []})
+
+    hand = hand_class_name(hand_class_index(player.cards[0].code, player.cards[1].code))
+    print(f"\n  {gold('── Probabilidades de victoria ──')}  {dim(label)}  "
+          f"{dim(f'({hand} contra {len(active) - 1} rivales · tabla preflop)')}")
+    print(f"  {player.name:<12} {prob_bar(probs[player.id])}")
+    if probs['tie'] > 0.5:
         print(f"  {'Empate':<12} {prob_bar(probs['tie'])}")
 
 
@@ -222,82 +1400,135 @@ def print_prob_analysis(history: list):
     print(f"  {gold('║')}   {bold('ANALISIS DE PROBABILIDADES POR RONDA')}     {gold('║')}")
     print(f"  {gold('╚══════════════════════════════════════════════╝')}\n")
     for entry in history:
+        ci = entry['probs'].get('ci', {})
         print(f"  {cyan(entry['label'])}")
         for pid, pname in entry['players']:
-            print(f"    {pname:<12} {prob_bar(entry['probs'][pid])}")
+            print(f"    {pname:<12} {prob_bar(entry['probs'][pid], ci=ci.get(pid))}")
         if entry['probs'].get('tie', 0) > 0.5:
-            print(f"    {'Empate':<12} {prob_bar(entry['probs']['tie'])}")
+            print(f"    {'Empate':<12} {prob_bar(entry['probs']['tie'], ci=ci.get('tie'))}")
+        print()
+
+
+def print_range_analysis(state: GameState, ranges, simulations: int = RANGE_SIMULATIONS):
+    """
+    Revisión tras la partida: en cada ronda del historial, la probabilidad de
+    cada jugador con sus cartas reales contra los rangos de los demás jugadores
+    que seguían en la mano. ranges es un rango para todos ('top 20%') o un dict
+    {player_id: rango}.
+    """
+    by_id = {p.id: p for p in state.players}
+    spec  = ranges if isinstance(ranges, dict) else {p.id: ranges for p in state.players}
+    print(f"\n  {gold('── Revisión contra rangos ──')}")
+    for entry in state.prob_history:
+        ids = [pid for pid, _ in entry['players']]
+        if len(ids) < 2:
+            continue
+        print(f"  {cyan(entry['label'])}")
+        for pid in ids:
+            rivals = {q: spec[q] for q in ids if q != pid}
+            probs  = range_equity({pid: hand_range(by_id[pid].cards), **rivals}, entry['board'],
+                                  simulations=simulations)[pid]
+            print(f"    {by_id[pid].name:<12} {prob_bar(probs['win'])}  "
+                  f"{dim('vs ' + ', '.join(str(r) if isinstance(r, str) else f'{len(r)} combos' for r in rivals.values()))}")
         print()
 
 # ══════════════════════════════════════
 #  DISPLAY
 # ══════════════════════════════════════
+# Cada vista de la mesa se arma como lista de líneas (table_lines) y TerminalRenderer la manda a la terminal en una sola escritura. En una terminal el cuadro se escribe desde la esquina superior (cursor a home) sobre lo que haya, limpiando cada línea al reescribirla y lo que quede debajo, sin borrar la pantalla: no parpadea y no depende de cuántas líneas imprimieron las apuestas desde el cuadro anterior (ni de si la pantalla se desplazó). Solo un cuadro más alto que la terminal se dibuja tras borrarla. Las cajas de las 52 cartas, el dorso y el hueco vacío se arman una vez al importar.
+class TerminalRenderer:
+    """Dibuja cuadros completos en sys.stdout con una sola escritura, desde la esquina superior y sin borrar la pantalla."""
+    def draw(self, lines: list):
+        out = sys.stdout
+        if not out.isatty():
+            out.write('\n'.join(lines) + '\n')
+            out.flush()
+            return
+        if len(lines) >= shutil.get_terminal_size().lines:
+            frame = '\x1b[H\x1b[2J' + '\n'.join(lines) + '\n'   # no cabe: la terminal se desplaza igual
+        else:
+            frame = '\x1b[H' + ''.join(f'\x1b[2K{line}\n' for line in lines) + '\x1b[J'
+        out.write(frame)
+        out.flush()
+
+RENDERER = TerminalRenderer()
+
 def clear():
     os.system('cls' if os.name == 'nt' else 'clear')
 
+def banner_lines() -> list:
+    return [
+        gold("╔══════════════════════════════════════════════════════╗"),
+        gold("║") + f"      {C.BOLD}{C.WHITE}♠  ROYAL POKER — Texas Hold'em  ♥{C.RESET}          " + gold("║"),
+        gold("║") + f"           {dim('Simulador · N Jugadores')}                    " + gold("║"),
+        gold("╚══════════════════════════════════════════════════════╝"),
+        '',
+    ]
+
 def print_banner():
-    print(gold("╔══════════════════════════════════════════════════════╗"))
-    print(gold("║") + f"      {C.BOLD}{C.WHITE}♠  ROYAL POKER — Texas Hold'em  ♥{C.RESET}          " + gold("║"))
-    print(gold("║") + f"           {dim('Simulador · N Jugadores')}                    " + gold("║"))
-    print(gold("╚══════════════════════════════════════════════════════╝"))
-    print()
+    print('\n'.join(banner_lines()))
 
-def print_card_box(card: Card) -> list:
-    vn  = card.name
-    s   = card.suit
-    clr = C.RED if card.is_red else C.WHITE
+def _card_box(code: int) -> tuple:
+    vn  = CODE_NAME[code]
+    s   = SUIT_ORDER[CODE_SUIT[code]]
+    clr = C.RED if CODE_RED[code] else C.WHITE
     pad = ' ' if len(vn) == 1 else ''
-    return [
+    return (
         f"{clr}┌─────┐{C.RESET}",
         f"{clr}│{vn}{pad}   │{C.RESET}",
         f"{clr}│  {s}  │{C.RESET}",
         f"{clr}│   {pad}{vn}│{C.RESET}",
         f"{clr}└─────┘{C.RESET}",
-    ]
+    )
 
-def print_hidden_card() -> list:
-    return [
-        f"{C.BLUE}┌─────┐{C.RESET}",
-        f"{C.BLUE}│▓▓▓▓▓│{C.RESET}",
-        f"{C.BLUE}│▓ ♦ ▓│{C.RESET}",
-        f"{C.BLUE}│▓▓▓▓▓│{C.RESET}",
-        f"{C.BLUE}└─────┘{C.RESET}",
-    ]
+_CARD_BOXES = tuple(_card_box(code) for code in range(52))
+_HIDDEN_BOX = (
+    f"{C.BLUE}┌─────┐{C.RESET}",
+    f"{C.BLUE}│▓▓▓▓▓│{C.RESET}",
+    f"{C.BLUE}│▓ ♦ ▓│{C.RESET}",
+    f"{C.BLUE}│▓▓▓▓▓│{C.RESET}",
+    f"{C.BLUE}└─────┘{C.RESET}",
+)
+_EMPTY_BOX = (
+    f"{C.DIM}┌─────┐{C.RESET}", f"{C.DIM}│     │{C.RESET}",
+    f"{C.DIM}│  ?  │{C.RESET}", f"{C.DIM}│     │{C.RESET}",
+    f"{C.DIM}└─────┘{C.RESET}",
+)
+
+def print_card_box(card: Card) -> tuple: # Las 5 líneas de la caja de una carta (ya armadas, ver _CARD_BOXES).
+    return _CARD_BOXES[card.code]
+
+def print_hidden_card() -> tuple:
+    return _HIDDEN_BOX
+
+def card_row_lines(cards: list, hidden=False) -> list:
+    if not cards:
+        return [dim("  (sin cartas)")]
+    rows = [_HIDDEN_BOX if hidden else _CARD_BOXES[c.code] for c in cards]
+    return ["  " + "  ".join(r[line] for r in rows) for line in range(5)]
 
 def print_cards_row(cards: list, hidden=False):
-    if not cards:
-        print(dim("  (sin cartas)"))
-        return
-    rows = [print_hidden_card() if hidden else print_card_box(c) for c in cards]
-    for line in range(5):
-        print("  " + "  ".join(r[line] for r in rows))
+    print('\n'.join(card_row_lines(cards, hidden)))
+
+def community_lines(community: list, total=5) -> list:
+    rows = [_CARD_BOXES[c.code] for c in community] + [_EMPTY_BOX] * (total - len(community))
+    return [gold("  ─── CARTAS COMUNITARIAS ───")] + ["  " + "  ".join(r[line] for r in rows) for line in range(5)]
 
 def print_community(community: list, total=5):
-    print(gold("  ─── CARTAS COMUNITARIAS ───"))
-    cards_to_show = community + [None] * (total - len(community))
-    rows = []
-    for c in cards_to_show:
-        if c is None:
-            rows.append([f"{C.DIM}┌─────┐{C.RESET}", f"{C.DIM}│     │{C.RESET}",
-                         f"{C.DIM}│  ?  │{C.RESET}", f"{C.DIM}│     │{C.RESET}",
-                         f"{C.DIM}└─────┘{C.RESET}"])
-        else:
-            rows.append(print_card_box(c))
-    for line in range(5):
-        print("  " + "  ".join(r[line] for r in rows))
+    print('\n'.join(community_lines(community, total)))
 
-def print_table(state: GameState, visible_id: int = -1):
-    """Muestra la mesa. visible_id = id del jugador cuyas cartas se muestran (-1 = todos ocultos)."""
-    clear()
-    print_banner()
-    print(gold(f"  {'─'*52}"))
+def table_lines(state: GameState, visible_id: int = -1) -> list:
+    """Líneas de la mesa completa (ver print_table)."""
     active_str = " · ".join(
         (green if not p.folded else dim)(p.name) for p in state.players
     )
-    print(f"  {bold('RONDA')} {state.round}/4   {gold('•')}   {bold('POZO:')} {gold(f'🪙 {state.pot}')}")
-    print(f"  {dim('Jugadores:')} {active_str}")
-    print(gold(f"  {'─'*52}"))
-    print()
+    lines = banner_lines() + [
+        gold(f"  {'─'*52}"),
+        f"  {bold('RONDA')} {state.round}/4   {gold('•')}   {bold('POZO:')} {gold(f'🪙 {state.pot}')}",
+        f"  {dim('Jugadores:')} {active_str}",
+        gold(f"  {'─'*52}"),
+        '',
+    ]
 
     # Jugadores (todos, marcando fold)
     for p in state.players:
@@ -305,13 +1536,17 @@ def print_table(state: GameState, visible_id: int = -1):
         hand_str = f"  {gold('Mano: ' + p.best_hand)}" if p.best_hand else ""
         show = (visible_id == p.id)
         label = cyan(f"{'▶ ' if show else '  '}{p.name}") + f"  {dim(f'Fichas: {p.chips}')}{status}"
-        print(f"  {label}{hand_str}")
-        print_cards_row(p.cards, hidden=not show)
-        print()
+        lines.append(f"  {label}{hand_str}")
+        lines += card_row_lines(p.cards, hidden=not show)
+        lines.append('')
 
-    print_community(state.community)
-    print()
-    print(gold(f"  {'─'*52}"))
+    lines += community_lines(state.community)
+    lines += ['', gold(f"  {'─'*52}")]
+    return lines
+
+def print_table(state: GameState, visible_id: int = -1):
+    """Muestra la mesa. visible_id = id del jugador cuyas cartas se muestran (-1 = todos ocultos)."""
+    RENDERER.draw(table_lines(state, visible_id))
 
 def press_enter(msg="  Presiona Enter para continuar..."):
     input(f"\n{dim(msg)}")
@@ -357,15 +1592,12 @@ def betting_turn(state: GameState, player: Player, current_bet: int) -> int:
             continue
 
         if choice == '3':
-            player.folded = True
-            return -1
+            return apply_action(state, player, 'fold', to_call)
 
         if choice == '1':
-            amount = min(to_call, player.chips)
-            player.chips     -= amount
-            player.round_bet += amount
-            player.total_bet += amount
-            state.pot        += amount
+            before = player.round_bet
+            apply_action(state, player, 'call', to_call)
+            amount = player.round_bet - before
             action = f"iguala {amount}" if amount > 0 else "pasa (check)"
             print(f"  {green(player.name + f' {action}. Pozo: {state.pot}')}")
             return player.round_bet
@@ -386,49 +1618,67 @@ def betting_turn(state: GameState, player: Player, current_bet: int) -> int:
             except ValueError:
                 print(f"  {dim('Ingresa un numero.')}")
 
-        player.chips     -= amt
-        player.round_bet += amt
-        player.total_bet += amt
-        state.pot        += amt
+        apply_action(state, player, 'raise', to_call, amt)
         print(f"  {yellow(player.name + f' apuesta/sube a {player.round_bet}. Pozo: {state.pot}')}")
         return player.round_bet
 
 
-def full_betting_round(state: GameState, label: str) -> bool:
+def apply_action(state: GameState, player: Player, action: str, to_call: int, amount: int = 0) -> int:
     """
-    Ronda de apuestas para todos los jugadores activos.
+    Aplica una decisión ya tomada ('fold', 'call' o 'raise') a las fichas del
+    jugador y al pozo. Para 'raise', amount son las fichas que mete ahora (se
+    ajusta al mínimo to_call + 1 y al máximo de sus fichas).
+    Retorna la nueva apuesta del jugador en la ronda, o -1 si hace fold.
+    Lo comparten el juego en terminal y el motor sin interfaz.
+    """
+    if action == 'fold':
+        player.folded = True
+        state.actions.append((player.id, state.round, action, 0))
+        return -1
+    if action == 'call':
+        amount = min(to_call, player.chips)
+    else:
+        amount = min(max(amount, to_call + 1), player.chips)
+    state.actions.append((player.id, state.round, action, amount))
+    player.chips     -= amount
+    player.round_bet += amount
+    player.total_bet += amount
+    state.pot        += amount
+    return player.round_bet
+
+
+def betting_loop(state: GameState, turn, start: int = 0, current_bet: int = 0) -> bool:
+    """
+    Orden de turnos de una ronda de apuestas, sin nada de pantalla.
+    turn(state, player, current_bet) decide y aplica el turno y retorna la
+    nueva apuesta del jugador o -1 si hizo fold.
     Permite re-apuestas si alguien sube (hasta que todos igualen).
+    start es la posición en state.players de quien abre la ronda. Con
+    current_bet > 0 la ronda empieza con las ciegas ya puestas (post_blinds)
+    y se respetan los round_bet de cada jugador.
     Retorna False si solo queda 1 jugador activo.
     """
     active = [p for p in state.players if not p.folded]
     if len(active) < 2:
         return False
 
-    for p in active:
-        p.round_bet = 0
-
-    print(f"\n  {gold(f'── Apuestas: {label} ──')}")
+    if not current_bet:
+        for p in active:
+            p.round_bet = 0
 
-    # Recorremos en orden; si alguien sube, se hace otra vuelta
-    current_bet = 0
+    # Recorremos en orden desde start; si alguien sube, se hace otra vuelta
     acted = set()
-    queue = list(active)
+    queue = deque(p for p in state.players[start:] + state.players[:start] if not p.folded)
 
     while queue:
-        player = queue.pop(0)
+        player = queue.popleft()
         if player.folded:
             continue
 
-        print_table(state, visible_id=player.id)
-        print(f"\n  {gold(f'── Apuestas: {label} ──')}")
-
-        new_bet = betting_turn(state, player, current_bet)
+        new_bet = turn(state, player, current_bet)
 
         if new_bet == -1:
-            print(f"\n  {red(player.name + ' se retira (fold).')}")
-            press_enter()
-            active = [p for p in state.players if not p.folded]
-            if len(active) < 2:
+            if sum(not p.folded for p in state.players) < 2:
                 return False
             continue
 
@@ -441,63 +1691,118 @@ def full_betting_round(state: GameState, label: str) -> bool:
                 if not p.folded and p.id != player.id and p.id in acted:
                     queue.append(p)
 
-        press_enter("  Pasando al siguiente jugador... (Enter)")
-
     return True
 
+
+def full_betting_round(state: GameState, label: str) -> bool:
+    """
+    Ronda de apuestas en la terminal para todos los jugadores activos.
+    Retorna False si solo queda 1 jugador activo.
+    """
+    if sum(not p.folded for p in state.players) < 2:
+        return False
+
+    print(f"\n  {gold(f'── Apuestas: {label} ──')}")
+
+    def interactive_turn(state: GameState, player: Player, current_bet: int) -> int:
+        if player.policy is not None:
+            return bot_turn(state, player, current_bet, label)
+        print_table(state, visible_id=player.id)
+        print(f"\n  {gold(f'── Apuestas: {label} ──')}")
+
+        new_bet = betting_turn(state, player, current_bet)
+
+        if new_bet == -1:
+            print(f"\n  {red(player.name + ' se retira (fold).')}")
+            press_enter()
+        else:
+            press_enter("  Pasando al siguiente jugador... (Enter)")
+        return new_bet
+
+    return betting_loop(state, interactive_turn)
+
+def bot_turn(state: GameState, player: Player, current_bet: int, label: str) -> int:
+    """Turno de un bot en la terminal: decide con su policy y anuncia la jugada."""
+    print_table(state, visible_id=-1)
+    print(f"\n  {gold(f'── Apuestas: {label} ──')}")
+    before  = player.round_bet
+    new_bet = policy_turn(state, player, current_bet)
+    if new_bet == -1:
+        print(f"\n  {red(player.name + ' se retira (fold).')}")
+    elif new_bet > current_bet:
+        print(f"\n  {bold(player.name)} sube a {gold(str(new_bet))}.")
+    elif new_bet > before:
+        print(f"\n  {bold(player.name)} iguala {gold(str(new_bet - before))}.")
+    else:
+        print(f"\n  {bold(player.name)} pasa (check).")
+    press_enter("  Pasando al siguiente jugador... (Enter)")
+    return new_bet
+
 # ══════════════════════════════════════
 #  LÓGICA DE RONDAS
 # ══════════════════════════════════════
 def round_1(state: GameState) -> bool:
     state.round = 1
 
-    # Cada jugador ve sus cartas en privado (cubiertas para los demás)
+    # Sin tabla preflop las probabilidades se calculan en segundo plano desde el reparto
+    job = None if preflop_table_available() else start_equity_job(state)
+
+    # Cada jugador ve sus cartas en privado (cubiertas para los demás); los bots no las muestran
     for player in state.players:
+        if player.policy is not None:
+            continue
         print_table(state, visible_id=-1)
         print(f"\n  {gold('── RONDA 1: Reparto inicial ──')}")
         print(f"  {dim('Cartas cubiertas — cada jugador las ve en privado.')}")
         ask_peek(player)
         print_table(state, visible_id=player.id)
         print(f"\n  {gold('── RONDA 1: Reparto inicial ──')}")
-        print_probabilities(state, f'Ronda 1 — vista de {player.name}')
-        press_enter("  Cubre la pantalla y pasa el turno... (Enter)")
+        if job is None:
+            print_preflop_probability(state, player, f'Ronda 1 — vista de {player.name}')
+            press_enter("  Cubre la pantalla y pasa el turno... (Enter)")
+        else:
+            print_live_probabilities(job, f'Ronda 1 — vista de {player.name}',
+                                     "  Cubre la pantalla y pasa el turno... (Enter)")
 
-    return full_betting_round(state, 'Ronda 1')
+    alive = full_betting_round(state, 'Ronda 1')
+    record_equity_job(state, job, 'Ronda 1 — Preflop')
+    return alive
 
 
 def round_2(state: GameState) -> bool:
     state.round = 2
     for _ in range(3):
-        state.community.append(deal_card(state.deck))
+        deal_community(state)
 
+    job = start_equity_job(state)   # corre mientras se muestra la mesa y se apuesta
     print_table(state, visible_id=-1)
     print(f"\n  {gold('── RONDA 2: El Flop (3 cartas) ──')}")
-    print_probabilities(state, 'Ronda 2 — Flop')
-    press_enter()
-    return full_betting_round(state, 'Flop')
+    print_live_probabilities(job, 'Ronda 2 — Flop')
+    alive = full_betting_round(state, 'Flop')
+    record_equity_job(state, job, 'Ronda 2 — Flop')
+    return alive
 
 
 def round_3(state: GameState) -> bool:
     state.round = 3
-    state.community.append(deal_card(state.deck))
+    deal_community(state)
 
+    job = start_equity_job(state)   # corre mientras se muestra la mesa y se apuesta
     print_table(state, visible_id=-1)
     print(f"\n  {gold('── RONDA 3: El Turn (4ª carta) ──')}")
-    print_probabilities(state, 'Ronda 3 — Turn')
-    press_enter()
-    return full_betting_round(state, 'Turn')
+    print_live_probabilities(job, 'Ronda 3 — Turn')
+    alive = full_betting_round(state, 'Turn')
+    record_equity_job(state, job, 'Ronda 3 — Turn')
+    return alive
 
 
 def round_4(state: GameState) -> tuple:
     state.round = 4
-    state.community.append(deal_card(state.deck))
+    deal_community(state)
 
     active = [p for p in state.players if not p.folded]
-
-    # Evaluar manos de todos los activos
-    for p in active:
-        _, n, _ = get_best_hand(p.cards, state.community)
-        p.best_hand = n
+    winners, contenders = showdown(state)   # también deja p.best_hand de cada activo
+    state.winners = winners
 
     print_table(state, visible_id=999)   # 999 = mostrar todos
     print(f"\n  {gold('── RONDA 4: El River — SHOWDOWN ──')}")
@@ -509,27 +1814,444 @@ def round_4(state: GameState) -> tuple:
     press_enter()
 
     # Determinar ganador
-    results = [(get_best_hand(p.cards, state.community), p) for p in active]
-    best_rank = min(r[0][0] for r in results)
-    candidates = [p for (r, p) in results if r[0] == best_rank]
-
-    if len(candidates) == 1:
-        w = candidates[0]
-        loser_hand = next(n for (_, n, _), p in results if p.id != w.id) if len(active) == 2 else ''
+    if len(contenders) == 1:
+        w = winners[0]
+        loser_hand = next(p.best_hand for p in active if p.id != w.id) if len(active) == 2 else ''
         reason = f"{w.name} gana con {w.best_hand}" + (f" contra {loser_hand}." if loser_hand else ".")
         return w, reason, w.best_hand
 
-    # Desempate por carta más alta personal
-    best_hv = max(max(14 if c.value==1 else c.value for c in p.cards) for p in candidates)
-    top = [p for p in candidates
-           if max(14 if c.value==1 else c.value for c in p.cards) == best_hv]
+    if len(winners) == 1:
+        w = winners[0]
+        return w, f"Empate en {w.best_hand}. {w.name} gana por mejores cartas (kicker).", w.best_hand
+
+    names = " y ".join(p.name for p in winners)
+    return None, f"Empate total entre {names}.", winners[0].best_hand
+
+
+# ══════════════════════════════════════
+#  SHOWDOWN Y POZO
+# ══════════════════════════════════════
+# Compartidos por el juego en terminal y el motor sin interfaz.
+def showdown(state: GameState) -> tuple:
+    """
+    Evalúa a los jugadores activos con el tablero completo y guarda el nombre
+    de su mano en p.best_hand.
+    Retorna (ganadores, contendientes): los contendientes empatan en la mejor
+    categoría; los ganadores tienen la mayor fuerza, kickers incluidos (más de
+    uno = empate total y se reparte el pozo).
+    """
+    active  = [p for p in state.players if not p.folded]
+    results = []
+    for p in active:
+        strength = current_hand(p, state.community).strength()
+        p.best_hand = describe_strength(strength)[1]
+        results.append((strength, p))
+    best     = max(s for s, _ in results)
+    top      = [p for s, p in results if s == best]
+    contenders = [p for s, p in results if strength_rank(s) == strength_rank(best)]
+    return top, contenders
+
 
-    if len(top) == 1:
-        w = top[0]
-        return w, f"Empate en {w.best_hand}. {w.name} gana por carta mas alta.", w.best_hand
+def side_pots(players: list) -> list:
+    """
+    Pozo principal y pozos laterales según lo que puso cada jugador (total_bet):
+    [(fichas, jugadores con derecho)], del principal al último lateral. Cada
+    nivel de apuesta forma un pozo al que solo aspiran los que no se retiraron y
+    pusieron al menos ese nivel; lo que nadie igualó queda en un pozo de un solo
+    jugador (se le devuelve). Las fichas de un nivel sin nadie con derecho (lo
+    pusieron solo jugadores retirados) se suman al pozo anterior.
+    """
+    pots, prev = [], 0
+    for level in sorted({p.total_bet for p in players if p.total_bet > 0}):
+        amount   = sum(min(p.total_bet, level) - min(p.total_bet, prev) for p in players)
+        eligible = [p for p in players if not p.folded and p.total_bet >= level]
+        if eligible:
+            pots.append((amount, eligible))
+        elif pots:
+            pots[-1] = (pots[-1][0] + amount, pots[-1][1])
+        else:
+            pots.append((amount, [p for p in players if not p.folded]))
+        prev = level
+    return pots
+
+def award_pot(state: GameState) -> list:
+    """
+    Reparte el pozo por pozos (ver side_pots): cada uno va al mejor de sus
+    jugadores con derecho; en un empate se divide y las fichas sobrantes van
+    al primero. Deja en state.winners a quien ganó algún pozo; si nadie puso
+    fichas, el pozo es uno solo de 0 fichas y se elige igual al ganador.
+    Retorna [(fichas, ganadores)] por pozo.
+    """
+    active   = [p for p in state.players if not p.folded]
+    strength = {p.id: current_hand(p, state.community).strength() for p in active} \
+        if len(active) > 1 and len(state.community) == 5 else {p.id: 0 for p in active}
+    awarded  = []
+    for amount, eligible in side_pots(state.players) or ([(0, active)] if active else []):
+        best    = max(strength[p.id] for p in eligible)
+        winners = [p for p in eligible if strength[p.id] == best]
+        share, rest = divmod(amount, len(winners))
+        for p in winners:
+            p.chips += share
+        winners[0].chips += rest
+        awarded.append((amount, winners))
+    won = {p.id for _, winners in awarded for p in winners}
+    state.winners = [p for p in state.players if p.id in won]
+    return awarded
+
+# ══════════════════════════════════════
+#  MOTOR SIN INTERFAZ
+# ══════════════════════════════════════
+# Juega manos completas sin input(), print ni clear(), para simular miles de manos (pruebas de carga, estudiar estrategias). Cada jugador decide con su policy: callable(state, player, to_call) que retorna 'fold', 'call' o ('raise', fichas). Las reglas de turno (betting_loop), las fichas (apply_action), el showdown y el pozo son los mismos del juego en terminal.
+def passive_policy(state: GameState, player: Player, to_call: int):
+    return 'call'
+
+def make_random_policy(rng=random, fold: float = 0.1, raise_: float = 0.1, max_raise: int = 50):
+    """Política al azar: fold con probabilidad fold, sube con raise_, y si no, iguala."""
+    def policy(state: GameState, player: Player, to_call: int):
+        r = rng.random()
+        if r < fold and to_call > 0:
+            return 'fold'
+        if r < fold + raise_:
+            return ('raise', to_call + rng.randint(1, max_raise))
+        return 'call'
+    return policy
+
+# Bots por equity: estiman su probabilidad contra manos al azar (no ven las cartas de nadie más ni la baraja) dentro de un presupuesto de tiempo por decisión, y la comparan con las pot odds. Preflop leen la tabla preflop si está disponible.
+BOT_TIME_BUDGET = 0.005   # segundos por decisión
+_BOT_BATCH      = 8       # simulaciones entre consultas al reloj
+
+def equity_vs_random(hole: list, board: list, opponents: int,
+                     time_budget: float = BOT_TIME_BUDGET, rng=None, samples: int = None) -> tuple:
+    """
+    Equity (victorias + empates repartidos, de 0 a 1) de una mano contra
+    'opponents' manos al azar, muestreando hasta agotar time_budget (o, con
+    samples, un número fijo de simulaciones: mismo rng = misma equity).
+    hole y board son códigos. Retorna (equity, simulaciones).
+    """
+    rng      = rng or random
+    dead     = set(hole) | set(board)
+    deck     = [c for c in range(52) if c not in dead]
+    needed   = 5 - len(board)
+    k        = needed + 2 * opponents
+    hp, hs, hm = partial_hand(hole)
+    bp, bs, bm = partial_hand(board)
+    score    = 0.0
+    n        = 0
+    deadline = time.perf_counter() + time_budget
+    while True:
+        for _ in range(_BOT_BATCH):
+            cards = rng.sample(deck, k)
+            p, s, m = bp, bs, bm
+            for c in cards[:needed]:
+                p *= _CODE_PRIME[c]
+                s += _CODE_SUIT_COUNT[c]
+                m |= 1 << c
+            hero = strength_partial(p * hp, s + hs, m | hm)
+            best, tied = 0, 0
+            for i in range(needed, k, 2):
+                a, b = cards[i], cards[i + 1]
+                rival = strength_partial(p * _CODE_PRIME[a] * _CODE_PRIME[b],
+                                         s + _CODE_SUIT_COUNT[a] + _CODE_SUIT_COUNT[b],
+                                         m | 1 << a | 1 << b)
+                if rival > best:
+                    best, tied = rival, 1
+                elif rival == best:
+                    tied += 1
+            if hero > best:
+                score += 1
+            elif hero == best:
+                score += 1 / (tied + 1)
+        n += _BOT_BATCH
+        if (n >= samples) if samples else time.perf_counter() >= deadline:
+            return score / n, n
+
+def bot_equity(state: GameState, player: Player, time_budget: float = BOT_TIME_BUDGET, rng=None,
+               samples: int = None) -> float:
+    """Equity del jugador contra los rivales que siguen en la mano, con lo que él puede ver."""
+    opponents = sum(not p.folded for p in state.players) - 1
+    if not state.community and preflop_table_available() and opponents + 1 in PREFLOP_PLAYERS:
+        odds = preflop_probability(player.cards, opponents + 1)
+        return (odds['win'] + odds['tie'] / 2) / 100
+    return equity_vs_random([c.code for c in player.cards], [c.code for c in state.community],
+                            opponents, time_budget, rng, samples)[0]
+
+def make_equity_policy(rng=None, time_budget: float = BOT_TIME_BUDGET, raise_ratio: float = 1.5,
+                       bet_fraction: float = 0.6, bluff: float = 0.05, samples: int = None):
+    """
+    Política por equity. Con equity e contra k rivales:
+      - si hay que pagar y e no alcanza las pot odds (to_call / (pozo + to_call)),
+        se retira (salvo un farol con probabilidad bluff);
+      - si e supera raise_ratio veces su parte justa 1 / (k + 1), sube
+        bet_fraction del pozo ponderado por e;
+      - si no, iguala o pasa.
+    Con samples cada estimación usa un número fijo de simulaciones en vez del
+    presupuesto de tiempo, para que una simulación con semilla sea reproducible.
+    """
+    rng = rng or random
+    def policy(state: GameState, player: Player, to_call: int):
+        e        = bot_equity(state, player, time_budget, rng, samples)
+        k        = sum(not p.folded for p in state.players) - 1
+        pot_odds = to_call / (state.pot + to_call) if to_call else 0.0
+        if to_call and e < pot_odds:
+            return ('raise', to_call + max(1, state.pot // 2)) if rng.random() < bluff else 'fold'
+        if e * (k + 1) >= raise_ratio:
+            return ('raise', to_call + max(1, int(state.pot * bet_fraction * e)))
+        return 'call'
+    return policy
+
+def policy_turn(state: GameState, player: Player, current_bet: int) -> int:
+    to_call = max(0, current_bet - player.round_bet)
+    if player.chips == 0:
+        return player.round_bet   # sin fichas: all-in automático, como en la terminal
+    decision = player.policy(state, player, to_call)
+    action, amount = (decision, 0) if isinstance(decision, str) else decision
+    return apply_action(state, player, action, to_call, amount)
+
+def post_blinds(state: GameState, dealer: int, small: int, big: int) -> tuple:
+    """
+    Pone las ciegas a la izquierda del botón (mano a mano, el botón pone la
+    chica). dealer es la posición del botón en state.players.
+    Retorna (apuesta a igualar, posición de quien abre el preflop).
+    """
+    n  = len(state.players)
+    sb = dealer if n == 2 else (dealer + 1) % n
+    bb = (sb + 1) % n
+    for p in state.players:
+        p.round_bet = 0
+    for pos, blind in ((sb, small), (bb, big)):
+        apply_action(state, state.players[pos], 'call', blind)
+    return max(p.round_bet for p in state.players), (bb + 1) % n
+
+def play_hand_headless(players: list, rng=None, dealer: int = None, blinds: tuple = (0, 0),
+                       seed: int = None) -> GameState:
+    """
+    Juega una mano completa con las policy de los jugadores (mismas rondas que
+    play_game: apuestas preflop, flop y turn; showdown en el river) y reparte el
+    pozo. Modifica las fichas de los jugadores y retorna el GameState final
+    (community, pot, winners, best_hand de cada jugador).
+    Con dealer (posición del botón en players) se ponen las ciegas
+    blinds = (chica, grande) y cada ronda abre a la izquierda del botón; sin
+    dealer todas las rondas abren en players[0], sin ciegas.
+    Las cartas salen de un Deck con seed (si no se da, se saca de rng) y
+    quedan en state.seed: la misma semilla reparte exactamente las mismas cartas.
+    """
+    rng   = rng or random
+    state = GameState()
+    state.players = players
+    state.deck    = Deck(rng.getrandbits(64) if seed is None else seed)
+    state.seed    = state.deck.seed
+    state.start_chips = {p.id: p.chips for p in players}
+    for p in players:
+        p.folded, p.best_hand, p.round_bet, p.total_bet = False, '', 0, 0
+        deal_hole_cards(state, p)
+
+    current_bet, first = 0, 0
+    if dealer is not None:
+        current_bet, first = post_blinds(state, dealer, *blinds)
+    for state.round, new_cards in ((1, 0), (2, 3), (3, 1)):
+        for _ in range(new_cards):
+            deal_community(state)
+        if not betting_loop(state, policy_turn, first, current_bet):
+            break
+        if dealer is not None:
+            current_bet, first = 0, (dealer + 1) % len(players)
+
+    if sum(not p.folded for p in players) > 1:
+        state.round = 4
+        deal_community(state)
+        showdown(state)
+    award_pot(state)
+    return state
 
-    names = " y ".join(p.name for p in top)
-    return None, f"Empate total entre {names}.", top[0].best_hand
+# ══════════════════════════════════════
+#  HISTORIAL DE MANOS (binario)
+# ══════════════════════════════════════
+# Cada mano terminada se agrega a un archivo binario de registros de tamaño fijo (_LOG_RECORD): semilla, hora, pozo, asientos con el id del jugador (32 bits: torneo.py numera a todo el campo) y sus cartas, fichas finales y netas, tablero, probabilidad de victoria por calle y las acciones (hasta LOG_ACTIONS; action_count guarda el total). El registro i está en un desplazamiento fijo, así que HandLogReader lo lee de un mmap sin cargar el archivo. Un índice pequeño (path + '.idx') guarda (registro, hora) cada LOG_INDEX_STRIDE manos para empezar a leer desde una fecha.
+HAND_LOG_PATH    = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'historial.bin')
+LOG_SEATS        = 6
+LOG_ACTIONS      = 32
+LOG_INDEX_STRIDE = 1024
+STREETS          = ('preflop', 'flop', 'turn', 'river')
+_STREET_OF_BOARD = {0: 0, 3: 1, 4: 2, 5: 3}    # cartas en la mesa -> calle
+_LOG_MAGIC       = b'HLOG'
+_LOG_VERSION     = 2                            # 2: ids de jugador de 32 bits
+_LOG_HEADER      = struct.Struct('<4sHH')       # magia, versión, tamaño de registro
+_LOG_INDEX       = struct.Struct('<QI')         # número de registro, hora
+_LOG_RECORD      = struct.Struct(f'<QIIBBH{2 * LOG_SEATS}s{LOG_SEATS}I{LOG_SEATS}I{LOG_SEATS}i5s'
+                                 f'{len(STREETS) * LOG_SEATS}H{LOG_ACTIONS}s{LOG_ACTIONS}s{LOG_ACTIONS}I3x')
+_ACTION_CODES    = {'fold': 0, 'call': 1, 'raise': 2}
+_ACTION_NAMES    = ('fold', 'call', 'raise')
+_NO_CARD         = 255
+_NO_EQUITY       = 0xFFFF
+
+def _encode_hand(state: GameState) -> bytes:
+    players = state.players
+    if len(players) > LOG_SEATS:
+        raise ValueError(f'el historial guarda hasta {LOG_SEATS} asientos')
+    seat    = {p.id: i for i, p in enumerate(players)}
+    pad     = LOG_SEATS - len(players)
+    holes   = bytes(c for p in players for c in ([c.code for c in p.cards] + [_NO_CARD] * 2)[:2])
+    board   = bytes([c.code for c in state.community] + [_NO_CARD] * (5 - len(state.community)))
+    equity  = [_NO_EQUITY] * (len(STREETS) * LOG_SEATS)
+    for entry in state.prob_history:
+        street = _STREET_OF_BOARD.get(len(entry.get('board', ())))
+        for pid, _ in entry['players']:
+            if street is not None and pid in seat:
+                equity[street * LOG_SEATS + seat[pid]] = round(entry['probs'][pid] * 100)
+    actions = state.actions[:LOG_ACTIONS]
+    fill    = LOG_ACTIONS - len(actions)
+    return _LOG_RECORD.pack(
+        state.seed or 0, int(time.time()), state.pot, len(players),
+        sum(1 << seat[p.id] for p in state.winners), len(state.actions),
+        holes + bytes([_NO_CARD] * 2 * pad),
+        *[p.id for p in players], *[0] * pad,
+        *[p.chips for p in players], *[0] * pad,
+        *[p.chips - state.start_chips.get(p.id, p.chips) for p in players], *[0] * pad,
+        board, *equity,
+        bytes(seat[pid] for pid, _, _, _ in actions) + bytes(fill),
+        bytes(rnd << 2 | _ACTION_CODES[a] for _, rnd, a, _ in actions) + bytes(fill),
+        *[amount for _, _, _, amount in actions], *[0] * fill)
+
+def _decode_hand(fields: tuple) -> dict:
+    (seed, stamp, pot, n, winners, n_actions, holes, *rest) = fields
+    ids, rest = rest[:LOG_SEATS], rest[LOG_SEATS:]
+    chips  = rest[:LOG_SEATS]
+    net    = rest[LOG_SEATS:2 * LOG_SEATS]
+    board  = rest[2 * LOG_SEATS]
+    equity = rest[2 * LOG_SEATS + 1:2 * LOG_SEATS + 1 + len(STREETS) * LOG_SEATS]
+    a_seat, a_kind, *a_amount = rest[2 * LOG_SEATS + 1 + len(STREETS) * LOG_SEATS:]
+    stored = min(n_actions, LOG_ACTIONS)
+    return {
+        'seed':    seed,
+        'time':    stamp,
+        'pot':     pot,
+        'players': [{'id':     ids[i],
+                     'cards':  [c for c in holes[2 * i:2 * i + 2] if c != _NO_CARD],
+                     'chips':  chips[i],
+                     'net':    net[i],
+                     'won':    bool(winners >> i & 1),
+                     'equity': [None if e == _NO_EQUITY else e / 100
+                                for e in equity[i::LOG_SEATS]]}
+                    for i in range(n)],
+        'board':   [c for c in board if c != _NO_CARD],
+        'actions': [(ids[a_seat[k]], a_kind[k] >> 2, _ACTION_NAMES[a_kind[k] & 3], a_amount[k])
+                    for k in range(stored)],
+        'action_count': n_actions,
+    }
+
+class HandLog:
+    """
+    Escritor del historial (solo agrega). Se usa como contexto o con close();
+    append(state) guarda la mano terminada y retorna su número de registro.
+    """
+    def __init__(self, path: str = None):
+        self.path  = path = path or HAND_LOG_PATH
+        header = _LOG_HEADER.pack(_LOG_MAGIC, _LOG_VERSION, _LOG_RECORD.size)
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, 'rb') as f:
+                if f.read(_LOG_HEADER.size) != header:
+                    raise ValueError(f'{path} es de otra versión del historial; muévelo para empezar uno nuevo')
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(header)
+        self.count = (self._file.tell() - _LOG_HEADER.size) // _LOG_RECORD.size
+        self._index = open(path + '.idx', 'ab')
+
+    def append(self, state: GameState) -> int:
+        record = _encode_hand(state)
+        number = self.count
+        if number % LOG_INDEX_STRIDE == 0:
+            self._index.write(_LOG_INDEX.pack(number, _LOG_RECORD.unpack_from(record)[1]))
+        self._file.write(record)
+        self.count += 1
+        return number
+
+    def close(self):
+        self._file.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class HandLogReader:
+    """
+    Lector del historial sobre un mmap: len(), reader[i] y la iteración
+    decodifican un registro a la vez (dict, ver _decode_hand), así que recorrer
+    millones de manos usa memoria constante. numpy_view() expone todos los
+    registros como arreglo estructurado de NumPy sin copiarlos.
+    """
+    def __init__(self, path: str = None):
+        self.path = path = path or HAND_LOG_PATH
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size = _LOG_HEADER.unpack_from(self._mm)
+        if magic != _LOG_MAGIC or version != _LOG_VERSION or size != _LOG_RECORD.size:
+            raise ValueError(f'{path} no es un historial de manos válido')
+        # un registro a medio escribir al final (corte del programa) se ignora
+        self._count = (len(self._mm) - _LOG_HEADER.size) // _LOG_RECORD.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> dict:
+        if not -self._count <= i < self._count:
+            raise IndexError(i)
+        return _decode_hand(_LOG_RECORD.unpack_from(self._mm, _LOG_HEADER.size + (i % self._count) * _LOG_RECORD.size))
+
+    def __iter__(self):
+        return self.records()
+
+    def records(self, start: int = 0):
+        """Genera los registros desde start, decodificados uno por uno."""
+        end  = _LOG_HEADER.size + self._count * _LOG_RECORD.size
+        body = memoryview(self._mm)[_LOG_HEADER.size + start * _LOG_RECORD.size:end]
+        try:
+            for fields in _LOG_RECORD.iter_unpack(body):
+                yield _decode_hand(fields)
+        finally:
+            body.release()
+
+    def since(self, timestamp: int):
+        """Registros con hora >= timestamp; el índice da un punto de partida cercano."""
+        index = []
+        if os.path.exists(self.path + '.idx'):
+            with open(self.path + '.idx', 'rb') as f:
+                index = list(_LOG_INDEX.iter_unpack(f.read()))
+        k     = bisect_right([stamp for _, stamp in index], timestamp) - 1
+        start = index[k][0] if k >= 0 else 0
+        return (r for r in self.records(start) if r['time'] >= timestamp)
+
+    def numpy_view(self):
+        """Arreglo estructurado de NumPy sobre el mmap (sin copiar; hay que soltarlo antes de close()). Requiere NumPy."""
+        dtype = np.dtype([
+            ('seed', '<u8'), ('time', '<u4'), ('pot', '<u4'), ('players', 'u1'), ('winners', 'u1'),
+            ('action_count', '<u2'), ('holes', 'u1', (LOG_SEATS, 2)), ('ids', '<u4', LOG_SEATS),
+            ('chips', '<u4', LOG_SEATS), ('net', '<i4', LOG_SEATS), ('board', 'u1', 5),
+            ('equity', '<u2', (len(STREETS), LOG_SEATS)), ('action_seat', 'u1', LOG_ACTIONS),
+            ('action_kind', 'u1', LOG_ACTIONS), ('action_amount', '<u4', LOG_ACTIONS), ('_pad', 'V3')])
+        return np.frombuffer(self._mm, dtype=dtype, count=self._count, offset=_LOG_HEADER.size)
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def replay_deal(seed: int, num_players: int) -> tuple:
+    """Vuelve a repartir una mano desde su semilla, en el orden del juego: (cartas de cada jugador, tablero)."""
+    deck  = Deck(seed)
+    holes = [[deck.pop(), deck.pop()] for _ in range(num_players)]
+    return holes, [deck.pop() for _ in range(5)]
+
+def log_hand(state: GameState, path: str = None) -> int: # Agrega una mano al historial (HAND_LOG_PATH si no se da path) y retorna su número de registro.
+    with HandLog(path) as log:
+        return log.append(state)
 
 # ══════════════════════════════════════
 #  UTILIDADES
@@ -548,10 +2270,130 @@ def print_winner(winner, reason: str, hand: str = ''):
         print(gold("  ╚══════════════════════════════════════╝"))
     print(f"\n  {dim(reason)}\n")
 
+# ══════════════════════════════════════
+#  PERFILADO (opcional)
+# ══════════════════════════════════════
+# enable_profiling() reemplaza en el módulo las funciones de _PROFILE_TARGETS por envolturas que cuentan llamadas, suman unidades (tableros simulados, por ejemplo) y guardan un histograma de tiempos. Como el código llama a esas funciones por su nombre global, las envolturas se ven en todas partes; desactivado no hay envoltura alguna y el costo es cero. Los procesos del pool (estimate_win_probabilities_parallel, torneo.py) no se miden.
+def _street(community) -> str: # Nombre de la calle según las cartas comunitarias conocidas.
+    return STREETS[_STREET_OF_BOARD.get(len(community), 0)]
+
+def _arg(args: tuple, kwargs: dict, i: int, name: str):
+    return args[i] if len(args) > i else kwargs[name]
+
+# (función, nombre de la métrica en función de los argumentos, unidades en función de los argumentos o None)
+_PROFILE_TARGETS = (
+    ('strength_codes',   lambda a, k: 'evaluador · mano completa', None),
+    ('strength_partial', lambda a, k: 'evaluador · parcial', None),
+    ('_mc_counts',       lambda a, k: 'muestreo · python', lambda a, k: _arg(a, k, 3, 'simulations')),
+    ('_batch_counts',    lambda a, k: 'muestreo · numpy', lambda a, k: _arg(a, k, 3, 'simulations')),
+    ('enumerate_win_probabilities',
+     lambda a, k: f"equity · {_street(_arg(a, k, 1, 'known_community'))} (exacto)",
+     lambda a, k: count_runouts(_arg(a, k, 1, 'known_community'), _arg(a, k, 2, 'remaining_deck'))),
+    ('estimate_win_probabilities_adaptive',
+     lambda a, k: f"equity · {_street(_arg(a, k, 1, 'known_community'))} (adaptativo)", None),
+    ('estimate_win_probabilities',
+     lambda a, k: f"equity · {_street(_arg(a, k, 1, 'known_community'))} (Monte Carlo)",
+     lambda a, k: k.get('simulations', a[3] if len(a) > 3 else 600)),
+    ('preflop_probability', lambda a, k: 'equity · preflop (tabla)', None),
+    ('range_equity',        lambda a, k: 'equity · rangos', None),
+    ('EquityJob._run',
+     lambda a, k: f"equity · {_street(a[0].community)} (en segundo plano)", None),
+    ('clear',               lambda a, k: 'render · clear', None),
+    ('table_lines',         lambda a, k: 'render · armar mesa', None),
+    ('card_row_lines',      lambda a, k: 'render · armar cartas', None),
+    ('community_lines',     lambda a, k: 'render · armar comunitarias', None),
+    ('TerminalRenderer.draw', lambda a, k: 'render · escribir cuadro', lambda a, k: len(a[1])),
+    ('_probability_lines',  lambda a, k: 'render · probabilidades', None),
+)
+_PROFILE: dict   = {}    # métrica -> ProfileMetric
+_PROFILED: dict  = {}    # función envuelta -> original
+_PROFILE_LOCK    = threading.Lock()
+
+class ProfileMetric:
+    """Llamadas, unidades, tiempo total y máximo, e histograma en potencias de 2 de microsegundos."""
+    __slots__ = ('calls', 'units', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.calls, self.units, self.total, self.max = 0, 0, 0.0, 0.0
+        self.buckets = [0] * 40
+
+    def add(self, seconds: float, units: int = 0):
+        self.calls += 1
+        self.units += units
+        self.total += seconds
+        self.max    = max(self.max, seconds)
+        self.buckets[min(int(seconds * 1e6).bit_length(), 39)] += 1
+
+    def percentile(self, q: float) -> float: # Cota superior (segundos) del percentil q según el histograma.
+        target, seen = q * self.calls, 0
+        for k, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return min((1 << k) / 1e6, self.max)
+        return self.max
+
+def _profiled(fn, metric, units):
+    def wrapper(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            dt   = time.perf_counter() - t0
+            name = metric(args, kwargs)
+            with _PROFILE_LOCK:
+                if name not in _PROFILE:
+                    _PROFILE[name] = ProfileMetric()
+                _PROFILE[name].add(dt, units(args, kwargs) if units else 0)
+    wrapper.__wrapped__ = fn
+    wrapper.__name__    = fn.__name__
+    wrapper.__doc__     = fn.__doc__
+    return wrapper
+
+def enable_profiling():
+    """Instala las envolturas de medición (idempotente)."""
+    module = sys.modules[__name__]
+    for target, metric, units in _PROFILE_TARGETS:
+        owner, _, attr = target.rpartition('.')
+        holder = getattr(module, owner) if owner else module
+        if target not in _PROFILED:
+            _PROFILED[target] = getattr(holder, attr)
+            setattr(holder, attr, _profiled(_PROFILED[target], metric, units))
+
+def disable_profiling():
+    """Quita las envolturas; las métricas acumuladas se conservan hasta reset_profile()."""
+    module = sys.modules[__name__]
+    for target, original in _PROFILED.items():
+        owner, _, attr = target.rpartition('.')
+        setattr(getattr(module, owner) if owner else module, attr, original)
+    _PROFILED.clear()
+
+def reset_profile():
+    with _PROFILE_LOCK:
+        _PROFILE.clear()
+
+def profile_summary() -> list:
+    """Líneas de la tabla de métricas, agrupadas por subsistema."""
+    lines = [f"  {'métrica':<40} {'llamadas':>9} {'unidades':>10} {'total':>9} {'media':>9} "
+             f"{'p50':>8} {'p99':>8} {'máx':>8}"]
+    ms = lambda s: f"{s * 1e3:.3f}ms" if s < 1 else f"{s:.2f}s"
+    for name, m in sorted(_PROFILE.items()):
+        lines.append(f"  {name:<40} {m.calls:>9} {m.units or '':>10} {ms(m.total):>9} "
+                     f"{ms(m.total / m.calls):>9} {ms(m.percentile(0.5)):>8} {ms(m.percentile(0.99)):>8} "
+                     f"{ms(m.max):>8}")
+    return lines
+
+def print_profile_summary():
+    if not _PROFILE:
+        return
+    print(f"\n  {gold('── Perfil de ejecución ──')}")
+    print('\n'.join(profile_summary()))
+    print()
+
+
 # ══════════════════════════════════════
 #  MAIN GAME LOOP
 # ══════════════════════════════════════
-# Funciones para preguntar al usuario el número de jugadores y las fichas iniciales por jugador, asegurándose de que los valores ingresados sean válidos (entre 2 y 6 jugadores, y al menos 10 fichas). Estas funciones utilizan un bucle while para solicitar la entrada del usuario hasta que se ingrese un valor válido, y manejan excepciones para asegurarse de que se ingresen números enteros.
+# Funciones para preguntar al usuario el número de jugadores, las fichas iniciales por jugador y cuántos de ellos son bots, asegurándose de que los valores ingresados sean válidos (entre 2 y 6 jugadores, y al menos 10 fichas). Estas funciones utilizan un bucle while para solicitar la entrada del usuario hasta que se ingrese un valor válido, y manejan excepciones para asegurarse de que se ingresen números enteros.
 def ask_num_players() -> int:
     print(f"  {bold('Numero de jugadores')} {dim('(2-6)')}:")
     while True:
@@ -576,7 +2418,33 @@ def ask_chips() -> int:
             print(f"  {dim('Ingresa un numero.')}")
 
 
-def play_game():
+def ask_num_bots(num_players: int) -> int:
+    print(f"  {bold('Cuantos son bots?')} {dim(f'(0-{num_players - 1}, ocupan los ultimos lugares)')}:")
+    while True:
+        try:
+            n = int(input(f"  {gold('→')} ").strip())
+            if 0 <= n < num_players:
+                return n
+            print(f"  {dim(f'Ingresa un numero entre 0 y {num_players - 1}.')}")
+        except ValueError:
+            print(f"  {dim('Ingresa un numero.')}")
+
+
+def play_game(seed: int = None):
+    """
+    Partidas una tras otra mientras el usuario quiera (un ciclo, no recursión).
+    seed repite las cartas de una partida anterior (solo en la primera).
+    """
+    while play_one_game(seed):
+        seed = None
+    clear()
+    print_banner()
+    print(f"  {gold('Gracias por jugar Royal Poker!')}\n")
+    sys.exit(0)
+
+
+def play_one_game(seed: int = None) -> bool:
+    """Juega una partida completa en la terminal. Retorna True si el usuario quiere jugar otra."""
     clear()
     print_banner()
     print(f"  {bold('Bienvenido a Royal Poker — Texas Hold em')}")
@@ -584,14 +2452,20 @@ def play_game():
 
     num_players  = ask_num_players()
     chips_start  = ask_chips()
+    num_bots     = ask_num_bots(num_players)
 
     state         = GameState()
-    state.deck    = shuffle_deck(create_deck())
+    state.deck    = Deck(seed)
+    state.seed    = state.deck.seed
     state.players = [Player(i+1, f"Jugador {i+1}", chips_start)
                      for i in range(num_players)]
+    for p in state.players[num_players - num_bots:]:
+        p.name   = f"Bot {p.id}"
+        p.policy = make_equity_policy()
+    state.start_chips = {p.id: p.chips for p in state.players}
 
     for p in state.players:
-        p.cards = [deal_card(state.deck), deal_card(state.deck)]
+        deal_hole_cards(state, p)
 
     winner    = None
     reason    = ''
@@ -617,32 +2491,56 @@ def play_game():
     else:
         winner, reason, hand_name = round_4(state)
 
-    if winner:
-        winner.chips += state.pot
+    pots = award_pot(state)
 
     # Mostrar todos los jugadores con cartas visibles
     for p in state.players:
         p.best_hand = p.best_hand or ''
     print_table(state, visible_id=999)
     print_winner(winner, reason, hand_name)
+    if len(pots) > 1:
+        for i, (amount, pot_winners) in enumerate(pots):
+            label = 'Pozo principal' if i == 0 else f'Pozo lateral {i}'
+            print(f"  {label:<16} {gold(str(amount))}  → {' y '.join(p.name for p in pot_winners)}")
+        print()
     print_prob_analysis(state.prob_history)
+    if REVIEW_RANGE:
+        try:
+            print_range_analysis(state, REVIEW_RANGE, simulations=REVIEW_SIMULATIONS)
+        except ValueError as e:
+            print(f"  {dim(f'Sin revisión contra rangos: {e}')}\n")
 
     print(f"  {bold('Fichas finales:')}")
     for p in state.players:
         gained = p.chips - chips_start
         sign   = green(f"+{gained}") if gained >= 0 else red(str(gained))
         print(f"    {p.name:<14} {gold(str(p.chips))}  ({sign})")
+    number = log_hand(state)
+    print(f"  {dim(f'Mano guardada en el historial ({os.path.basename(HAND_LOG_PATH)} #{number})')}")
+    print(f"  {dim(f'Semilla de la partida: {state.seed}  (python ejercicio1.py --semilla {state.seed} la repite)')}")
     print()
 
     print(f"  {bold('Jugar otra partida?')}  {green('[1]')} Si   {red('[2]')} No")
-    if input(f"  {gold('→')} ").strip() in ('1', ''):
-        play_game()
-    else:
-        clear()
-        print_banner()
-        print(f"  {gold('Gracias por jugar Royal Poker!')}\n")
-        sys.exit(0)
+    return input(f"  {gold('→')} ").strip() in ('1', '')
 
 
 if __name__ == '__main__':
-    play_game()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description='Royal Poker — Texas Hold em en la terminal.')
+    parser.add_argument('--semilla', type=int, help='repite las cartas de una partida (se muestra al final de cada una)')
+    parser.add_argument('--perf', action='store_true',
+                        help='mide evaluador, muestreo, probabilidades y dibujo, y muestra un resumen al salir')
+    parser.add_argument('--cache', nargs='?', const=EQUITY_CACHE_PATH, metavar='ARCHIVO',
+                        help='guarda las probabilidades calculadas en SQLite y las reutiliza entre partidas')
+    parser.add_argument('--rango', default=REVIEW_RANGE, metavar='RANGO',
+                        help="rango de los rivales en la revisión final, p. ej. 'top 20%%' o 'QQ+, AKs' "
+                             "(por omisión %(default)r; '' la omite)")
+    args = parser.parse_args()
+    REVIEW_RANGE = args.rango
+    if args.cache:
+        EQUITY_CACHE.open_store(args.cache)
+    if args.perf:
+        import atexit
+        enable_profiling()
+        atexit.register(print_profile_summary)
+    play_game(args.semilla)
\ No newline at end of file
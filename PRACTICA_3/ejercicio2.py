@@ -1,28 +1,33 @@
+import argparse
+import csv
+import json
+import sys
+from array import array
+from itertools import groupby, islice
+
+try:
+    import numpy as np
+except ImportError:   # NumPy es opcional: sin él los archivos se procesan orden por orden
+    np = None
+
+PRECIO_BASE    = 100
+PRECIO_TOPPING = 20
+LOTE_PIZZAS    = 200_000   # pizzas por lote al procesar archivos (acota la memoria)
+
+
 class Pizza:
+    __slots__ = ('tamaño', 'toppings', 'precio')   # sin __dict__: cada pizza ocupa mucho menos
+
     def __init__(self, tamaño, toppings):  # tamaño en radio, toppings en cantidad
         self.tamaño = tamaño
         self.toppings = toppings
         self.precio = self.calcular_precio()
 
     def calcular_precio(self):
-        base_price = 100
-        topping_price = 20
-        return base_price + (topping_price * self.toppings)
-
-
-def main():
-    pizzas = []
-    num_pizzas = int(input("¿Cuántas pizzas quieres ordenar? "))
-
-    for i in range(num_pizzas):
-        tamaño = float(input(f"¿Cuál es el tamaño (radio) de la pizza {i+1}? "))
-        toppings = int(input(f"¿Cuántos toppings quieres en la pizza {i+1}? "))
-        pizza = Pizza(tamaño, toppings)
-        pizzas.append(pizza)
+        return PRECIO_BASE + (PRECIO_TOPPING * self.toppings)
 
-    # Calcular total sin descuento
-    total_price = sum(p.precio for p in pizzas)
 
+def descuento_2x1(pizzas):
     # Agrupar pizzas por tamaño
     pizzas_por_tamaño = {}
 
@@ -35,13 +40,457 @@ def main():
 
     # Aplicar 2x1 por cada par de pizzas del mismo tamaño
     for tamaño, lista in pizzas_por_tamaño.items():
-        # Ordenar por precio (de menor a mayor)
-        lista.sort(key=lambda p: p.precio)
+        # Ordenar por precio (de mayor a menor)
+        lista.sort(key=lambda p: p.precio, reverse=True)
 
-        # Por cada par, la más barata es gratis
-        for i in range(0, len(lista) - 1, 2):
+        # Por cada par, desde las más caras, la más barata es gratis
+        for i in range(1, len(lista), 2):
             descuento += lista[i].precio
 
+    return descuento
+
+
+# ══════════════════════════════════════
+#  PROMOCIONES
+# ══════════════════════════════════════
+# Reglas que se pueden combinar en un MotorPromociones:
+#   NxM(n, m)              n pizzas del mismo tamaño, se pagan las m más caras
+#                          (2x1, 3x2...); con tamaños, solo en esos tamaños
+#   Combo(tamaños, precio) una pizza de cada tamaño de la lista por un precio fijo
+#   Cupon(porcentaje)      porcentaje sobre lo que queda por pagar; se usa el mejor
+# Cada pizza entra a lo más en una promoción y el motor elige la combinación
+# que más descuenta al cliente:
+#   - Con las pizzas de un tamaño de mayor a menor precio, los combos se llevan
+#     las más caras (cambiar una por otra más cara nunca baja el descuento) y
+#     los grupos NxM se pueden tomar contiguos, así que una programación
+#     dinámica sobre la lista ordenada da el mejor NxM para cada cantidad de
+#     pizzas que se lleven los combos: O(n log n + n * reglas) por tamaño.
+#   - Los usos de los combos salen de otra programación dinámica, combo por
+#     combo, cuyo estado es cuántas pizzas llevan tomadas de los tamaños que
+#     aún comparten con combos pendientes; cada combo cuesta O(estados), con
+#     estados <= (n + 1)^(tamaños abiertos a la vez), así que es polinomial en
+#     el número de pizzas (el grado lo fijan los tamaños del menú, no la
+#     cantidad de combos).
+#   - El cupón es un porcentaje de lo que queda, así que va al final.
+class NxM:
+    def __init__(self, n, m, tamaños=None):
+        if not 0 <= m < n:
+            raise ValueError(f'promoción {n}x{m} inválida: se necesita 0 <= m < n')
+        self.n = n
+        self.m = m
+        self.tamaños = None if tamaños is None else set(tamaños)
+        self.nombre = f'{n}x{m}'
+
+    def aplica(self, tamaño):
+        return self.tamaños is None or tamaño in self.tamaños
+
+
+class Combo:
+    def __init__(self, tamaños, precio, nombre=None):
+        self.tamaños = tuple(tamaños)
+        self.precio = precio
+        self.nombre = nombre or 'combo ' + '+'.join(f'{t:g}' for t in self.tamaños)
+
+
+class Cupon:
+    def __init__(self, porcentaje, nombre=None):
+        if not 0 < porcentaje <= 100:
+            raise ValueError(f'cupón de {porcentaje}% inválido')
+        self.porcentaje = porcentaje
+        self.nombre = nombre or f'cupón {porcentaje:g}%'
+
+
+class MotorPromociones:
+    def __init__(self, reglas):
+        self.nxm = [r for r in reglas if isinstance(r, NxM)]
+        self.combos = [r for r in reglas if isinstance(r, Combo)]
+        self.cupon = max((r for r in reglas if isinstance(r, Cupon)), key=lambda c: c.porcentaje, default=None)
+        self._nxm_por_tamaño = {}   # tamaño -> reglas NxM que aplican (se compila la primera vez)
+
+    def aplicar(self, pizzas):
+        # Retorna (descuento total, [(nombre, pizzas, descuento), ...])
+        por_tamaño = {}
+        for pizza in pizzas:
+            por_tamaño.setdefault(pizza.tamaño, []).append(pizza)
+        tablas = {t: self._tabla(t, sorted(lista, key=lambda p: p.precio, reverse=True))
+                  for t, lista in por_tamaño.items()}
+
+        usos, descuento = self._mejores_combos(tablas)
+        aplicadas = self._detalle(tablas, usos)
+        if self.cupon is not None:
+            restante = sum(p.precio for p in pizzas) - descuento
+            monto = restante * self.cupon.porcentaje // 100
+            if monto > 0:
+                aplicadas.append((self.cupon.nombre, [], monto))
+                descuento += monto
+        return descuento, aplicadas
+
+    def _reglas(self, tamaño):
+        if tamaño not in self._nxm_por_tamaño:
+            self._nxm_por_tamaño[tamaño] = [r for r in self.nxm if r.aplica(tamaño)]
+        return self._nxm_por_tamaño[tamaño]
+
+    def _tabla(self, tamaño, lista):
+        # lista de mayor a menor precio. mejor[i] = mayor descuento NxM con
+        # lista[i:], y eleccion[i] la regla que abre un grupo en i (o None)
+        n = len(lista)
+        acumulado = [0]
+        for p in lista:
+            acumulado.append(acumulado[-1] + p.precio)
+        mejor = [0] * (n + 1)
+        eleccion = [None] * (n + 1)
+        for i in range(n - 1, -1, -1):
+            mejor[i] = mejor[i + 1]
+            for regla in self._reglas(tamaño):
+                fin = i + regla.n
+                if fin <= n:
+                    # gratis: las n - m más baratas del grupo, que son las últimas
+                    valor = acumulado[fin] - acumulado[i + regla.m] + mejor[fin]
+                    if valor > mejor[i]:
+                        mejor[i], eleccion[i] = valor, regla
+        return lista, acumulado, mejor, eleccion
+
+    def _mejores_combos(self, tablas):
+        # Usos de cada combo que maximizan el descuento total. Programación
+        # dinámica sobre los combos, uno a la vez: el estado es cuántas pizzas
+        # llevan tomadas de cada tamaño "abierto" (que todavía usa algún combo
+        # pendiente) y guarda (mejor valor, usos). Un tamaño que ya no usa
+        # ningún combo se cierra: se suma su tabla y sale del estado.
+        valor_tamaño = {t: [a + b for a, b in zip(acumulado, mejor)]   # G(c): c más caras a combos, NxM el resto
+                        for t, (_, acumulado, mejor, _) in tablas.items()}
+        pendientes = [j for j, combo in enumerate(self.combos) if all(t in tablas for t in combo.tamaños)]
+        orden = []
+        abiertos = []
+        estados = {(): (0, (0,) * len(self.combos))}
+        while pendientes:
+            # siguiente combo: el que abre menos tamaños nuevos (estados más chicos)
+            j = min(pendientes, key=lambda j: len(set(self.combos[j].tamaños) - set(abiertos)))
+            pendientes.remove(j)
+            orden.append(j)
+            combo = self.combos[j]
+            for t in combo.tamaños:
+                if t not in abiertos:
+                    abiertos.append(t)
+                    estados = {clave + (0,): v for clave, v in estados.items()}
+            paso = tuple(combo.tamaños.count(t) for t in abiertos)
+            topes = tuple(len(tablas[t][0]) for t in abiertos)
+            estados = self._sumar_combo(estados, j, paso, topes, combo.precio)
+
+            siguen = {t for k in pendientes for t in self.combos[k].tamaños}
+            for i in reversed(range(len(abiertos))):
+                if abiertos[i] not in siguen:
+                    estados = self._cerrar(estados, i, valor_tamaño[abiertos[i]])
+                    del abiertos[i]
+
+        valor, usos = estados[()]
+        valor += sum(valor_tamaño[t][0] for t in tablas
+                     if not any(t in self.combos[j].tamaños for j in orden))
+        return usos, valor
+
+    @staticmethod
+    def _sumar_combo(estados, j, paso, topes, precio):
+        # Permite usar el combo j cualquier número de veces (como una mochila no
+        # acotada): cada estado c recorre su línea c, c + paso, c + 2*paso...
+        # mientras quepa, quedándose con lo mejor entre no usar el combo ahí y
+        # usarlo una vez más desde el anterior. Cada estado nuevo se visita una vez.
+        nuevos = {}
+        for clave in sorted(estados):   # c - paso sale antes que c
+            if clave in nuevos:
+                continue
+            actual, previo = clave, None
+            while all(c <= tope for c, tope in zip(actual, topes)):
+                propio = estados.get(actual)
+                if previo is not None:
+                    valor, usos = previo
+                    candidato = (valor - precio, usos[:j] + (usos[j] + 1,) + usos[j + 1:])
+                    if propio is None or candidato[0] > propio[0]:
+                        propio = candidato
+                nuevos[actual] = previo = propio
+                actual = tuple(c + d for c, d in zip(actual, paso))
+        return nuevos
+
+    @staticmethod
+    def _cerrar(estados, i, valor_tamaño):
+        cerrados = {}
+        for clave, (valor, usos) in estados.items():
+            resto = clave[:i] + clave[i + 1:]
+            valor += valor_tamaño[clave[i]]
+            if resto not in cerrados or valor > cerrados[resto][0]:
+                cerrados[resto] = (valor, usos)
+        return cerrados
+
+    def _detalle(self, tablas, usos):
+        aplicadas = []
+        siguiente = dict.fromkeys(tablas, 0)
+        for combo, k in zip(self.combos, usos):
+            for _ in range(k):
+                grupo = []
+                for t in combo.tamaños:
+                    grupo.append(tablas[t][0][siguiente[t]])
+                    siguiente[t] += 1
+                aplicadas.append((combo.nombre, grupo, sum(p.precio for p in grupo) - combo.precio))
+        for t, (lista, acumulado, _, eleccion) in tablas.items():
+            i = siguiente[t]
+            while i < len(lista):
+                regla = eleccion[i]
+                if regla is None:
+                    i += 1
+                    continue
+                aplicadas.append((regla.nombre, lista[i:i + regla.n],
+                                  acumulado[i + regla.n] - acumulado[i + regla.m]))
+                i += regla.n
+        return aplicadas
+
+
+PROMOCIONES = (NxM(2, 1),)   # las del menú: main() las aplica con MotorPromociones
+
+
+# ══════════════════════════════════════
+#  ÓRDENES EN LOTE
+# ══════════════════════════════════════
+# Precios de archivos grandes de órdenes (exportaciones del punto de venta) sin
+# cargarlos completos: cada etapa es un generador que consume a la anterior.
+#   CSV:   una pizza por fila, con encabezado orden,tamaño,toppings
+#   JSONL: una orden por línea, {"orden": 7, "pizzas": [{"tamaño": 12, "toppings": 2}, ...]}
+# Las pizzas de una orden van seguidas en el archivo. Cada orden produce un
+# ticket (orden, pizzas, subtotal, descuento, total) con el 2x1 de descuento_2x1.
+def leer_filas(ruta):  # (orden, tamaño, toppings) por pizza, del CSV o JSONL
+    if ruta.endswith('.jsonl'):
+        with open(ruta, encoding='utf-8') as f:
+            for linea in f:
+                if linea.strip():
+                    orden = json.loads(linea)
+                    for p in orden['pizzas']:
+                        yield int(orden['orden']), float(p['tamaño']), int(p['toppings'])
+    else:
+        with open(ruta, newline='', encoding='utf-8') as f:
+            for fila in csv.DictReader(f):
+                yield int(fila['orden']), float(fila['tamaño']), int(fila['toppings'])
+
+
+def tickets_python(filas):
+    for orden, grupo in groupby(filas, key=lambda fila: fila[0]):
+        pizzas = [Pizza(tamaño, toppings) for _, tamaño, toppings in grupo]
+        subtotal = sum(p.precio for p in pizzas)
+        descuento = descuento_2x1(pizzas)
+        yield orden, len(pizzas), subtotal, descuento, subtotal - descuento
+
+
+def lotes_numpy(ruta, tamaño_lote=LOTE_PIZZAS):
+    # Arreglos (orden, tamaño, toppings) de hasta ~tamaño_lote pizzas. El CSV se
+    # lee por bloques de líneas con np.loadtxt, sin un objeto por fila.
+    if ruta.endswith('.jsonl'):
+        filas = leer_filas(ruta)
+        while True:
+            bloque = np.array(list(islice(filas, tamaño_lote)), dtype=np.float64).reshape(-1, 3)
+            if not len(bloque):
+                return
+            yield bloque[:, 0].astype(np.int64), bloque[:, 1], bloque[:, 2].astype(np.int64)
+
+    with open(ruta, 'rb') as f:
+        encabezado = f.readline().decode('utf-8').strip().split(',')
+        columnas = [encabezado.index(c) for c in ('orden', 'tamaño', 'toppings')]
+        while True:
+            lineas = f.readlines(tamaño_lote * 16)   # ~16 bytes por fila
+            if not lineas:
+                return
+            bloque = np.loadtxt(lineas, delimiter=',', ndmin=2)[:, columnas]
+            yield bloque[:, 0].astype(np.int64), bloque[:, 1], bloque[:, 2].astype(np.int64)
+
+
+def precios_lote(orden, tamaño, toppings):
+    # Subtotal y descuento 2x1 de las órdenes completas de un lote, sin objetos
+    # por pizza. Retorna (orden, pizzas, subtotal, descuento) por orden.
+    precio = PRECIO_BASE + PRECIO_TOPPING * toppings
+    n = len(orden)
+    nueva = np.ones(n, dtype=bool)
+    nueva[1:] = orden[1:] != orden[:-1]
+    inicios = np.flatnonzero(nueva)
+    run = np.cumsum(nueva) - 1   # número de orden dentro del lote
+
+    # Ordenar por (orden, tamaño, precio): cada grupo de un tamaño queda junto y
+    # de menor a mayor precio; contando pares desde la más cara, la más barata
+    # de cada par (posición impar desde el final del grupo) es gratis
+    idx = np.lexsort((precio, tamaño, run))
+    r, t, p = run[idx], tamaño[idx], precio[idx]
+    grupo_nuevo = np.ones(n, dtype=bool)
+    grupo_nuevo[1:] = (r[1:] != r[:-1]) | (t[1:] != t[:-1])
+    grupo_inicios = np.flatnonzero(grupo_nuevo)
+    grupo = np.cumsum(grupo_nuevo) - 1
+    posicion = np.arange(n) - grupo_inicios[grupo]
+    tamaño_grupo = np.diff(np.append(grupo_inicios, n))[grupo]
+    gratis = (tamaño_grupo - 1 - posicion) % 2 == 1
+
+    subtotal = np.add.reduceat(precio, inicios)
+    descuento = np.add.reduceat(np.where(gratis, p, 0), inicios)   # r está ordenado: mismos inicios
+    return orden[inicios], np.diff(np.append(inicios, n)), subtotal, descuento
+
+
+def tickets_numpy(lotes):
+    resto = None
+    for lote in lotes:
+        if resto is not None:
+            lote = tuple(np.concatenate(par) for par in zip(resto, lote))
+        orden = lote[0]
+        # La última orden puede seguir en el siguiente lote: se guarda para después
+        corte = len(orden) - int(np.argmax(orden[::-1] != orden[-1])) if (orden != orden[-1]).any() else 0
+        resto = tuple(a[corte:] for a in lote)
+        if corte:
+            yield from _como_tickets(precios_lote(*(a[:corte] for a in lote)))
+    if resto is not None and len(resto[0]):
+        yield from _como_tickets(precios_lote(*resto))
+
+
+def _como_tickets(precios):
+    orden, pizzas, subtotal, descuento = precios
+    return zip(orden.tolist(), pizzas.tolist(), subtotal.tolist(), descuento.tolist(),
+               (subtotal - descuento).tolist())
+
+
+def escribir_tickets(tickets, salida, bloque=50_000):
+    # CSV de tickets, escrito por bloques (una escritura por bloque, no por orden)
+    salida.write('orden,pizzas,subtotal,descuento,total\n')
+    resumen = [0, 0, 0, 0]   # órdenes, pizzas, descuento, total
+    while True:
+        filas = list(islice(tickets, bloque))
+        if not filas:
+            return resumen
+        salida.write(''.join([f'{o},{n},{s},{d},{t}\n' for o, n, s, d, t in filas]))
+        resumen[0] += len(filas)
+        resumen[1] += sum(f[1] for f in filas)
+        resumen[2] += sum(f[3] for f in filas)
+        resumen[3] += sum(f[4] for f in filas)
+
+
+# ══════════════════════════════════════
+#  LOTE EN COLUMNAS
+# ══════════════════════════════════════
+# Para tener en memoria las órdenes de un día (reportes) sin un objeto por
+# pizza: cada campo es una columna array (orden 8 bytes, tamaño 8, toppings 4,
+# precio 4: 24 bytes por pizza). lote[i] da una PizzaVista, que se comporta
+# como una Pizza de solo lectura sobre las columnas. Subtotal, descuento y
+# tickets se calculan sobre las columnas (con NumPy, sin copiarlas).
+class PizzaVista(Pizza):
+    __slots__ = ('_lote', '_i')
+
+    def __init__(self, lote, i):
+        self._lote = lote
+        self._i = i
+
+    tamaño = property(lambda self: self._lote.tamaño[self._i])
+    toppings = property(lambda self: self._lote.toppings[self._i])
+    precio = property(lambda self: self._lote.precio[self._i])
+    orden = property(lambda self: self._lote.orden[self._i])
+
+
+class LotePizzas:
+    def __init__(self, filas=()):  # filas: (orden, tamaño, toppings), las de una orden seguidas
+        self.orden = array('q')
+        self.tamaño = array('d')
+        self.toppings = array('i')
+        self.precio = array('i')
+        self.extender(filas)
+
+    @classmethod
+    def desde_archivo(cls, ruta):
+        lote = cls()
+        if np is None:
+            lote.extender(leer_filas(ruta))
+            return lote
+        for orden, tamaño, toppings in lotes_numpy(ruta):
+            lote.orden.frombytes(orden.astype(np.int64).tobytes())
+            lote.tamaño.frombytes(tamaño.astype(np.float64).tobytes())
+            lote.toppings.frombytes(toppings.astype(np.int32).tobytes())
+            lote.precio.frombytes((PRECIO_BASE + PRECIO_TOPPING * toppings).astype(np.int32).tobytes())
+        return lote
+
+    def agregar(self, orden, tamaño, toppings):
+        self.orden.append(orden)
+        self.tamaño.append(tamaño)
+        self.toppings.append(toppings)
+        self.precio.append(PRECIO_BASE + PRECIO_TOPPING * toppings)
+
+    def extender(self, filas):
+        for orden, tamaño, toppings in filas:
+            self.agregar(orden, tamaño, toppings)
+
+    def __len__(self):
+        return len(self.orden)
+
+    def __getitem__(self, i):
+        if not -len(self) <= i < len(self):
+            raise IndexError('índice fuera del lote')
+        return PizzaVista(self, i % len(self))
+
+    def __iter__(self):
+        return (PizzaVista(self, i) for i in range(len(self)))
+
+    def nbytes(self):
+        return sum(len(c) * c.itemsize for c in (self.orden, self.tamaño, self.toppings, self.precio))
+
+    def subtotal(self):
+        return sum(self.precio)
+
+    def tickets(self):
+        # (orden, pizzas, subtotal, descuento, total) por orden, igual que tickets_python
+        if np is not None:
+            return tickets_numpy(self._columnas_numpy())
+        return self._tickets_python()
+
+    def descuento(self):
+        return sum(t[3] for t in self.tickets())
+
+    def total(self):
+        return self.subtotal() - self.descuento()
+
+    def _columnas_numpy(self, tamaño_lote=LOTE_PIZZAS):
+        # Vistas de NumPy sobre los mismos buffers de las columnas, por tramos
+        orden = np.frombuffer(self.orden, dtype=np.int64)
+        tamaño = np.frombuffer(self.tamaño, dtype=np.float64)
+        toppings = np.frombuffer(self.toppings, dtype=np.int32)
+        for i in range(0, len(self), tamaño_lote):
+            j = i + tamaño_lote
+            yield orden[i:j], tamaño[i:j], toppings[i:j].astype(np.int64)
+
+    def _tickets_python(self):
+        n = len(self)
+        i = 0
+        while i < n:
+            j = i
+            por_tamaño = {}
+            while j < n and self.orden[j] == self.orden[i]:
+                por_tamaño.setdefault(self.tamaño[j], []).append(self.precio[j])
+                j += 1
+            subtotal = sum(self.precio[i:j])
+            descuento = 0
+            for precios in por_tamaño.values():
+                precios.sort(reverse=True)
+                descuento += sum(precios[1::2])   # la más barata de cada par
+            yield self.orden[i], j - i, subtotal, descuento, subtotal - descuento
+            i = j
+
+
+def procesar_archivo(entrada, salida):
+    tickets = tickets_numpy(lotes_numpy(entrada)) if np is not None else tickets_python(leer_filas(entrada))
+    with open(salida, 'w', encoding='utf-8') as f:
+        return escribir_tickets(iter(tickets), f)
+
+
+def main():
+    pizzas = []
+    num_pizzas = int(input("¿Cuántas pizzas quieres ordenar? "))
+
+    for i in range(num_pizzas):
+        tamaño = float(input(f"¿Cuál es el tamaño (radio) de la pizza {i+1}? "))
+        toppings = int(input(f"¿Cuántos toppings quieres en la pizza {i+1}? "))
+        pizza = Pizza(tamaño, toppings)
+        pizzas.append(pizza)
+
+    # Calcular total sin descuento
+    total_price = sum(p.precio for p in pizzas)
+
+    descuento, aplicadas = MotorPromociones(PROMOCIONES).aplicar(pizzas)
+
     total_final = total_price - descuento
 
     # Ticket
@@ -51,12 +500,27 @@ def main():
               f"Toppings: {pizza.toppings}, "
               f"Precio: ${pizza.precio}")
 
-    if descuento > 0:
-        print(f"Descuento 2x1 aplicado: -${descuento}")
+    por_promocion = {}
+    for nombre, _, monto in aplicadas:
+        por_promocion[nombre] = por_promocion.get(nombre, 0) + monto
+    for nombre, monto in por_promocion.items():
+        if monto > 0:
+            print(f"Descuento {nombre} aplicado: -${monto}")
 
     print(f"Precio Total Final: ${total_final}")
 
 
-if __name__ == "__main__":
-    main()
+def main_lote():
+    parser = argparse.ArgumentParser(description='Precios de un archivo de órdenes (CSV o JSONL) con 2x1.')
+    parser.add_argument('entrada', help='órdenes: CSV (orden,tamaño,toppings) o .jsonl')
+    parser.add_argument('--salida', default='tickets.csv', help='CSV de tickets por orden')
+    args = parser.parse_args()
+    ordenes, pizzas, descuento, total = procesar_archivo(args.entrada, args.salida)
+    print(f"{ordenes} órdenes, {pizzas} pizzas, descuento 2x1 ${descuento}, total ${total} -> {args.salida}")
+
 
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main_lote()
+    else:
+        main()
@@ -1,6 +1,5 @@
 import math
 import numpy as np
-import matplotlib.pyplot as plt
 
 class Circulo:
     def __init__(self, x, y, r):
@@ -49,54 +48,193 @@ class Circulo:
         return parte1 + parte2 - parte3
 
 
-# ===== ENTRADA DEL USUARIO =====
-print("Ingrese los datos del Círculo 1")
-x1 = float(input("x1: "))
-y1 = float(input("y1: "))
-r1 = float(input("radio1: "))
+# ===== INTERSECCIONES EN LOTE (NumPy) =====
+# Los mismos cálculos que Circulo, pero sobre arreglos de círculos (N, 3) con
+# columnas x, y, r: cada rama (separados, tangentes, uno dentro del otro) es
+# una máscara en lugar de un if. El tipo se da como índice de TIPOS.
+TIPOS = (
+    "No se intersectan",
+    "Tangencia externa",
+    "Un círculo dentro del otro",
+    "Tangencia interna",
+    "Se intersectan en dos puntos",
+)
+
+
+def como_arreglo(circulos):
+    # Lista de Circulo -> arreglo (N, 3); un arreglo (N, 3) se valida y se deja igual
+    if len(circulos) and isinstance(circulos[0], Circulo):
+        circulos = [(c.x, c.y, c.r) for c in circulos]
+    arr = np.asarray(circulos, dtype=np.float64).reshape(-1, 3)
+    if (arr[:, 2] <= 0).any():
+        raise ValueError("El radio debe ser positivo")
+    return arr
+
+
+def intersecciones(a, b):
+    # Tipo (índice de TIPOS, int8) y área de intersección de cada par a[i], b[i].
+    # a y b son arreglos (..., 3) que NumPy pueda emparejar (broadcasting).
+    # No valida radios: como_arreglo lo hace al convertir.
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64))
+    r1, r2 = a[..., 2], b[..., 2]
+    d = np.sqrt((a[..., 0] - b[..., 0])**2 + (a[..., 1] - b[..., 1])**2)
+    suma = r1 + r2
+    resta = np.abs(r1 - r2)
+
+    # Mismo orden de comparaciones que tipo_interseccion
+    tipos = np.select(
+        [d > suma, d == suma, d < resta, d == resta],
+        [0, 1, 2, 3], default=4).astype(np.int8)
+
+    areas = np.zeros(d.shape)
+    dentro = (d <= resta) & (d < suma)
+    areas[dentro] = np.pi * np.minimum(r1, r2)[dentro]**2
+    lente = (d > resta) & (d < suma)   # aquí d > 0: sin divisiones entre cero
+    if lente.any():
+        d, r1, r2 = d[lente], r1[lente], r2[lente]
+        parte1 = r1**2 * np.arccos(np.clip((d**2 + r1**2 - r2**2) / (2*d*r1), -1, 1))
+        parte2 = r2**2 * np.arccos(np.clip((d**2 + r2**2 - r1**2) / (2*d*r2), -1, 1))
+        parte3 = 0.5 * np.sqrt((-d+r1+r2)*(d+r1-r2)*(d-r1+r2)*(d+r1+r2))
+        areas[lente] = parte1 + parte2 - parte3
+    return tipos, areas
+
+
+def intersecciones_todos(circulos):
+    # Todos contra todos: matrices (N, N) de tipos y áreas (simétricas; la
+    # diagonal compara cada círculo consigo mismo). Memoria O(N²).
+    c = como_arreglo(circulos)
+    return intersecciones(c[:, None, :], c[None, :, :])
+
+
+# ===== ÍNDICE ESPACIAL =====
+# Para encontrar qué círculos se traslapan entre muchos, sin probar los N²
+# pares: una rejilla uniforme de celdas de lado 2 * (radio máximo). Dos
+# círculos que se tocan tienen sus centros a lo más a esa distancia, así que
+# están en la misma celda o en una vecina; solo esos pares candidatos pasan por
+# intersecciones. Los círculos se ordenan por celda y los candidatos de cada
+# uno son rangos contiguos del orden (buscados con searchsorted), así que todo
+# es vectorizado y, con los círculos dispersos, casi lineal. Supone radios de
+# escala parecida: un círculo enorme agranda todas las celdas.
+_VECINAS = ((1, -1), (1, 0), (1, 1), (0, 1))   # la celda propia se trata aparte; así cada par sale una vez
+
+
+class RejillaCirculos:
+    def __init__(self, circulos, celda=None):
+        self.circulos = como_arreglo(circulos)
+        x, y, r = self.circulos.T
+        minima = 2 * r.max() if len(r) else 1.0
+        if celda is not None and celda < minima:
+            raise ValueError("La celda debe medir al menos el diámetro del círculo más grande")
+        self.celda = celda or minima
+        x0, y0 = (x.min(), y.min()) if len(x) else (0.0, 0.0)
+        cx = np.floor((x - x0) / self.celda).astype(np.int64)
+        cy = np.floor((y - y0) / self.celda).astype(np.int64)
+        self._alto = int(cy.max(initial=0)) + 2   # columna con una fila vacía de margen: cy ± 1 no se sale a otra
+        llaves = cx * self._alto + cy
+        self.orden = np.argsort(llaves, kind='stable')
+        self.llaves = llaves[self.orden]
+
+    def pares_candidatos(self, bloque=200_000):
+        # Genera arreglos (i, j) de índices originales, i != j, por bloques de círculos
+        llaves, n = self.llaves, len(self.llaves)
+        fin_celda = np.searchsorted(llaves, llaves, side='right')
+        for a in range(0, n, bloque):
+            k = np.arange(a, min(a + bloque, n))
+            rangos = [(k + 1, fin_celda[k])]   # misma celda: solo los que siguen en el orden
+            for dx, dy in _VECINAS:
+                vecina = llaves[k] + dx * self._alto + dy
+                rangos.append((np.searchsorted(llaves, vecina, side='left'),
+                               np.searchsorted(llaves, vecina, side='right')))
+            for inicio, fin in rangos:
+                i, j = _expandir(k, inicio, fin)
+                if len(i):
+                    yield self.orden[i], self.orden[j]
+
+    def pares_intersectan(self):
+        # (i, j, tipos, áreas) de los pares que se tocan (tipo distinto de "No se intersectan")
+        partes = []
+        for i, j in self.pares_candidatos():
+            tipos, areas = intersecciones(self.circulos[i], self.circulos[j])
+            toca = tipos != 0
+            partes.append((i[toca], j[toca], tipos[toca], areas[toca]))
+        if not partes:
+            return (np.empty(0, np.int64),) * 2 + (np.empty(0, np.int8), np.empty(0))
+        return tuple(np.concatenate(col) for col in zip(*partes))
+
+    def area_total(self):
+        # Suma de las áreas de intersección de todos los pares
+        return float(sum(intersecciones(self.circulos[i], self.circulos[j])[1].sum()
+                         for i, j in self.pares_candidatos()))
+
+
+def _expandir(k, inicio, fin):
+    # Pares (k[t], u) para cada u en [inicio[t], fin[t]), sin ciclos de Python
+    cuantos = np.maximum(fin - inicio, 0)
+    total = int(cuantos.sum())
+    i = np.repeat(k, cuantos)
+    desplazamiento = np.arange(total) - np.repeat(np.cumsum(cuantos) - cuantos, cuantos)
+    return i, np.repeat(inicio, cuantos) + desplazamiento
+
+
+def graficar(c1, c2):
+    # ===== GRÁFICA =====
+    import matplotlib.pyplot as plt   # solo para la gráfica: el resto del módulo no lo necesita
+
+    fig, ax = plt.subplots()
+
+    circle1 = plt.Circle((c1.x, c1.y), c1.r, color='blue', alpha=0.3)
+    circle2 = plt.Circle((c2.x, c2.y), c2.r, color='red', alpha=0.3)
+
+    ax.add_patch(circle1)
+    ax.add_patch(circle2)
+
+    # Sombreado numérico
+    x = np.linspace(min(c1.x-c1.r, c2.x-c2.r),
+                    max(c1.x+c1.r, c2.x+c2.r), 500)
+
+    y = np.linspace(min(c1.y-c1.r, c2.y-c2.r),
+                    max(c1.y+c1.r, c2.y+c2.r), 500)
+
+    X, Y = np.meshgrid(x, y)
+
+    mask1 = (X - c1.x)**2 + (Y - c1.y)**2 <= c1.r**2
+    mask2 = (X - c2.x)**2 + (Y - c2.y)**2 <= c2.r**2
+
+    intersection = mask1 & mask2
+
+    ax.contourf(X, Y, intersection, levels=[0.5, 1], alpha=0.4)
+
+    ax.set_aspect('equal')
+    ax.grid(True)
+    plt.title("Intersección de Círculos")
+    plt.show()
+
+
+def main():
+    # ===== ENTRADA DEL USUARIO =====
+    print("Ingrese los datos del Círculo 1")
+    x1 = float(input("x1: "))
+    y1 = float(input("y1: "))
+    r1 = float(input("radio1: "))
+
+    print("\nIngrese los datos del Círculo 2")
+    x2 = float(input("x2: "))
+    y2 = float(input("y2: "))
+    r2 = float(input("radio2: "))
+
+    c1 = Circulo(x1, y1, r1)
+    c2 = Circulo(x2, y2, r2)
+
+    # ===== RESULTADOS =====
+    tipo = c1.tipo_interseccion(c2)
+    area = c1.area_interseccion(c2)
+
+    print("\nResultado:")
+    print("Tipo de intersección:", tipo)
+    print("Área de intersección:", round(area, 4))
+
+    graficar(c1, c2)
 
-print("\nIngrese los datos del Círculo 2")
-x2 = float(input("x2: "))
-y2 = float(input("y2: "))
-r2 = float(input("radio2: "))
 
-c1 = Circulo(x1, y1, r1)
-c2 = Circulo(x2, y2, r2)
-
-# ===== RESULTADOS =====
-tipo = c1.tipo_interseccion(c2)
-area = c1.area_interseccion(c2)
-
-print("\nResultado:")
-print("Tipo de intersección:", tipo)
-print("Área de intersección:", round(area, 4))
-
-# ===== GRÁFICA =====
-fig, ax = plt.subplots()
-
-circle1 = plt.Circle((c1.x, c1.y), c1.r, color='blue', alpha=0.3)
-circle2 = plt.Circle((c2.x, c2.y), c2.r, color='red', alpha=0.3)
-
-ax.add_patch(circle1)
-ax.add_patch(circle2)
-
-# Sombreado numérico
-x = np.linspace(min(c1.x-c1.r, c2.x-c2.r),
-                max(c1.x+c1.r, c2.x+c2.r), 500)
-
-y = np.linspace(min(c1.y-c1.r, c2.y-c2.r),
-                max(c1.y+c1.r, c2.y+c2.r), 500)
-
-X, Y = np.meshgrid(x, y)
-
-mask1 = (X - c1.x)**2 + (Y - c1.y)**2 <= c1.r**2
-mask2 = (X - c2.x)**2 + (Y - c2.y)**2 <= c2.r**2
-
-intersection = mask1 & mask2
-
-ax.contourf(X, Y, intersection, levels=[0.5, 1], alpha=0.4)
-
-ax.set_aspect('equal')
-ax.grid(True)
-plt.title("Intersección de Círculos")
-plt.show()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
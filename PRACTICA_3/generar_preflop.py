@@ -0,0 +1,41 @@
+"""
+Genera la tabla de probabilidades preflop que usa ejercicio1.py.
+
+Para cada una de las 169 clases de mano inicial (pares, suited y offsuit) y
+para 2 a 6 jugadores simula la probabilidad de ganar y de empatar contra
+manos al azar, y la guarda en preflop_equity.bin. Solo hace falta correrlo
+una vez (o de nuevo si cambian las reglas de desempate). Requiere NumPy.
+
+Uso:
+    python generar_preflop.py [--simulaciones 50000] [--semilla 169] [--salida preflop_equity.bin]
+"""
+
+import argparse
+import time
+
+import ejercicio1 as poker
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--simulaciones', type=int, default=50_000, help='simulaciones por clase y número de jugadores')
+    parser.add_argument('--semilla', type=int, default=169)
+    parser.add_argument('--salida', default=poker.PREFLOP_PATH)
+    args = parser.parse_args()
+
+    if poker.np is None:
+        raise SystemExit('generar_preflop.py necesita NumPy (pip install numpy).')
+
+    t0 = time.perf_counter()
+
+    def progreso(jugadores, idx):
+        if idx == 168:
+            print(f"  {jugadores} jugadores listo ({time.perf_counter() - t0:.0f} s)")
+
+    print(f"Generando tabla preflop con {args.simulaciones} simulaciones por clase...")
+    poker.build_preflop_table(args.salida, args.simulaciones, args.semilla, progreso)
+    print(f"Tabla guardada en {args.salida}")
+
+
+if __name__ == '__main__':
+    main()
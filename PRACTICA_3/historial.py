@@ -0,0 +1,100 @@
+"""
+Consulta el historial binario de manos que escribe ejercicio1.py (historial.bin).
+
+    resumen   manos, pozo promedio y, por jugador, manos jugadas, ganadas y
+              fichas netas (recorre el archivo con el lector en streaming, o
+              con NumPy sobre el mmap si está instalado)
+    ver N     repite la mano N: cartas (comprobadas contra su semilla),
+              tablero, acciones por ronda, probabilidades por calle y ganador
+
+Uso:
+    python historial.py [--archivo historial.bin] resumen [--desde 2026-01-31]
+    python historial.py [--archivo historial.bin] ver -1
+"""
+
+import argparse
+import time
+
+import ejercicio1 as poker
+
+
+def resumen(lector: poker.HandLogReader, desde: int = 0):
+    por_jugador = {}    # id -> [manos, ganadas, netas]
+    manos = pozo = 0
+    if poker.np is not None and not desde:
+        v = lector.numpy_view()
+        manos, pozo = len(v), int(v['pot'].sum())
+        for i in range(poker.LOG_SEATS):
+            sentado = v['players'] > i
+            ids     = v['ids'][sentado, i]
+            for pid in map(int, poker.np.unique(ids)):
+                filas = sentado.copy()
+                filas[sentado] = ids == pid
+                s = por_jugador.setdefault(pid, [0, 0, 0])
+                s[0] += int(filas.sum())
+                s[1] += int(((v['winners'][filas] >> i) & 1).sum())
+                s[2] += int(v['net'][filas, i].sum())
+        del v   # el arreglo apunta al mmap: soltarlo antes de cerrar
+    else:
+        for mano in lector.since(desde) if desde else lector:
+            manos += 1
+            pozo  += mano['pot']
+            for p in mano['players']:
+                s = por_jugador.setdefault(p['id'], [0, 0, 0])
+                s[0] += 1
+                s[1] += p['won']
+                s[2] += p['net']
+
+    print(f"{manos} manos, pozo promedio {pozo / max(manos, 1):.1f}")
+    print(f"{'jugador':>8} {'manos':>8} {'ganadas':>8} {'netas':>10} {'por mano':>9}")
+    for pid, (n, ganadas, netas) in sorted(por_jugador.items()):
+        print(f"{pid:>8} {n:>8} {ganadas:>8} {netas:>10} {netas / n:>9.1f}")
+
+
+def ver(lector: poker.HandLogReader, numero: int):
+    mano  = lector[numero]
+    fecha = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(mano['time']))
+    print(f"Mano {numero % len(lector)}  ·  {fecha}  ·  semilla {mano['seed']}  ·  pozo {mano['pot']}")
+    if mano['seed']:
+        cartas, _ = poker.replay_deal(mano['seed'], len(mano['players']))
+        ok = cartas == [p['cards'] for p in mano['players']]
+        print(f"  reparto desde la semilla: {'coincide' if ok else 'NO coincide'}")
+
+    nombre = lambda codes: ' '.join(repr(poker.CARDS[c]) for c in codes)
+    print(f"  tablero: {nombre(mano['board'])}")
+    for p in mano['players']:
+        equity = '  '.join(f"{calle} {e:5.1f}%" for calle, e in zip(poker.STREETS, p['equity'])
+                           if e is not None)
+        marca  = ' ← gana' if p['won'] else ''
+        print(f"  Jugador {p['id']:<3} {nombre(p['cards']):<8} netas {p['net']:>+7}  {equity}{marca}")
+
+    ronda = None
+    for pid, r, accion, fichas in mano['actions']:
+        if r != ronda:
+            ronda = r
+            print(f"  ronda {r}:" if r else "  ciegas:")
+        print(f"    Jugador {pid}: {accion}" + (f" {fichas}" if fichas else ''))
+    if mano['action_count'] > len(mano['actions']):
+        print(f"    ... {mano['action_count'] - len(mano['actions'])} acciones más (no caben en el registro)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--archivo', default=poker.HAND_LOG_PATH)
+    sub = parser.add_subparsers(dest='comando', required=True)
+    p_resumen = sub.add_parser('resumen')
+    p_resumen.add_argument('--desde', help='solo manos desde esta fecha (AAAA-MM-DD)')
+    p_ver = sub.add_parser('ver')
+    p_ver.add_argument('numero', type=int, help='número de mano (negativo = desde el final)')
+    args = parser.parse_args()
+
+    with poker.HandLogReader(args.archivo) as lector:
+        if args.comando == 'resumen':
+            desde = int(time.mktime(time.strptime(args.desde, '%Y-%m-%d'))) if args.desde else 0
+            resumen(lector, desde)
+        else:
+            ver(lector, args.numero)
+
+
+if __name__ == '__main__':
+    main()
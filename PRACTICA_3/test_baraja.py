@@ -0,0 +1,33 @@
+import random
+
+import ejercicio1 as poker
+
+
+def _repartir(baraja, n=52):
+    return [baraja.pop() for _ in range(n)]
+
+
+def test_misma_semilla_mismo_reparto():
+    primero = _repartir(poker.Deck(42))
+    assert primero == _repartir(poker.Deck(42))
+    assert sorted(primero) == list(range(52))
+    assert primero != _repartir(poker.Deck(43))
+
+
+def test_reset_reutiliza_el_buffer():
+    baraja = poker.Deck(7)
+    primero = _repartir(baraja, 9)
+    assert len(baraja) == 43
+    assert _repartir(baraja.reset(7), 9) == primero
+    assert len(baraja) == 43 and sorted(baraja) == sorted(set(range(52)) - set(primero))
+
+
+def test_mano_headless_con_semilla_se_repite():
+    def cartas(semilla):
+        mesa  = [poker.Player(i + 1, f"Jugador {i + 1}", 100) for i in range(3)]
+        for p in mesa:
+            p.policy = poker.passive_policy
+        state = poker.play_hand_headless(mesa, random.Random(0), seed=semilla)
+        return [c.code for p in mesa for c in p.cards], [c.code for c in state.community]
+
+    assert cartas(123) == cartas(123)
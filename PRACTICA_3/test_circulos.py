@@ -0,0 +1,72 @@
+import random
+
+import numpy as np
+import pytest
+
+import ejercicio3 as geo
+
+
+def _circulos(semilla, n, lado=20, radios=(1, 4)):
+    # Coordenadas y radios enteros: también salen tangencias y círculos iguales exactos
+    rng = random.Random(semilla)
+    return [geo.Circulo(rng.randint(0, lado), rng.randint(0, lado), rng.randint(*radios)) for _ in range(n)]
+
+
+def test_intersecciones_igual_que_circulo():
+    a, b = _circulos(1, 3000), _circulos(2, 3000)
+    tipos, areas = geo.intersecciones(geo.como_arreglo(a), geo.como_arreglo(b))
+    assert [geo.TIPOS[t] for t in tipos] == [c1.tipo_interseccion(c2) for c1, c2 in zip(a, b)]
+    assert areas == pytest.approx([c1.area_interseccion(c2) for c1, c2 in zip(a, b)], abs=1e-9)
+    assert len(set(tipos.tolist())) == len(geo.TIPOS)
+
+
+def test_intersecciones_todos_es_simetrica():
+    circulos = _circulos(3, 60)
+    tipos, areas = geo.intersecciones_todos(circulos)
+    for i, c1 in enumerate(circulos):
+        for j, c2 in enumerate(circulos):
+            assert geo.TIPOS[tipos[i, j]] == c1.tipo_interseccion(c2)
+            assert areas[i, j] == pytest.approx(c1.area_interseccion(c2), abs=1e-9)
+
+
+def test_radio_invalido():
+    with pytest.raises(ValueError):
+        geo.como_arreglo([(0, 0, 1), (1, 1, 0)])
+
+
+def _pares_todos(circulos):
+    # Referencia: triángulo superior de la matriz completa
+    tipos, areas = geo.intersecciones_todos(circulos)
+    i, j = np.triu_indices(len(circulos), k=1)
+    toca = tipos[i, j] != 0
+    return {(a, b): (t, s) for a, b, t, s in zip(i[toca], j[toca], tipos[i, j][toca], areas[i, j][toca])}, \
+        float(areas[i, j].sum())
+
+
+@pytest.mark.parametrize('celda', [None, 24.0, 50.0])
+def test_rejilla_igual_que_todos_los_pares(celda):
+    circulos = _circulos(4, 400, lado=60) + _circulos(5, 20, lado=60, radios=(8, 12))
+    esperados, area = _pares_todos(circulos)
+    rejilla = geo.RejillaCirculos(circulos, celda=celda)
+    i, j, tipos, areas = rejilla.pares_intersectan()
+    obtenidos = {}
+    for a, b, t, s in zip(i, j, tipos, areas):
+        llave = (min(a, b), max(a, b))
+        assert llave not in obtenidos          # cada par sale una sola vez
+        obtenidos[llave] = (t, s)
+    assert obtenidos.keys() == esperados.keys()
+    for llave, (t, s) in esperados.items():
+        assert obtenidos[llave][0] == t and obtenidos[llave][1] == pytest.approx(s, abs=1e-9)
+    assert rejilla.area_total() == pytest.approx(area)
+
+
+def test_rejilla_vacia_y_de_un_circulo():
+    for circulos in ([], [(1.0, 2.0, 3.0)]):
+        rejilla = geo.RejillaCirculos(circulos)
+        assert all(len(col) == 0 for col in rejilla.pares_intersectan())
+        assert rejilla.area_total() == 0.0
+
+
+def test_celda_menor_que_el_diametro_se_rechaza():
+    with pytest.raises(ValueError):
+        geo.RejillaCirculos([(0, 0, 1), (3, 0, 2)], celda=3.0)
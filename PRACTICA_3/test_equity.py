@@ -0,0 +1,93 @@
+import random
+import time
+
+import ejercicio1 as poker
+
+
+def _mesa(jugadores, calle=0, semilla=5):
+    state = poker.GameState()
+    state.deck    = poker.Deck(semilla)
+    state.players = [poker.Player(i + 1, f"Jugador {i + 1}", 100) for i in range(jugadores)]
+    for p in state.players:
+        poker.deal_hole_cards(state, p)
+    for _ in range(calle):
+        poker.deal_community(state)
+    return state
+
+
+def test_enumeracion_por_tandas_termina_en_el_exacto():
+    state  = _mesa(3, calle=3)
+    exacto = poker.enumerate_win_probabilities(state.players, state.community, state.deck)
+    tandas = list(poker._enumeration_batches(state.players, state.community, state.deck, rng=random.Random(1)))
+    assert len(tandas) > 1
+    assert [t['n'] for t in tandas] == sorted({t['n'] for t in tandas})
+    assert all('ci' in t for t in tandas[:-1]) and 'ci' not in tandas[-1]
+    assert {k: v for k, v in tandas[-1].items() if k != 'n'} == exacto
+
+
+def test_job_se_detiene_y_guarda_el_valor_refinado(monkeypatch):
+    monkeypatch.setattr(poker, 'EQUITY_CACHE', poker.EquityCache())
+    state = _mesa(3)                  # preflop: demasiados tableros, va por Monte Carlo
+    job   = poker.start_equity_job(state)
+    assert not job.exact
+    limite = time.perf_counter() + 10
+    while job.snapshot() is None and time.perf_counter() < limite:
+        time.sleep(0.01)
+    primera = job.snapshot()
+    assert primera is not None
+
+    poker.record_equity_job(state, job, 'Ronda 1 — Preflop')
+    assert job.done()
+    entrada = state.prob_history[-1]
+    assert entrada['probs'] is job.snapshot()
+    assert entrada['probs']['n'] >= primera['n'] and 'ci' in entrada['probs']
+    assert entrada['players'] == [(p.id, p.name) for p in state.players]
+    assert entrada['board'] == []
+    time.sleep(0.05)
+    assert job.snapshot()['n'] == entrada['probs']['n']   # ya no sigue muestreando
+
+
+def test_paralelo_igual_con_cualquier_numero_de_procesos():
+    state = _mesa(4, calle=3)
+    args  = (state.players, state.community, list(state.deck))
+    uno   = poker.estimate_win_probabilities_parallel(*args, simulations=3 * poker.PARALLEL_CHUNK,
+                                                      seed=11, workers=1)
+    for workers in (2, 3):
+        assert poker.estimate_win_probabilities_parallel(*args, simulations=3 * poker.PARALLEL_CHUNK,
+                                                         seed=11, workers=workers) == uno
+
+
+def _renombrar_palos(state, permutacion):
+    # La misma mesa con los palos cambiados: código = palo * 13 + valor
+    cambio = lambda c: permutacion[c // 13] * 13 + c % 13
+    otra   = poker.GameState()
+    otra.players = [poker.Player(p.id, p.name, p.chips) for p in state.players]
+    for nuevo, viejo in zip(otra.players, state.players):
+        nuevo.cards = [poker.CARDS[cambio(c.code)] for c in viejo.cards]
+    otra.community = [poker.CARDS[cambio(c.code)] for c in state.community]
+    otra.deck      = [cambio(c) for c in state.deck]
+    return otra
+
+
+def test_llave_canonica_une_mesas_isomorfas():
+    state = _mesa(3, calle=3)
+    llave = lambda s: poker.equity_cache_key('exacto', s.players, s.community, s.deck)
+    assert llave(_renombrar_palos(state, (2, 0, 3, 1))) == llave(state)
+    assert llave(_renombrar_palos(state, (1, 0, 2, 3))) == llave(state)
+
+    distinta = _renombrar_palos(state, (0, 1, 2, 3))
+    distinta.players[0].cards = distinta.players[0].cards[::-1]
+    assert llave(distinta) == llave(state)          # el orden de las dos cartas no importa
+    distinta.players[0], distinta.players[1] = distinta.players[1], distinta.players[0]
+    assert llave(distinta) != llave(state)          # el de los jugadores sí
+
+
+def test_mesa_isomorfa_sale_de_la_cache():
+    state   = _mesa(2, calle=4)
+    cache   = poker.EquityCache()
+    calculo = lambda *a: poker.enumerate_win_probabilities(*a)
+    primero = poker.cached_probabilities('exacto', calculo, state.players, state.community, list(state.deck), cache)
+    otra    = _renombrar_palos(state, (3, 2, 1, 0))
+    segundo = poker.cached_probabilities('exacto', calculo, otra.players, otra.community, otra.deck, cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert segundo == primero
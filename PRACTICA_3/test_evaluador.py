@@ -0,0 +1,16 @@
+from itertools import combinations
+
+import pytest
+
+import ejercicio1 as poker
+
+
+@pytest.mark.slow
+def test_fast_evaluate_igual_a_evaluate_hand_en_todas_las_manos_de_5():
+    # Las 2,598,960 manos de 5 cartas: mismo (rank, nombre, vals) que el evaluador original
+    total = 0
+    for mano in combinations(poker.CARDS, 5):
+        assert poker.fast_evaluate(mano) == poker.evaluate_hand(list(mano)), mano
+        total += 1
+    assert total == 2_598_960
+
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+import ejercicio1 as poker
+
+
+def _mano(ids, semilla=5):
+    mesa = [poker.Player(pid, f"Jugador {pid}", 200) for pid in ids]
+    for p in mesa:
+        p.policy = poker.make_random_policy(random.Random(p.id), max_raise=20)
+    return poker.play_hand_headless(mesa, seed=semilla, dealer=0, blinds=(1, 2))
+
+
+def test_registro_ida_y_vuelta(tmp_path):
+    state = _mano([1, 2, 3])
+    ruta  = str(tmp_path / 'historial.bin')
+    assert poker.log_hand(state, ruta) == 0
+    with poker.HandLogReader(ruta) as log:
+        assert len(log) == 1
+        mano = log[0]
+    assert mano['seed'] == state.seed and mano['pot'] == state.pot
+    assert mano['board'] == [c.code for c in state.community]
+    assert mano['actions'] == [tuple(a) for a in state.actions[:poker.LOG_ACTIONS]]
+    assert mano['action_count'] == len(state.actions) > 0
+    for guardado, p in zip(mano['players'], state.players):
+        assert guardado['id'] == p.id
+        assert guardado['cards'] == [c.code for c in p.cards]
+        assert guardado['chips'] == p.chips
+        assert guardado['won'] == (p in state.winners)
+
+
+def test_replay_deal_repite_las_cartas():
+    state = _mano([1, 2, 3], semilla=99)
+    holes, board = poker.replay_deal(state.seed, 3)
+    assert holes == [[c.code for c in p.cards] for p in state.players]
+    assert board[:len(state.community)] == [c.code for c in state.community]
+
+
+def test_ids_de_torneo_mayores_a_255(tmp_path):
+    state = _mano([300, 70_000, 4])
+    ruta  = str(tmp_path / 'historial.bin')
+    poker.log_hand(state, ruta)
+    with poker.HandLogReader(ruta) as log:
+        assert [j['id'] for j in log[0]['players']] == [300, 70_000, 4]
+
+
+def test_ruta_por_omision_se_lee_al_llamar(tmp_path, monkeypatch):
+    ruta = str(tmp_path / 'otro.bin')
+    monkeypatch.setattr(poker, 'HAND_LOG_PATH', ruta)
+    poker.log_hand(_mano([1, 2]))
+    with poker.HandLogReader() as log:
+        assert len(log) == 1
+
+
+def test_no_agrega_a_un_historial_de_otra_version(tmp_path):
+    ruta = tmp_path / 'viejo.bin'
+    ruta.write_bytes(poker._LOG_HEADER.pack(poker._LOG_MAGIC, 1, 336))
+    with pytest.raises(ValueError):
+        poker.log_hand(_mano([1, 2]), str(ruta))
@@ -0,0 +1,64 @@
+import json
+import random
+
+import pytest
+
+import ejercicio2 as pizzeria
+
+necesita_numpy = pytest.mark.skipif(pizzeria.np is None, reason='requiere NumPy')
+
+
+def _filas(semilla=4, ordenes=300):
+    rng = random.Random(semilla)
+    return [(orden, float(rng.choice((8, 10, 12, 14))), rng.randint(0, 6))
+            for orden in range(1, ordenes + 1) for _ in range(rng.randint(1, 7))]
+
+
+def _csv(ruta, filas):
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write('orden,tamaño,toppings\n')
+        f.writelines(f'{o},{t:g},{k}\n' for o, t, k in filas)
+    return str(ruta)
+
+
+def _jsonl(ruta, filas):
+    with open(ruta, 'w', encoding='utf-8') as f:
+        for orden in sorted({o for o, _, _ in filas}):
+            pizzas = [{'tamaño': t, 'toppings': k} for o, t, k in filas if o == orden]
+            f.write(json.dumps({'orden': orden, 'pizzas': pizzas}) + '\n')
+    return str(ruta)
+
+
+@necesita_numpy
+@pytest.mark.parametrize('formato', [_csv, _jsonl])
+def test_precios_en_lote_igual_que_python(tmp_path, formato):
+    filas = _filas()
+    ruta  = formato(tmp_path / ('ordenes' + ('.csv' if formato is _csv else '.jsonl')), filas)
+    esperado = list(pizzeria.tickets_python(pizzeria.leer_filas(ruta)))
+    assert len(esperado) == 300
+    for tamaño_lote in (7, 64, pizzeria.LOTE_PIZZAS):   # órdenes partidas entre lotes
+        assert list(pizzeria.tickets_numpy(pizzeria.lotes_numpy(ruta, tamaño_lote))) == esperado
+
+
+def test_lote_en_columnas_igual_que_pizza():
+    filas = _filas(semilla=9, ordenes=120)
+    lote  = pizzeria.LotePizzas(filas)
+    assert len(lote) == len(filas)
+    for vista, (orden, tamaño, toppings) in zip(lote, filas):
+        pizza = pizzeria.Pizza(tamaño, toppings)
+        assert (vista.orden, vista.tamaño, vista.toppings, vista.precio) == \
+               (orden, pizza.tamaño, pizza.toppings, pizza.precio)
+    assert lote[-1].precio == pizzeria.Pizza(*filas[-1][1:]).precio
+
+    esperado = list(pizzeria.tickets_python(iter(filas)))
+    assert list(lote._tickets_python()) == esperado
+    assert list(lote.tickets()) == esperado
+    assert lote.subtotal() == sum(t[2] for t in esperado)
+    assert lote.total() == sum(t[4] for t in esperado)
+
+
+def test_lote_desde_archivo(tmp_path):
+    filas = _filas(semilla=2, ordenes=50)
+    lote  = pizzeria.LotePizzas.desde_archivo(_csv(tmp_path / 'ordenes.csv', filas))
+    assert [(p.orden, p.tamaño, p.toppings) for p in lote] == filas
+    assert list(lote.tickets()) == list(pizzeria.tickets_python(iter(filas)))
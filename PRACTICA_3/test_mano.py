@@ -0,0 +1,13 @@
+import ejercicio1 as poker
+
+
+def test_current_hand_detecta_cartas_reasignadas(cartas):
+    tablero = cartas('AdAc') + cartas('Ks7h') + cartas('2c3d')[:1]
+    jugador = poker.Player(1, "Jugador 1")
+    jugador.cards = cartas('Kh9d')
+    jugador.hand  = poker.HandState([c.code for c in jugador.cards + tablero])
+    assert poker.current_hand(jugador, tablero).best()[1] == 'Doble Par'
+
+    # Mismo número de cartas, otras cartas: el HandState guardado ya no sirve
+    jugador.cards = cartas('AsAh')
+    assert poker.current_hand(jugador, tablero).best()[1] == 'Poker'
@@ -0,0 +1,28 @@
+import io
+import os
+
+import ejercicio1 as poker
+
+
+class _Terminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+def _dibujar(monkeypatch, lineas, alto=40):
+    salida = _Terminal()
+    monkeypatch.setattr(poker.sys, 'stdout', salida)
+    monkeypatch.setattr(poker.shutil, 'get_terminal_size', lambda *a: os.terminal_size((100, alto)))
+    poker.TerminalRenderer().draw(lineas)
+    return salida.getvalue()
+
+
+def test_cuadro_desde_home_sin_borrar_pantalla(monkeypatch):
+    # Da igual cuánto se imprimió antes: el cuadro se ancla arriba y limpia lo que queda debajo
+    cuadro = _dibujar(monkeypatch, ['mesa', 'cartas', ''])
+    assert cuadro == '\x1b[H\x1b[2Kmesa\n\x1b[2Kcartas\n\x1b[2K\n\x1b[J'
+
+
+def test_cuadro_mas_alto_que_la_terminal_borra(monkeypatch):
+    cuadro = _dibujar(monkeypatch, [str(i) for i in range(12)], alto=10)
+    assert cuadro.startswith('\x1b[H\x1b[2J')
@@ -0,0 +1,62 @@
+import random
+
+import ejercicio1 as poker
+
+
+def _mesa(*fichas):
+    mesa = [poker.Player(i + 1, f"Jugador {i + 1}", f) for i, f in enumerate(fichas)]
+    for p in mesa:
+        p.policy = poker.passive_policy
+    return mesa
+
+
+def test_side_pots_por_nivel_de_apuesta():
+    a, b, c = _mesa(0, 0, 0)
+    a.total_bet, b.total_bet, c.total_bet = 10, 300, 1000
+    pozos = poker.side_pots([a, b, c])
+    assert [(f, [p.id for p in ps]) for f, ps in pozos] == [(30, [1, 2, 3]), (580, [2, 3]), (700, [3])]
+
+
+def test_exceso_no_igualado_se_devuelve():
+    mesa = _mesa(0, 0)
+    state = poker.GameState()
+    state.players = mesa
+    mesa[0].total_bet, mesa[1].total_bet = 50, 200
+    state.pot = 250
+    mesa[0].cards = [poker.CARDS[12], poker.CARDS[25]]       # A♠ A♥
+    mesa[1].cards = [poker.CARDS[0], poker.CARDS[14]]        # 2♠ 3♥
+    state.community = [poker.CARDS[c] for c in (38, 51, 5, 19, 33)]
+    pozos = poker.award_pot(state)
+    assert [(f, [p.id for p in ps]) for f, ps in pozos] == [(100, [1]), (150, [2])]
+    assert (mesa[0].chips, mesa[1].chips) == (100, 150)
+
+
+def test_all_in_corto_solo_gana_lo_que_igualo():
+    # Un all-in de 10 contra dos stacks de 1000 que van hasta el final
+    rng = random.Random(7)
+    ganadas_por_el_corto = 0
+    for _ in range(300):
+        mesa = _mesa(10, 1000, 1000)
+        for p in mesa[1:]:
+            p.policy = lambda state, player, to_call: ('raise', to_call + 100) if to_call == 0 else 'call'
+        state = poker.play_hand_headless(mesa, rng)
+        corto = mesa[0]
+        assert sum(p.chips for p in mesa) == 2010
+        assert corto.chips <= 30              # como máximo el pozo principal: 10 de cada uno
+        if corto in state.winners:
+            ganadas_por_el_corto += 1
+    assert ganadas_por_el_corto > 0
+
+
+def test_mano_sin_apuestas_tiene_ganador(tmp_path):
+    # Sin ciegas y todos pasan: el pozo es 0, pero el showdown igual elige ganador
+    mesa = _mesa(100, 100, 100)
+    state = poker.play_hand_headless(mesa, random.Random(3))
+    assert state.pot == 0 and all(p.chips == 100 for p in mesa)
+    fuerzas = {p.id: poker.current_hand(p, state.community).strength() for p in mesa}
+    assert [p.id for p in state.winners] == [i for i, f in fuerzas.items() if f == max(fuerzas.values())]
+
+    ruta = str(tmp_path / 'historial.bin')
+    poker.log_hand(state, ruta)
+    with poker.HandLogReader(ruta) as log:
+        assert [j['id'] for j in log[0]['players'] if j['won']] == [p.id for p in state.winners]
@@ -0,0 +1,69 @@
+import random
+import time
+from itertools import product
+
+import ejercicio2 as pizzeria
+
+TAMAÑOS = (8, 10, 12, 14)
+
+
+def _ticket(rng, n):
+    return [pizzeria.Pizza(rng.choice(TAMAÑOS), rng.randint(0, 6)) for _ in range(n)]
+
+
+def _descuento_exhaustivo(motor, pizzas):
+    # Referencia: prueba todas las cantidades de cada combo con las tablas del motor
+    por_tamaño = {}
+    for pizza in pizzas:
+        por_tamaño.setdefault(pizza.tamaño, []).append(pizza)
+    tablas = {t: motor._tabla(t, sorted(lista, key=lambda p: p.precio, reverse=True))
+              for t, lista in por_tamaño.items()}
+    mejor = 0
+    for usos in product(*(range(len(pizzas) + 1) for _ in motor.combos)):
+        tomadas = dict.fromkeys(TAMAÑOS, 0)
+        for combo, k in zip(motor.combos, usos):
+            for t in combo.tamaños:
+                tomadas[t] += k
+        if any(c > len(por_tamaño.get(t, ())) for t, c in tomadas.items()):
+            continue
+        valor = -sum(k * combo.precio for combo, k in zip(motor.combos, usos))
+        for t, (_, acumulado, mejor_nxm, _) in tablas.items():
+            valor += acumulado[tomadas[t]] + mejor_nxm[tomadas[t]]
+        mejor = max(mejor, valor)
+    return mejor
+
+
+def _revisar(descuento, aplicadas):
+    usadas = [id(p) for _, pizzas, _ in aplicadas for p in pizzas]
+    assert len(usadas) == len(set(usadas))
+    assert sum(monto for _, _, monto in aplicadas) == descuento
+
+
+def test_combos_compartidos_igual_que_exhaustivo():
+    rng = random.Random(3)
+    for _ in range(150):
+        reglas = [pizzeria.NxM(2, 1), pizzeria.NxM(3, 2)][:rng.randint(0, 2)]
+        reglas += [pizzeria.Combo(rng.choices(TAMAÑOS, k=rng.randint(1, 3)), rng.randint(80, 500))
+                   for _ in range(rng.randint(1, 3))]
+        motor = pizzeria.MotorPromociones(reglas)
+        pizzas = _ticket(rng, rng.randint(0, 9))
+        descuento, aplicadas = motor.aplicar(pizzas)
+        _revisar(descuento, aplicadas)
+        assert descuento == _descuento_exhaustivo(motor, pizzas)
+
+
+def test_ticket_grande_con_varios_combos_es_rapido():
+    rng = random.Random(11)
+    casos = [
+        (600, [((14, 8), 150), ((12, 10), 180), ((14, 10), 200)]),
+        (200, [((14, 8), 150), ((8, 10), 180), ((10, 12), 200), ((12, 14), 210)]),
+    ]
+    for n, combos in casos:
+        motor = pizzeria.MotorPromociones([pizzeria.NxM(2, 1), pizzeria.NxM(3, 2), pizzeria.Cupon(10)]
+                                          + [pizzeria.Combo(t, p) for t, p in combos])
+        pizzas = _ticket(rng, n)
+        inicio = time.perf_counter()
+        descuento, aplicadas = motor.aplicar(pizzas)
+        assert time.perf_counter() - inicio < 2.0
+        _revisar(descuento, aplicadas)
+        assert any(nombre.startswith('combo') for nombre, _, _ in aplicadas)
@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+import ejercicio1 as poker
+
+
+def test_range_equity_acepta_combos_de_card(cartas):
+    ases, reyes = cartas('AsAh'), cartas('KsKh')
+    flop = cartas('7c2d') + cartas('9h3c')[:1]
+    por_cartas = poker.range_equity({'a': [ases], 'b': [reyes]}, flop, exhaustive=True)
+    por_texto  = poker.range_equity({'a': 'AsAh', 'b': 'KsKh'}, flop, exhaustive=True)
+    assert por_cartas['a']['win'] == por_texto['a']['win']
+    assert por_cartas['b']['win'] == por_texto['b']['win']
+    assert abs(por_cartas['a']['win'] + por_cartas['b']['win'] + por_cartas['a']['tie'] - 100) < 1e-9
+
+
+def test_range_equity_acepta_codigos_y_filas_de_parse_range():
+    filas = poker.parse_range('QQ+')
+    codigos = [(c1, c2) for c1, c2, _ in poker.parse_range('AKs')]
+    r = poker.range_equity({'pares': filas, 'ak': codigos}, simulations=500, rng=random.Random(1))
+    assert r['pares']['win'] > r['ak']['win']
+
+
+def test_mas_sube_hasta_el_tope():
+    pares = {(c1, c2) for c1, c2, _ in poker.parse_range('QQ+')}
+    assert len(pares) == 18
+    assert pares == {(c1, c2) for c1, c2, _ in poker.parse_range('QQ, KK, AA')}
+    suited = {(c1, c2) for c1, c2, _ in poker.parse_range('ATs+')}
+    assert suited == {(c1, c2) for c1, c2, _ in poker.parse_range('ATs, AJs, AQs, AKs')}
+
+
+@pytest.mark.parametrize('termino', ['QQs', 'QQo', 'QQx', 'QQ++', 'AKx', 'AKs+x', 'AsKh+', 'Q', 'QQQ'])
+def test_sufijo_invalido_se_rechaza(termino):
+    with pytest.raises(ValueError):
+        poker.parse_range(termino)
+
+
+def test_top_sin_tabla_preflop_avisa(monkeypatch):
+    monkeypatch.setattr(poker, 'preflop_table_available', lambda: False)
+    with pytest.raises(ValueError, match='tabla preflop'):
+        poker.parse_range('top 30%')
+    assert len(poker.parse_range('QQ+')) == 18
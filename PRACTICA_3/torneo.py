@@ -0,0 +1,317 @@
+"""
+Torneo multimesa de Texas Hold'em con el motor sin interfaz de ejercicio1.py.
+
+Los jugadores se sientan en mesas de hasta --por-mesa asientos. En cada nivel
+de ciegas cada mesa juega --manos-por-nivel manos en un proceso del pool (una
+mesa = una tarea, con su propia semilla, así que el resultado no depende del
+número de procesos). Al cerrar el nivel se eliminan los jugadores sin fichas,
+se rompen las mesas que sobran y se equilibran las demás, y suben las ciegas.
+
+Cada mano se emite como evento (y, con --eventos, como una línea JSON) en
+cuanto su mesa termina; las estadísticas de chip-EV se acumulan al vuelo, sin
+guardar las manos.
+
+Uso:
+    python torneo.py [--jugadores 60] [--por-mesa 6] [--fichas 1500] [--manos-por-nivel 10]
+                     [--politicas pasiva,azar,agresiva,equity] [--workers N] [--semilla 7]
+                     [--eventos eventos.jsonl]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import ejercicio1 as poker
+
+# (ciega chica, ciega grande) por nivel; pasado el último nivel se queda en él
+ESTRUCTURA = ((10, 20), (15, 30), (25, 50), (50, 100), (75, 150), (100, 200), (150, 300),
+              (200, 400), (300, 600), (400, 800), (600, 1200), (1000, 2000), (1500, 3000),
+              (2000, 4000), (3000, 6000), (5000, 10000))
+EQUITY_SIMULACIONES = 200   # por decisión de los bots 'equity': fijas (no por tiempo) para que la semilla repita el torneo
+
+
+def crear_politica(nombre: str, rng: random.Random):
+    """Policy de ejercicio1 por nombre (las tareas viajan a otros procesos, así que solo se pasa el nombre)."""
+    if nombre == 'pasiva':
+        return poker.passive_policy
+    if nombre == 'azar':
+        return poker.make_random_policy(rng)
+    if nombre == 'agresiva':
+        return poker.make_random_policy(rng, fold=0.05, raise_=0.35, max_raise=300)
+    if nombre == 'equity':
+        return poker.make_equity_policy(rng, samples=EQUITY_SIMULACIONES)
+    raise ValueError(f'política desconocida: {nombre!r}')
+
+
+# ══════════════════════════════════════
+#  UNA MESA (en un proceso del pool)
+# ══════════════════════════════════════
+def _siguiente(asientos: list, pid: int) -> int:
+    """Id del siguiente jugador con fichas después de pid en el orden de los asientos."""
+    ids = [p.id for p in asientos]
+    i   = ids.index(pid) if pid in ids else -1
+    for p in asientos[i + 1:] + asientos[:i + 1]:
+        if p.chips > 0:
+            return p.id
+    return pid
+
+def jugar_mesa(tarea: tuple) -> tuple:
+    """
+    Juega hasta 'manos' manos en una mesa. tarea = (mesa, [(id, fichas, política)],
+    id del botón, (chica, grande), manos, semilla). Se detiene antes si queda un
+    solo jugador con fichas.
+    Retorna (mesa, [(id, fichas)], id del botón para la siguiente mano, eventos).
+    """
+    mesa, asientos, boton, ciegas, manos, semilla = tarea
+    rng     = random.Random(semilla)
+    players = []
+    for pid, fichas, politica in asientos:
+        p = poker.Player(pid, f"Jugador {pid}", fichas)
+        p.policy = crear_politica(politica, rng)
+        players.append(p)
+    if boton not in [p.id for p in players]:
+        boton = players[0].id
+
+    eventos = []
+    for mano in range(manos):
+        vivos = [p for p in players if p.chips > 0]
+        if len(vivos) < 2:
+            break
+        antes  = {p.id: p.chips for p in vivos}
+        dealer = next(i for i, p in enumerate(vivos) if p.id == boton)
+        state  = poker.play_hand_headless(vivos, rng, dealer=dealer, blinds=ciegas)
+        eventos.append({
+            'tipo':      'mano',
+            'mesa':      mesa,
+            'mano':      mano,
+            'ciegas':    list(ciegas),
+            'boton':     boton,
+            'pozo':      state.pot,
+            'ganadores': [p.id for p in state.winners],
+            'netas':     {p.id: p.chips - antes[p.id] for p in vivos},
+        })
+        boton = _siguiente(players, boton)
+    return mesa, [(p.id, p.chips) for p in players], boton, eventos
+
+
+# ══════════════════════════════════════
+#  ESTADÍSTICAS
+# ══════════════════════════════════════
+class ChipEV:
+    """
+    Media y varianza de las fichas netas por mano (método de Welford), en
+    fichas y en ciegas grandes, para un jugador o una política. Ocupa lo mismo
+    sin importar cuántas manos se sumen.
+    """
+    __slots__ = ('manos', 'ganadas', 'media', 'm2', 'bb')
+
+    def __init__(self):
+        self.manos, self.ganadas, self.media, self.m2, self.bb = 0, 0, 0.0, 0.0, 0.0
+
+    def agregar(self, neta: int, grande: int, gano: bool):
+        self.manos   += 1
+        self.ganadas += gano
+        delta        = neta - self.media
+        self.media  += delta / self.manos
+        self.m2     += delta * (neta - self.media)
+        self.bb     += neta / grande
+
+    def error(self) -> float: # Error estándar de la media.
+        if self.manos < 2:
+            return 0.0
+        return (self.m2 / (self.manos - 1) / self.manos) ** 0.5
+
+    def bb_100(self) -> float: # Ciegas grandes ganadas cada 100 manos.
+        return self.bb / self.manos * 100 if self.manos else 0.0
+
+
+# ══════════════════════════════════════
+#  TORNEO
+# ══════════════════════════════════════
+def rebalancear(mesas: dict, por_mesa: int) -> list:
+    """
+    Rompe las mesas que sobran y equilibra las demás (diferencia de a lo más
+    un jugador). mesas = {id de mesa: [ids de jugador]} se modifica en su lugar.
+    Retorna los movimientos [(jugador, mesa origen, mesa destino)].
+    """
+    for mid in [m for m, ids in mesas.items() if not ids]:
+        del mesas[mid]
+    total      = sum(len(ids) for ids in mesas.values())
+    necesarias = max(1, -(-total // por_mesa))
+    movimientos = []
+
+    def mover(origen: int):
+        destino = min((m for m in mesas if m != origen), key=lambda m: len(mesas[m]))
+        pid = mesas[origen].pop()
+        mesas[destino].append(pid)
+        movimientos.append((pid, origen, destino))
+
+    while len(mesas) > necesarias:
+        rota = min(mesas, key=lambda m: len(mesas[m]))
+        while mesas[rota]:
+            mover(rota)
+        del mesas[rota]
+    while max(map(len, mesas.values())) - min(map(len, mesas.values())) > 1:
+        mover(max(mesas, key=lambda m: len(mesas[m])))
+    return movimientos
+
+class Torneo:
+    """
+    Estado de un torneo: fichas y política de cada jugador, mesas, botones,
+    nivel de ciegas, orden de eliminación y chip-EV por jugador y por política.
+    """
+    def __init__(self, jugadores: int, por_mesa: int = 6, fichas: int = 1500,
+                 politicas: tuple = ('pasiva', 'azar'), manos_por_nivel: int = 10,
+                 estructura: tuple = ESTRUCTURA, semilla=None):
+        if jugadores < 2 or por_mesa < 2:
+            raise ValueError('se necesitan al menos 2 jugadores y 2 asientos por mesa')
+        self.por_mesa        = por_mesa
+        self.manos_por_nivel = manos_por_nivel
+        self.estructura      = estructura
+        self.semilla         = semilla if semilla is not None else random.randrange(2 ** 32)
+        self.fichas          = {pid: fichas for pid in range(1, jugadores + 1)}
+        self.politica        = {pid: politicas[(pid - 1) % len(politicas)] for pid in self.fichas}
+        self.nivel           = 0
+        self.manos           = 0
+        self.eliminados: list = []   # ids en orden de eliminación (el último en salir queda al final)
+        self.por_jugador     = {pid: ChipEV() for pid in self.fichas}
+        self.por_politica    = {nombre: ChipEV() for nombre in politicas}
+
+        # sorteo de asientos y mesas balanceadas desde el inicio
+        orden = list(self.fichas)
+        random.Random(self.semilla).shuffle(orden)
+        n_mesas     = -(-jugadores // por_mesa)
+        self.mesas  = {m: orden[m::n_mesas] for m in range(n_mesas)}
+        self.botones = {m: ids[0] for m, ids in self.mesas.items()}
+
+    def vivos(self) -> list:
+        return [pid for pid, f in self.fichas.items() if f > 0]
+
+    def ciegas(self) -> tuple:
+        return self.estructura[min(self.nivel, len(self.estructura) - 1)]
+
+    def _tareas(self) -> list:
+        return [(m, [(pid, self.fichas[pid], self.politica[pid]) for pid in ids],
+                 self.botones[m], self.ciegas(), self.manos_por_nivel,
+                 f'{self.semilla}-{self.nivel}-{m}')
+                for m, ids in self.mesas.items()]
+
+    def _registrar(self, evento: dict):
+        grande = evento['ciegas'][1]
+        for pid, neta in evento['netas'].items():
+            gano = pid in evento['ganadores']
+            self.por_jugador[pid].agregar(neta, grande, gano)
+            self.por_politica[self.politica[pid]].agregar(neta, grande, gano)
+        self.manos += 1
+
+    def eventos(self, workers: int = None):
+        """
+        Juega el torneo completo y genera sus eventos en orden de llegada:
+        'mano' (una por mano jugada), 'eliminado', 'rebalanceo', 'nivel' y 'fin'.
+        workers=None usa todos los núcleos; workers=1 juega en el proceso actual.
+        """
+        workers = workers or os.cpu_count() or 1
+        pool    = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            while len(self.vivos()) > 1:
+                inicio = dict(self.fichas)
+                if pool is None:
+                    resultados = map(jugar_mesa, self._tareas())
+                else:
+                    resultados = (f.result() for f in as_completed(
+                        [pool.submit(jugar_mesa, t) for t in self._tareas()]))
+                for mesa, fichas, boton, eventos in resultados:
+                    for evento in eventos:
+                        evento['nivel'] = self.nivel
+                        self._registrar(evento)
+                        yield evento
+                    self.fichas.update(fichas)
+                    self.botones[mesa] = boton
+                yield from self._cerrar_nivel(inicio)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        ganador = self.vivos()[0]
+        self.eliminados.append(ganador)
+        yield {'tipo': 'fin', 'ganador': ganador, 'manos': self.manos, 'nivel': self.nivel}
+
+    def _cerrar_nivel(self, inicio: dict):
+        # los que salen en el mismo nivel se ordenan por las fichas con que lo empezaron (menos = peor puesto)
+        salen = sorted((pid for ids in self.mesas.values() for pid in ids if self.fichas[pid] == 0),
+                       key=inicio.get)
+        for pid in salen:
+            self.eliminados.append(pid)
+            yield {'tipo': 'eliminado', 'jugador': pid, 'puesto': len(self.fichas) - len(self.eliminados) + 1,
+                   'nivel': self.nivel}
+        for m in self.mesas:
+            self.mesas[m] = [pid for pid in self.mesas[m] if self.fichas[pid] > 0]
+        movimientos = rebalancear(self.mesas, self.por_mesa)
+        for mesa in [m for m in self.botones if m not in self.mesas]:
+            del self.botones[mesa]
+        if movimientos:
+            yield {'tipo': 'rebalanceo', 'movimientos': movimientos, 'mesas': len(self.mesas),
+                   'nivel': self.nivel}
+        self.nivel += 1
+        yield {'tipo': 'nivel', 'nivel': self.nivel, 'ciegas': list(self.ciegas())}
+
+    def puesto_medio(self) -> dict: # Puesto final promedio por política (1 = campeón).
+        total  = len(self.fichas)
+        suma   = {nombre: [0, 0] for nombre in self.por_politica}
+        for i, pid in enumerate(self.eliminados):
+            s = suma[self.politica[pid]]
+            s[0] += total - i
+            s[1] += 1
+        return {nombre: s[0] / s[1] for nombre, s in suma.items() if s[1]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jugadores', type=int, default=60)
+    parser.add_argument('--por-mesa', type=int, default=6)
+    parser.add_argument('--fichas', type=int, default=1500)
+    parser.add_argument('--manos-por-nivel', type=int, default=10)
+    parser.add_argument('--politicas', default='pasiva,azar,agresiva',
+                        help='políticas repartidas entre los jugadores, separadas por comas')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--semilla', type=int, default=7)
+    parser.add_argument('--eventos', help="archivo JSONL con un evento por línea ('-' = salida estándar)")
+    args = parser.parse_args()
+
+    torneo = Torneo(args.jugadores, args.por_mesa, args.fichas, tuple(args.politicas.split(',')),
+                    args.manos_por_nivel, semilla=args.semilla)
+    salida = None
+    if args.eventos:
+        salida = sys.stdout if args.eventos == '-' else open(args.eventos, 'w', encoding='utf-8')
+
+    informe = sys.stderr if salida is sys.stdout else sys.stdout
+    t0 = time.perf_counter()
+    try:
+        for evento in torneo.eventos(args.workers):
+            if salida is not None:
+                salida.write(json.dumps(evento) + '\n')
+            if evento['tipo'] == 'nivel':
+                print(f"  nivel {evento['nivel']:>2}  ciegas {evento['ciegas'][0]}/{evento['ciegas'][1]}  "
+                      f"{len(torneo.vivos())} jugadores en {len(torneo.mesas)} mesas", file=informe)
+    finally:
+        if salida not in (None, sys.stdout):
+            salida.close()
+    dt = time.perf_counter() - t0
+
+    print(f"\nGanador: Jugador {torneo.eliminados[-1]} ({torneo.politica[torneo.eliminados[-1]]})",
+          file=informe)
+    print(f"{torneo.manos} manos en {dt:.2f} s ({torneo.manos / dt:.0f} manos/s, {args.workers} procesos)",
+          file=informe)
+    puestos = torneo.puesto_medio()
+    print(f"\n{'política':<10} {'manos':>8} {'fichas/mano':>12} {'± err.':>8} {'bb/100':>8} "
+          f"{'% ganadas':>10} {'puesto medio':>13}", file=informe)
+    for nombre, ev in torneo.por_politica.items():
+        print(f"{nombre:<10} {ev.manos:>8} {ev.media:>12.1f} {ev.error():>8.1f} {ev.bb_100():>8.1f} "
+              f"{ev.ganadas / max(ev.manos, 1):>10.1%} {puestos.get(nombre, 0):>13.1f}", file=informe)
+
+
+if __name__ == '__main__':
+    main()